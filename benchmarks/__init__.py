@@ -0,0 +1 @@
+"""Performance benchmarks for pytincture. Run them from the repository root with ``python -m``."""
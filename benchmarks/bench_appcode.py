@@ -0,0 +1,230 @@
+"""
+Cost of building the browser package and the BFF registry.
+
+Each scenario writes a synthetic modules tree to a temporary directory and
+times ``_browser_package_files``, ``create_appcode_pkg_in_memory``,
+``generate_stub_classes`` (for the entrypoint) and ``build_bff_registry`` over
+it, reporting the best wall time of ``--repeat`` runs, the peak traced memory
+of one extra run under ``tracemalloc`` and the archive size::
+
+    python -m benchmarks.bench_appcode --output appcode.json
+    python -m benchmarks.bench_appcode --shapes files --compare appcode.json
+
+Tree shapes:
+
+- ``files-N``: N modules in packages of 100, imported from the entrypoint as
+  a tree with fan-out 4; every tenth module exports one BFF class.
+- ``deep-D``: a chain of D nested packages, each importing the next.
+- ``classes-K``: one entrypoint that exports K BFF classes of five methods.
+"""
+import argparse
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.common import compare_results, write_results
+
+APPLICATION = "benchapp"
+SHAPES = {
+    "files": [10, 1000, 10000],
+    "deep": [50, 200],
+    "classes": [1, 50, 200],
+}
+FILES_PER_PACKAGE = 100
+FAN_OUT = 4
+
+BFF_HEADER = "from pytincture.dataclass import backend_for_frontend\n\n"
+
+
+def _bff_class(name: str, methods: int) -> str:
+    lines = [
+        "@backend_for_frontend",
+        f"class {name}:",
+        "    def __init__(self, _user):",
+        "        self._user = _user",
+    ]
+    for index in range(methods):
+        lines += [
+            "",
+            f"    def method_{index}(self, value: int, label: str = 'x') -> dict:",
+            f"        return {{'value': value + {index}, 'label': label}}",
+        ]
+    return "\n".join(lines) + "\n\n\n"
+
+
+def _plain_module(imports: List[str], index: int) -> str:
+    lines = [f"import {module}" for module in imports]
+    lines += [
+        "",
+        f"class Widget{index}:",
+        "    def render(self, data):",
+        "        return [str(item) for item in data]",
+        "",
+        f"def helper_{index}(value):",
+        "    return value * 2",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def _write(root: str, relative: str, source: str) -> None:
+    path = os.path.join(root, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(source)
+
+
+def _build_files_tree(root: str, count: int) -> None:
+    def dotted(index: int) -> str:
+        return f"pkg{index // FILES_PER_PACKAGE:03d}.mod{index:05d}"
+
+    for package in range((count + FILES_PER_PACKAGE - 1) // FILES_PER_PACKAGE):
+        _write(root, f"pkg{package:03d}/__init__.py", "")
+    for index in range(count):
+        children = [dotted(child) for child in range(index * FAN_OUT + 1, min(count, index * FAN_OUT + FAN_OUT + 1))]
+        source = _plain_module(children, index)
+        if index % 10 == 0:
+            source = BFF_HEADER + source + "\n" + _bff_class(f"Service{index}", 3)
+        _write(root, dotted(index).replace(".", os.sep) + ".py", source)
+    _write(root, f"{APPLICATION}.py", BFF_HEADER + _plain_module([dotted(0)], -1).replace("Widget-1", "Main").replace("helper_-1", "main"))
+
+
+def _build_deep_tree(root: str, depth: int) -> None:
+    parts: List[str] = []
+    for level in range(depth):
+        parts.append(f"l{level}")
+        _write(root, os.path.join(*parts, "__init__.py"), "")
+        child = ".".join(parts + [f"l{level + 1}", "node"]) if level + 1 < depth else None
+        _write(root, os.path.join(*parts, "node.py"), _plain_module([child] if child else [], level))
+    _write(root, f"{APPLICATION}.py", _plain_module(["l0.node"], depth))
+
+
+def _build_classes_tree(root: str, classes: int) -> None:
+    source = BFF_HEADER + "".join(_bff_class(f"Service{index}", 5) for index in range(classes))
+    _write(root, f"{APPLICATION}.py", source)
+
+
+BUILDERS = {
+    "files": _build_files_tree,
+    "deep": _build_deep_tree,
+    "classes": _build_classes_tree,
+}
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> Tuple[float, int, Any]:
+    """Best wall time over ``repeat`` runs, then one traced run for peak memory."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def _run_scenario(shape: str, size: int, repeat: int) -> List[Dict[str, Any]]:
+    import pytincture
+    import pytincture.backend.app as backend_app
+    from pytincture.dataclass import generate_stub_classes
+
+    root = tempfile.mkdtemp(prefix="pytincture-bench-")
+    try:
+        BUILDERS[shape](root, size)
+        pytincture.set_modules_path(root)
+        entrypoint = os.path.join(root, f"{APPLICATION}.py")
+        source_files = sum(len([f for f in files if f.endswith(".py")]) for _, _, files in os.walk(root))
+        targets = {
+            "browser_package_files": lambda: backend_app._browser_package_files(APPLICATION),
+            "create_appcode_pkg_in_memory": lambda: backend_app.create_appcode_pkg_in_memory(
+                "bench.local", "https", APPLICATION
+            ),
+            "generate_stub_classes": lambda: generate_stub_classes(entrypoint, "bench.local", "https"),
+            "build_bff_registry": lambda: backend_app.build_bff_registry(root),
+        }
+        rows = []
+        for target, func in targets.items():
+            # Keep anything the builders print out of the report.
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                seconds, peak, result = _measure(func, repeat)
+            row = {
+                "name": f"{target}/{shape}-{size}",
+                "target": target,
+                "shape": shape,
+                "size": size,
+                "source_files": source_files,
+                "wall_seconds": round(seconds, 6),
+                "peak_memory_bytes": peak,
+            }
+            if target == "browser_package_files":
+                row["packaged_files"] = len(result)
+            elif target == "create_appcode_pkg_in_memory":
+                row["archive_bytes"] = result.getbuffer().nbytes
+            elif target == "generate_stub_classes":
+                row["stub_bytes"] = len((result or "").encode("utf-8"))
+            else:
+                row["operations"] = len(result)
+            rows.append(row)
+        return rows
+    finally:
+        pytincture.set_modules_path(None)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _sizes(value: str) -> Dict[str, List[int]]:
+    """Parse ``files,deep`` or ``files=10:1000,classes=200`` into shape sizes."""
+    selected: Dict[str, List[int]] = {}
+    for item in (part.strip() for part in value.split(",") if part.strip()):
+        shape, _, sizes = item.partition("=")
+        if shape not in SHAPES:
+            raise argparse.ArgumentTypeError(f"unknown shape: {shape}")
+        selected[shape] = [int(size) for size in sizes.split(":")] if sizes else SHAPES[shape]
+    return selected
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--shapes", type=_sizes, default=dict(SHAPES), help="e.g. files,deep or files=10:1000")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per target; the best is reported")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file from an earlier run")
+    parser.add_argument("--metric", default="wall_seconds", help="metric compared with --compare")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("USE_REDIS_INSTANCE", "false")
+    results = []
+    for shape, sizes in args.shapes.items():
+        for size in sizes:
+            for row in _run_scenario(shape, size, args.repeat):
+                extra = next(
+                    f"{key} {row[key]}"
+                    for key in ("packaged_files", "archive_bytes", "stub_bytes", "operations")
+                    if key in row
+                )
+                print(
+                    f"{row['name']:<48} {row['wall_seconds'] * 1000:>11.2f} ms"
+                    f"  peak {row['peak_memory_bytes'] / 1024:>10.1f} KiB  {extra}",
+                    flush=True,
+                )
+                results.append(row)
+
+    config = {"shapes": args.shapes, "repeat": args.repeat, "files_per_package": FILES_PER_PACKAGE, "fan_out": FAN_OUT}
+    document = write_results(args.output, "appcode", config, results)
+    if args.compare:
+        print()
+        print("\n".join(compare_results(document, args.compare, args.metric)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Throughput and latency of the ``/classcall`` hot path.
+
+Every scenario calls one method of a small BFF service through the ASGI app
+in-process, so the numbers cover routing, auth, CSRF, replay-token checks,
+argument binding, execution and serialization without any network noise.
+Scenarios cross the method kind (sync, async, async generator, streaming),
+auth on/off, replay tokens on/off and a small or large payload::
+
+    python -m benchmarks.bench_class_call --output results.json
+    python -m benchmarks.bench_class_call --compare results.json
+
+Results are written as JSON with the git commit and interpreter, so runs from
+different commits can be compared with ``--compare``.
+"""
+import argparse
+import ast
+import asyncio
+import contextlib
+import io
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+import textwrap
+import time
+import zipfile
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import AsgiClient, compare_results, summarize_latencies, write_results
+
+APPLICATION = "benchsvc"
+BENCH_EMAIL = "bench@example.com"
+KINDS = {
+    "sync": "echo",
+    "async": "echo_async",
+    "async-gen": "echo_gen",
+    "stream": "echo_stream",
+}
+PAYLOAD_ROWS = {"small": 1, "large": 2000}
+
+SERVICE_SOURCE = textwrap.dedent("""
+    from pytincture.dataclass import backend_for_frontend, bff_stream
+
+    @backend_for_frontend
+    class Bench:
+        def __init__(self, _user):
+            self._user = _user
+
+        def echo(self, payload):
+            return payload
+
+        async def echo_async(self, payload):
+            return payload
+
+        async def echo_gen(self, payload):
+            for row in payload["rows"]:
+                yield row
+
+        @bff_stream
+        def echo_stream(self, payload):
+            for row in payload["rows"]:
+                yield row
+""")
+
+
+def _load_app(modules_path: str):
+    os.environ["MODULES_PATH"] = modules_path
+    os.environ.setdefault("USE_REDIS_INSTANCE", "false")
+    os.environ["ALLOWED_EMAILS"] = BENCH_EMAIL
+    import pytincture.backend.app as backend_app
+
+    backend_app.reload_bff_registry(modules_path)
+    return backend_app
+
+
+def _configure(backend_app, auth: bool, replay: bool) -> None:
+    backend_app.ENABLE_GOOGLE_AUTH = False
+    backend_app.ENABLE_MICROSOFT_AUTH = False
+    backend_app.ENABLE_SAML_AUTH = False
+    backend_app.ENABLE_USER_LOGIN = auth
+    backend_app.ENABLE_DEV_EMAIL_LOGIN = auth
+    backend_app.ENABLE_BFF_REPLAY_TOKENS = replay
+    backend_app.BFF_REPLAY_TOKEN_BATCH_SIZE = 100
+    backend_app.BFF_REPLAY_TOKEN_STORE.clear()
+    backend_app.BFF_RESULT_CACHE = backend_app.BffResultCache()
+
+
+def _payload(rows: int) -> Dict[str, Any]:
+    return {
+        "kwargs": {
+            "payload": {
+                "rows": [
+                    {"id": index, "name": f"row-{index}", "score": index * 0.5, "tags": ["a", "b"]}
+                    for index in range(rows)
+                ]
+            }
+        }
+    }
+
+
+class Session:
+    """One browser session: cookies, CSRF header and a pool of replay tokens."""
+
+    def __init__(self, backend_app, auth: bool, replay: bool):
+        self.backend_app = backend_app
+        self.client = AsgiClient(backend_app.app, host="localhost")
+        self.auth = auth
+        self.replay = replay
+        self.tokens: List[str] = []
+        self._capsule: Optional[str] = None
+        self._client_key: Optional[bytes] = None
+
+    async def login(self) -> None:
+        if not self.auth:
+            return
+        response = await self.client.request(
+            "POST",
+            f"/{APPLICATION}/auth/user",
+            form={"email": BENCH_EMAIL, "password": "local"},
+        )
+        if response.status != 303:
+            raise RuntimeError(f"Benchmark login failed with status {response.status}")
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"content-type": "application/json"}
+        csrf = self.client.cookies.get("pytincture_csrf")
+        if csrf:
+            headers["x-csrf-token"] = csrf
+        if self.replay:
+            headers["x-pytincture-bff-token"] = self.tokens.pop()
+        return headers
+
+    async def fill_tokens(self, count: int) -> None:
+        """Fetch replay tokens up front so refills stay outside the timed loop."""
+        if not self.replay:
+            return
+        if self._capsule is None:
+            response = await self.client.request("GET", f"/{APPLICATION}/appcode/appcode.pyt")
+            if response.status != 200:
+                raise RuntimeError(f"Appcode download failed with status {response.status}")
+            with zipfile.ZipFile(io.BytesIO(response.body)) as archive:
+                stub = archive.read(f"{APPLICATION}.py").decode("utf-8")
+            self._capsule = ast.literal_eval(re.search(r"_pytincture_replay_capsule = (.+)", stub).group(1))
+            self._client_key = bytes(ast.literal_eval(re.search(r"_pytincture_replay_key = (.+)", stub).group(1)))
+        while len(self.tokens) < count:
+            response = await self.client.request(
+                "POST",
+                "/_pytincture/state",
+                headers={
+                    "x-csrf-token": self.client.cookies["pytincture_csrf"],
+                    "x-pytincture-client": self._capsule,
+                },
+            )
+            if response.status != 200:
+                raise RuntimeError(f"Replay token refill failed with status {response.status}")
+            envelope = self.backend_app._decrypt_opaque_envelope(self._client_key, response.body.decode("ascii"))
+            self.tokens.extend(json.loads(envelope)["items"])
+
+
+async def _run_scenario(
+    backend_app,
+    kind: str,
+    auth: bool,
+    replay: bool,
+    payload_name: str,
+    concurrency: int,
+    iterations: int,
+    warmup: int,
+) -> Dict[str, Any]:
+    _configure(backend_app, auth, replay)
+    session = Session(backend_app, auth, replay)
+    await session.login()
+    await session.fill_tokens(iterations + warmup)
+    path = f"/classcall/{APPLICATION}.py/Bench/{KINDS[kind]}"
+    body = json.dumps(_payload(PAYLOAD_ROWS[payload_name])).encode("utf-8")
+    latencies: List[float] = []
+    errors = 0
+
+    async def call(record: bool) -> None:
+        nonlocal errors
+        headers = session.headers()
+        started = time.perf_counter()
+        response = await session.client.request("POST", path, body=body, headers=headers)
+        elapsed = time.perf_counter() - started
+        if not record:
+            return
+        if response.status == 200:
+            latencies.append(elapsed)
+        else:
+            errors += 1
+
+    for _ in range(warmup):
+        await call(False)
+
+    async def worker(count: int) -> None:
+        for _ in range(count):
+            await call(True)
+
+    shares = [iterations // concurrency + (1 if index < iterations % concurrency else 0) for index in range(concurrency)]
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(count) for count in shares if count))
+    wall_seconds = time.perf_counter() - started
+    return {
+        "name": f"{kind}/auth-{'on' if auth else 'off'}/replay-{'on' if replay else 'off'}/{payload_name}/c{concurrency}",
+        "kind": kind,
+        "auth": auth,
+        "replay": replay,
+        "payload": payload_name,
+        "payload_bytes": len(body),
+        "concurrency": concurrency,
+        **summarize_latencies(latencies, wall_seconds, errors),
+    }
+
+
+def _choices(value: str, allowed) -> List[str]:
+    chosen = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in chosen if item not in allowed]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown value(s): {', '.join(unknown)}")
+    return chosen
+
+
+def _switches(value: str) -> List[bool]:
+    return [item == "on" for item in _choices(value, ("on", "off"))]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500, help="timed calls per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="untimed calls before each scenario")
+    parser.add_argument("--concurrency", default="1,16", help="comma-separated concurrent callers")
+    parser.add_argument("--kinds", type=lambda v: _choices(v, KINDS), default=list(KINDS))
+    parser.add_argument("--payloads", type=lambda v: _choices(v, PAYLOAD_ROWS), default=list(PAYLOAD_ROWS))
+    parser.add_argument("--auth", type=_switches, default=[False, True], help="on, off or on,off")
+    parser.add_argument("--replay", type=_switches, default=[False, True], help="on, off or on,off")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file from an earlier run")
+    parser.add_argument("--metric", default="latency_ms.p50", help="metric compared with --compare")
+    args = parser.parse_args(argv)
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+
+    with tempfile.TemporaryDirectory(prefix="pytincture-bench-") as modules_path:
+        with open(os.path.join(modules_path, f"{APPLICATION}.py"), "w", encoding="utf-8") as handle:
+            handle.write(SERVICE_SOURCE)
+        backend_app = _load_app(modules_path)
+
+        async def run_all() -> List[Dict[str, Any]]:
+            results = []
+            for kind, auth, replay, payload_name, concurrency in itertools.product(
+                args.kinds, args.auth, args.replay, args.payloads, concurrency_levels
+            ):
+                # Replay tokens are bound to a logged-in session.
+                if replay and not auth:
+                    continue
+                # The app logs every class registration and login to stdout.
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    row = await _run_scenario(
+                        backend_app, kind, auth, replay, payload_name, concurrency, args.iterations, args.warmup
+                    )
+                latency = row["latency_ms"]
+                print(
+                    f"{row['name']:<48} {row['throughput_rps']:>10.1f} req/s"
+                    f"  p50 {latency['p50']:>8.3f} ms  p99 {latency['p99']:>8.3f} ms"
+                    f"  errors {row['errors']}",
+                    flush=True,
+                )
+                results.append(row)
+            return results
+
+        results = asyncio.run(run_all())
+
+    config = {
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "concurrency": concurrency_levels,
+        "payload_rows": PAYLOAD_ROWS,
+    }
+    document = write_results(args.output, "class_call", config, results)
+    if args.compare:
+        print()
+        print("\n".join(compare_results(document, args.compare, args.metric)))
+    return 1 if any(row["errors"] for row in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
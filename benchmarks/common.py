@@ -0,0 +1,213 @@
+"""
+Shared helpers for the benchmark runners: an in-process ASGI client, latency
+summaries, and JSON result files that can be compared across commits.
+"""
+import asyncio
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+
+class AsgiResponse:
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def header(self, name: str) -> Optional[str]:
+        wanted = name.lower().encode("latin-1")
+        for key, value in self.headers:
+            if key.lower() == wanted:
+                return value.decode("latin-1")
+        return None
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class AsgiClient:
+    """
+    A minimal HTTP client that calls an ASGI app in-process, with no sockets
+    or client library in the measured path. It keeps cookies between calls and
+    reports a disconnect only after the response has been sent, as a real
+    client that waits for its answer would.
+    """
+
+    def __init__(self, app, host: str = "bench.local", scheme: str = "https"):
+        self.app = app
+        self.host = host
+        self.scheme = scheme
+        self.cookies: Dict[str, str] = {}
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body: Any = None,
+        form: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsgiResponse:
+        request_headers = {"host": self.host, **{k.lower(): v for k, v in (headers or {}).items()}}
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            request_headers.setdefault("content-type", "application/json")
+        elif form is not None:
+            body = urlencode(form).encode("utf-8")
+            request_headers.setdefault("content-type", "application/x-www-form-urlencoded")
+        if body:
+            request_headers["content-length"] = str(len(body))
+        if self.cookies:
+            request_headers["cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        raw_path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": self.scheme,
+            "path": raw_path,
+            "raw_path": raw_path.encode("latin-1"),
+            "query_string": query.encode("latin-1"),
+            "root_path": "",
+            "headers": [(k.encode("latin-1"), v.encode("latin-1")) for k, v in request_headers.items()],
+            "client": ("127.0.0.1", 50000),
+            "server": (self.host, 443 if self.scheme == "https" else 80),
+        }
+        sent_body = False
+        finished = asyncio.Event()
+        status = 0
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def receive():
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    finished.set()
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            finished.set()
+        response = AsgiResponse(status, response_headers, b"".join(chunks))
+        self._store_cookies(response)
+        return response
+
+    def _store_cookies(self, response: AsgiResponse) -> None:
+        for key, value in response.headers:
+            if key.lower() != b"set-cookie":
+                continue
+            pair = value.decode("latin-1").split(";", 1)[0]
+            name, _, cookie_value = pair.partition("=")
+            if cookie_value in ("", "null", '""'):
+                self.cookies.pop(name.strip(), None)
+            else:
+                self.cookies[name.strip()] = cookie_value.strip()
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize_latencies(latencies: Iterable[float], wall_seconds: float, errors: int = 0) -> Dict[str, Any]:
+    """Throughput and latency percentiles (in milliseconds) for one scenario."""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "wall_seconds": round(wall_seconds, 6),
+        "throughput_rps": round(count / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(values) * 1000, 4) if values else 0.0,
+            "p50": round(percentile(values, 0.50) * 1000, 4),
+            "p90": round(percentile(values, 0.90) * 1000, 4),
+            "p99": round(percentile(values, 0.99) * 1000, 4),
+            "max": round(values[-1] * 1000, 4) if values else 0.0,
+        },
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def write_results(path: Optional[str], benchmark: str, config: Dict[str, Any], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    document = {
+        "benchmark": benchmark,
+        "environment": environment_info(),
+        "config": config,
+        "results": results,
+    }
+    if path:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(document, handle, indent=2)
+            handle.write("\n")
+    return document
+
+
+def compare_results(current: Dict[str, Any], baseline_path: str, metric: str) -> List[str]:
+    """
+    Lines comparing ``metric`` (a dotted key such as ``latency_ms.p50``) for
+    every scenario present in both result files.
+    """
+    with open(baseline_path, encoding="utf-8") as handle:
+        baseline = {row["name"]: row for row in json.load(handle)["results"]}
+    lines = [f"{'scenario':<48} {'baseline':>12} {'current':>12} {'change':>9}"]
+    for row in current["results"]:
+        before = baseline.get(row["name"])
+        if before is None:
+            continue
+        old, new = _lookup(before, metric), _lookup(row, metric)
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+        lines.append(f"{row['name']:<48} {old:>12.3f} {new:>12.3f} {change:>9}")
+    return lines
+
+
+def _lookup(row: Dict[str, Any], dotted: str) -> float:
+    value: Any = row
+    for part in dotted.split("."):
+        value = value[part]
+    return float(value)
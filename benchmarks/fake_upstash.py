@@ -0,0 +1,201 @@
+"""
+A local stand-in for the Upstash Redis REST API.
+
+It speaks the protocol ``upstash_redis.Redis`` uses (a JSON command array
+POSTed to ``/`` or a list of them to ``/pipeline``, bearer-token auth and
+optional base64 result encoding) and implements the commands ``RedisDict``
+issues, so the stores can be exercised without the network::
+
+    python -m benchmarks.fake_upstash --port 8079 --latency-ms 1
+
+Point the app at it with ``USE_REDIS_INSTANCE=true``,
+``REDIS_UPSTASH_INSTANCE_URL=http://127.0.0.1:8079`` and any
+``REDIS_UPSTASH_INSTANCE_TOKEN`` (``--token`` if one is required).
+"""
+import argparse
+import base64
+import fnmatch
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeUpstashStore:
+    """Thread-safe string keys with optional expiry."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Tuple[str, Optional[float]]] = {}
+        self.commands = 0
+
+    def _live(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def execute(self, command: List[Any]) -> Any:
+        if not command:
+            raise ValueError("ERR empty command")
+        name = str(command[0]).upper()
+        args = [str(arg) for arg in command[1:]]
+        with self._lock:
+            self.commands += 1
+            handler = getattr(self, f"_cmd_{name.lower()}", None)
+            if handler is None:
+                raise ValueError(f"ERR unknown command '{name}'")
+            return handler(args)
+
+    def _cmd_ping(self, args):
+        return args[0] if args else "PONG"
+
+    def _cmd_get(self, args):
+        return self._live(args[0])
+
+    def _cmd_set(self, args):
+        key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+        expires_at = None
+        if "NX" in options and self._live(key) is not None:
+            return None
+        if "XX" in options and self._live(key) is None:
+            return None
+        for unit, scale in (("EX", 1.0), ("PX", 0.001)):
+            if unit in options:
+                expires_at = time.monotonic() + float(args[2 + options.index(unit) + 1]) * scale
+        self._data[key] = (value, expires_at)
+        return "OK"
+
+    def _cmd_getdel(self, args):
+        value = self._live(args[0])
+        self._data.pop(args[0], None)
+        return value
+
+    def _cmd_del(self, args):
+        return sum(1 for key in args if self._live(key) is not None and self._data.pop(key, None))
+
+    def _cmd_exists(self, args):
+        return sum(1 for key in args if self._live(key) is not None)
+
+    def _cmd_expire(self, args):
+        value = self._live(args[0])
+        if value is None:
+            return 0
+        self._data[args[0]] = (value, time.monotonic() + float(args[1]))
+        return 1
+
+    def _cmd_incr(self, args):
+        value = int(self._live(args[0]) or 0) + 1
+        expires_at = self._data.get(args[0], (None, None))[1]
+        self._data[args[0]] = (str(value), expires_at)
+        return value
+
+    def _cmd_scan(self, args):
+        # The whole keyspace is returned in one page, so the cursor is always "0".
+        options = [arg.upper() for arg in args]
+        pattern = args[options.index("MATCH") + 1] if "MATCH" in options else "*"
+        keys = [key for key in list(self._data) if self._live(key) is not None and fnmatch.fnmatchcase(key, pattern)]
+        return ["0", keys]
+
+    def _cmd_flushall(self, args):
+        self._data.clear()
+        return "OK"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, str):
+        return value if value == "OK" else base64.b64encode(value.encode("utf-8")).decode("ascii")
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    return value
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    token: Optional[str] = None,
+    latency_ms: float = 0.0,
+    store: Optional[FakeUpstashStore] = None,
+) -> ThreadingHTTPServer:
+    """Build (but do not start) a fake Upstash server; ``port=0`` picks a free port."""
+    store = store or FakeUpstashStore()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            if token is not None and self.headers.get("Authorization") != f"Bearer {token}":
+                self._reply(401, {"error": "Unauthorized"})
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            encoded = self.headers.get("Upstash-Encoding", "").lower() == "base64"
+            try:
+                payload = json.loads(body or b"[]")
+                if self.path.rstrip("/") == "/pipeline":
+                    result: Any = [self._run(command, encoded) for command in payload]
+                else:
+                    result = self._run(payload, encoded)
+            except (ValueError, TypeError, IndexError) as exc:
+                self._reply(400, {"error": str(exc)})
+                return
+            self._reply(200, result)
+
+        def _run(self, command, encoded):
+            try:
+                value = store.execute(command)
+            except (ValueError, TypeError, IndexError) as exc:
+                return {"error": str(exc)}
+            return {"result": _encode(value) if encoded else value}
+
+        def _reply(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.store = store
+    return server
+
+
+def start_in_thread(**kwargs) -> Tuple[ThreadingHTTPServer, str]:
+    """Start a fake server on a background thread and return it with its URL."""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name="fake-upstash", daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local fake of the Upstash Redis REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8079)
+    parser.add_argument("--token", help="require this bearer token")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every request, to model network distance")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, args.token, args.latency_ms)
+    print(f"Fake Upstash listening on http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,335 @@
+"""
+Load generator for a running pytincture app.
+
+Virtual users log in, then repeat a browser-like flow: load the page,
+download the appcode package, refill replay tokens when they run low, fire a
+burst of concurrent BFF calls and read one BFF stream to the end. Throughput,
+latency percentiles and error rates are reported per endpoint.
+
+By default the runner launches the app itself (uvicorn, one worker) with a
+small benchmark service, once per ``--stores`` entry: ``memory`` keeps
+sessions and replay tokens in process, ``upstash`` points ``RedisDict`` at
+``benchmarks.fake_upstash`` so every store round trip goes over local HTTP::
+
+    python -m benchmarks.loadtest --users 20 --flows 10 --output load.json
+    python -m benchmarks.loadtest --stores upstash --upstash-latency-ms 2
+
+To drive an app that is already running, pass ``--url`` together with the
+application, a login e-mail accepted by it and the BFF operations to call::
+
+    python -m benchmarks.loadtest --url http://127.0.0.1:8070 --application myapp \\
+        --email me@example.com --call data.py/Data/rows --stream-call data.py/Data/feed
+"""
+import argparse
+import ast
+import asyncio
+import io
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_class_call import APPLICATION, BENCH_EMAIL, SERVICE_SOURCE
+from benchmarks.common import compare_results, summarize_latencies, write_results
+
+ENDPOINTS = ("login", "page", "appcode", "state", "classcall", "stream")
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    async def timed(self, endpoint: str, send, ok=(200,)) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await send()
+        except httpx.HTTPError as exc:
+            self.errors[endpoint] += 1
+            self.statuses[endpoint][type(exc).__name__] += 1
+            return None
+        elapsed = time.perf_counter() - started
+        self.statuses[endpoint][str(response.status_code)] += 1
+        if response.status_code in ok:
+            self.latencies[endpoint].append(elapsed)
+            return response
+        self.errors[endpoint] += 1
+        return None
+
+    def rows(self, store: str, wall_seconds: float) -> List[Dict[str, Any]]:
+        rows = []
+        for endpoint in ENDPOINTS:
+            latencies = self.latencies.get(endpoint, [])
+            errors = self.errors.get(endpoint, 0)
+            if not latencies and not errors:
+                continue
+            summary = summarize_latencies(latencies, wall_seconds, errors)
+            rows.append({
+                "name": f"{store}/{endpoint}",
+                "store": store,
+                "endpoint": endpoint,
+                **summary,
+                "error_rate": round(errors / (len(latencies) + errors), 4),
+                "statuses": dict(self.statuses[endpoint]),
+            })
+        return rows
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, args, stats: EndpointStats, decrypt):
+        self.client = client
+        self.args = args
+        self.stats = stats
+        self.decrypt = decrypt
+        self.tokens: List[str] = []
+        self.capsule: Optional[str] = None
+        self.client_key: Optional[bytes] = None
+
+    def _headers(self, replay: bool = True) -> Dict[str, str]:
+        headers = {}
+        csrf = self.client.cookies.get("pytincture_csrf")
+        if csrf:
+            headers["X-CSRF-Token"] = csrf
+        if replay and self.capsule and self.tokens:
+            headers["X-Pytincture-BFF-Token"] = self.tokens.pop()
+        return headers
+
+    async def run(self) -> None:
+        login = await self.stats.timed("login", lambda: self.client.post(
+            f"/{self.args.application}/auth/user",
+            data={"email": self.args.email, "password": self.args.password},
+        ), ok=(303,))
+        if login is None:
+            return
+        for _ in range(self.args.flows):
+            await self.stats.timed("page", lambda: self.client.get(f"/{self.args.application}"))
+            package = await self.stats.timed(
+                "appcode", lambda: self.client.get(f"/{self.args.application}/appcode/appcode.pyt")
+            )
+            if package is not None:
+                self._read_replay_client(package.content)
+            if self.capsule:
+                await self._refill(self.args.burst + 1)
+            await asyncio.gather(*(self._call() for _ in range(self.args.burst)))
+            if self.args.stream_call:
+                await self._stream()
+
+    def _read_replay_client(self, archive_bytes: bytes) -> None:
+        with zipfile.ZipFile(io.BytesIO(archive_bytes)) as archive:
+            try:
+                stub = archive.read(f"{self.args.application}.py").decode("utf-8")
+            except KeyError:
+                return
+        capsule = re.search(r"_pytincture_replay_capsule = (.+)", stub)
+        key = re.search(r"_pytincture_replay_key = (.+)", stub)
+        if capsule and key and ast.literal_eval(capsule.group(1)):
+            self.capsule = ast.literal_eval(capsule.group(1))
+            self.client_key = bytes(ast.literal_eval(key.group(1)))
+
+    async def _refill(self, needed: int) -> None:
+        while len(self.tokens) < needed:
+            response = await self.stats.timed("state", lambda: self.client.post(
+                "/_pytincture/state",
+                headers={**self._headers(replay=False), "X-Pytincture-Client": self.capsule},
+            ))
+            if response is None:
+                return
+            self.tokens.extend(json.loads(self.decrypt(self.client_key, response.text))["items"])
+
+    async def _call(self) -> None:
+        await self.stats.timed("classcall", lambda: self.client.post(
+            f"/classcall/{self.args.call}", content=self.args.call_body, headers={
+                **self._headers(), "Content-Type": "application/json",
+            },
+        ))
+
+    async def _stream(self) -> None:
+        if self.capsule:
+            await self._refill(1)
+
+        async def send():
+            request = self.client.build_request(
+                "POST",
+                f"/classcall/{self.args.stream_call}",
+                content=self.args.call_body,
+                headers={**self._headers(), "Content-Type": "application/json"},
+            )
+            response = await self.client.send(request, stream=True)
+            try:
+                async for _ in response.aiter_raw():
+                    pass
+            finally:
+                await response.aclose()
+            return response
+
+        await self.stats.timed("stream", send)
+
+
+async def _drive(base_url: str, args, decrypt) -> EndpointStats:
+    stats = EndpointStats()
+    limits = httpx.Limits(max_connections=args.burst + 2, max_keepalive_connections=args.burst + 2)
+    clients = [
+        httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits, follow_redirects=False)
+        for _ in range(args.users)
+    ]
+    try:
+        await asyncio.gather(*(VirtualUser(client, args, stats, decrypt).run() for client in clients))
+    finally:
+        await asyncio.gather(*(client.aclose() for client in clients))
+    return stats
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with status {process.returncode} before accepting requests")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not start within {timeout:.0f}s")
+
+
+def _launch_app(modules_path: str, store: str, args) -> List[subprocess.Popen]:
+    """Start the app (and the fake Upstash server for ``upstash``); return the processes."""
+    processes = []
+    env = {
+        **os.environ,
+        "MODULES_PATH": modules_path,
+        "ALLOWED_EMAILS": args.email,
+        "ENABLE_USER_LOGIN": "true",
+        "ENABLE_DEV_EMAIL_LOGIN": "true",
+        "ENABLE_GOOGLE_AUTH": "false",
+        "ENABLE_MICROSOFT_AUTH": "false",
+        "ENABLE_SAML_AUTH": "false",
+        "ENABLE_BFF_REPLAY_TOKENS": "true" if args.replay else "false",
+        "BFF_REPLAY_TOKEN_BATCH_SIZE": str(min(100, max(12, args.burst * 2))),
+        "USE_REDIS_INSTANCE": "false",
+    }
+    if store == "upstash":
+        upstash_port = _free_port()
+        upstash = subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.fake_upstash", "--port", str(upstash_port),
+             "--latency-ms", str(args.upstash_latency_ms)],
+            stdout=subprocess.DEVNULL,
+        )
+        processes.append(upstash)
+        upstash_url = f"http://127.0.0.1:{upstash_port}"
+        _wait_for(upstash_url, upstash)
+        env.update({
+            "USE_REDIS_INSTANCE": "true",
+            "REDIS_UPSTASH_INSTANCE_URL": upstash_url,
+            "REDIS_UPSTASH_INSTANCE_TOKEN": "loadtest",
+        })
+    port = _free_port()
+    processes.append(subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "pytincture.backend.app:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    ))
+    args.base_url = f"http://127.0.0.1:{port}"
+    _wait_for(f"{args.base_url}/favicon.ico", processes[-1])
+    return processes
+
+
+def _stop(processes: List[subprocess.Popen]) -> None:
+    for process in reversed(processes):
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _run_store(store: str, modules_path: str, args, decrypt) -> List[Dict[str, Any]]:
+    processes = [] if args.url else _launch_app(modules_path, store, args)
+    try:
+        started = time.perf_counter()
+        stats = asyncio.run(_drive(args.url or args.base_url, args, decrypt))
+        wall_seconds = time.perf_counter() - started
+    finally:
+        _stop(processes)
+    return stats.rows(store, wall_seconds)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="drive an already running app instead of launching one")
+    parser.add_argument("--stores", default="memory,upstash", help="stores to launch the app with: memory, upstash")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--flows", type=int, default=5, help="page-load flows per user after login")
+    parser.add_argument("--burst", type=int, default=8, help="concurrent BFF calls per flow")
+    parser.add_argument("--rows", type=int, default=50, help="rows in the BFF call payload")
+    parser.add_argument("--no-replay", dest="replay", action="store_false", help="launch without replay tokens")
+    parser.add_argument("--upstash-latency-ms", type=float, default=0.0, help="delay added by the fake Upstash server")
+    parser.add_argument("--application", default=APPLICATION)
+    parser.add_argument("--email", default=BENCH_EMAIL)
+    parser.add_argument("--password", default="local")
+    parser.add_argument("--call", default=f"{APPLICATION}.py/Bench/echo", help="FILE/CLASS/METHOD for BFF bursts")
+    parser.add_argument("--stream-call", default=f"{APPLICATION}.py/Bench/echo_stream", help="FILE/CLASS/METHOD to stream; empty to skip")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file from an earlier run")
+    parser.add_argument("--metric", default="latency_ms.p50", help="metric compared with --compare")
+    args = parser.parse_args(argv)
+    stores = ["external"] if args.url else [store.strip() for store in args.stores.split(",") if store.strip()]
+    unknown = set(stores) - {"memory", "upstash", "external"}
+    if unknown:
+        parser.error(f"unknown store(s): {', '.join(sorted(unknown))}")
+    args.call_body = json.dumps({
+        "kwargs": {"payload": {"rows": [{"id": index, "name": f"row-{index}"} for index in range(args.rows)]}}
+    })
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="pytincture-load-") as modules_path:
+        with open(os.path.join(modules_path, f"{APPLICATION}.py"), "w", encoding="utf-8") as handle:
+            handle.write(SERVICE_SOURCE)
+        # Only the envelope decoder is needed here; keep the import from
+        # scanning the working directory for BFF modules.
+        os.environ["MODULES_PATH"] = modules_path
+        from pytincture.backend.app import _decrypt_opaque_envelope
+
+        for store in stores:
+            for row in _run_store(store, modules_path, args, _decrypt_opaque_envelope):
+                latency = row["latency_ms"]
+                print(
+                    f"{row['name']:<22} {row['requests']:>7} ok {row['errors']:>5} err"
+                    f" {row['throughput_rps']:>9.1f} req/s  p50 {latency['p50']:>8.2f} ms"
+                    f"  p90 {latency['p90']:>8.2f} ms  p99 {latency['p99']:>8.2f} ms",
+                    flush=True,
+                )
+                results.append(row)
+
+    config = {
+        key: getattr(args, key)
+        for key in ("url", "users", "flows", "burst", "rows", "replay", "upstash_latency_ms", "application", "call", "stream_call")
+    }
+    config["stores"] = stores
+    document = write_results(args.output, "loadtest", config, results)
+    if args.compare:
+        print()
+        print("\n".join(compare_results(document, args.compare, args.metric)))
+    return 1 if any(row["errors"] for row in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
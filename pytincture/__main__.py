@@ -0,0 +1,50 @@
+"""
+Command line entry point.
+
+    python -m pytincture build --modules-folder . --public-url https://app.example.com --output bundle
+"""
+import argparse
+import os
+import sys
+
+from pytincture import set_modules_path
+
+
+def _build(args) -> int:
+    set_modules_path(os.path.abspath(args.modules_folder))
+    # Build from the modules tree, never from a previously deployed bundle.
+    os.environ.pop("PYTINCTURE_BUNDLE_PATH", None)
+    from pytincture.backend.app import build_deployment_bundle
+
+    manifest = build_deployment_bundle(args.output, args.public_url, args.application or None)
+    print(
+        f"Wrote bundle {manifest['bundle_id']} to {os.path.abspath(args.output)}: "
+        f"{len(manifest['applications'])} application(s) for "
+        f"{manifest['public_protocol']}://{manifest['public_host']}"
+    )
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="pytincture")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser(
+        "build",
+        help="precompute a deployment bundle for PYTINCTURE_BUNDLE_PATH",
+    )
+    build.add_argument("--modules-folder", default=".", help="the folder passed to launch_service")
+    build.add_argument("--public-url", required=True, help="URL browsers use to reach the service")
+    build.add_argument("--output", default="pytincture-bundle", help="bundle directory to write")
+    build.add_argument(
+        "--application",
+        action="append",
+        help="application to prebuild (repeatable); defaults to every root-level module",
+    )
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        return _build(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,42 +17,143 @@ import secrets
 import time
 import uuid
 import fnmatch
+import gzip
+import tempfile
+import contextlib
+import contextvars
 import copy
+import math
+import pathlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_IMPORT_STARTED = time.perf_counter()
+from functools import partial
 from xml.etree import ElementTree
 # FastAPI / Starlette
-from fastapi import Depends, FastAPI, Request, Response, HTTPException, Body
+import anyio
+from fastapi import Depends, FastAPI, Request, Response, HTTPException, Body, WebSocket, WebSocketDisconnect
 from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, StreamingResponse, JSONResponse, HTMLResponse, RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastmcp import FastMCP
+from fastapi.encoders import jsonable_encoder
 
 # Pytincture
-from pytincture import get_modules_path
-from pytincture.dataclass import get_parsed_output, add_bff_docs_to_app, get_bff_manifest
-from importlib.machinery import SourceFileLoader
+from pytincture import __version__ as PYTINCTURE_VERSION, get_modules_path
+from pytincture.dataclass import (
+    _CURRENT_CANCEL_TOKEN,
+    add_bff_docs_to_app,
+    get_bff_manifest,
+    get_parsed_output,
+)
+from pytincture.backend.loader import _build_dynamic_module_name, _load_source_module
+from pytincture.backend.streaming import (
+    BffSseRegistry,
+    BffStreamRegistry,
+    coalesced_chunks,
+    threaded_chunks,
+)
+from pytincture.backend.columnar import (
+    ARROW_STREAM_MEDIA_TYPE,
+    arrow_available,
+    encode_arrow_stream,
+    to_arrow_table,
+    to_json_rows,
+)
+from pytincture.backend.executors import (
+    BffExecutorRegistry,
+    BffExecutorSaturated,
+    BffProcessPool,
+    load_executor_pool_config,
+)
+from pytincture.backend.metrics import PROMETHEUS_MEDIA_TYPE, BffCallTimer, BffMetrics
+from pytincture.backend.tracing import FileSpanExporter, OtlpHttpSpanExporter, Tracer, current_span
+from pytincture.backend.profiler import ProfileBusy, SamplingProfiler, await_labelled, run_labelled
+from pytincture.backend.bundle import DeploymentBundle, stub_settings, write_bundle
+from pytincture.backend.archive_cache import AppcodeArchiveCache, default_cache_directory
 
-# Google OAuth via Authlib
-from authlib.integrations.starlette_client import OAuth, OAuthError
 from itsdangerous import BadSignature, SignatureExpired, TimestampSigner, URLSafeTimedSerializer
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.datastructures import MutableHeaders
-from starlette.requests import HTTPConnection
-from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect, HTTPConnection
+from starlette.background import BackgroundTask
 from starlette.config import Config
 
-from typing import Any, Union, Dict, List, Optional, Iterable, AsyncIterable, Set, Callable
+from typing import TYPE_CHECKING, Any, Union, Dict, List, Optional, Iterable, Iterator, AsyncIterable, Set, Callable
 
 # Pydantic for JSON validation
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
-# SAML Toolkit (OneLogin)
-from onelogin.saml2.auth import OneLogin_Saml2_Auth
-from onelogin.saml2.settings import OneLogin_Saml2_Settings
-from onelogin.saml2.errors import OneLogin_Saml2_ValidationError
 from urllib.parse import parse_qsl, quote, urlparse, urlsplit, urlunsplit
 from html import escape
 
+# Optional subsystems (MCP, OAuth via Authlib, SAML via OneLogin/xmlsec and the
+# Upstash client) are imported on first use, so workers that leave them
+# disabled do not pay for them at startup. They stay reachable as module
+# attributes, e.g. ``pytincture.backend.app.FastMCP``.
+_LAZY_IMPORTS = {
+    "FastMCP": ("fastmcp", "FastMCP"),
+    "OAuth": ("authlib.integrations.starlette_client", "OAuth"),
+    "OAuthError": ("authlib.integrations.starlette_client", "OAuthError"),
+    "OneLogin_Saml2_Auth": ("onelogin.saml2.auth", "OneLogin_Saml2_Auth"),
+    "OneLogin_Saml2_Settings": ("onelogin.saml2.settings", "OneLogin_Saml2_Settings"),
+    "OneLogin_Saml2_ValidationError": ("onelogin.saml2.errors", "OneLogin_Saml2_ValidationError"),
+    "Redis": ("upstash_redis", "Redis"),
+}
+
+
+if TYPE_CHECKING:  # pragma: no cover - for annotations only; loaded lazily at runtime
+    from onelogin.saml2.auth import OneLogin_Saml2_Auth
+
+
+def _lazy_import(name: str) -> Any:
+    value = globals().get(name)
+    if value is None:
+        module_name, attribute = _LAZY_IMPORTS[name]
+        value = getattr(importlib.import_module(module_name), attribute)
+        globals()[name] = value
+    return value
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        return _lazy_import(name)
+    if name == "mcp":
+        # MCP is disabled and nothing is mounted; expose an empty server so
+        # callers can still introspect it.
+        globals()["mcp"] = _lazy_import("FastMCP")(name="pytincture")
+        return globals()["mcp"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+STARTUP_PHASES: Dict[str, float] = {}
+_STARTUP_MARK = [_IMPORT_STARTED]
+
+
+def _startup_phase(name: str) -> None:
+    """Charge the time since the previous mark to ``name`` in the startup report."""
+    now = time.perf_counter()
+    STARTUP_PHASES[name] = STARTUP_PHASES.get(name, 0.0) + now - _STARTUP_MARK[0]
+    _STARTUP_MARK[0] = now
+
+
+def startup_report() -> Dict[str, Any]:
+    """Import-time cost of this module by phase, and which optional subsystems are loaded."""
+    return {
+        "total_seconds": round(sum(STARTUP_PHASES.values()), 6),
+        "phases": {name: round(seconds, 6) for name, seconds in STARTUP_PHASES.items()},
+        "loaded_subsystems": {
+            module_name: module_name in sys.modules
+            for module_name in ("fastmcp", "authlib", "onelogin", "xmlsec", "upstash_redis")
+        },
+    }
+
+
+_startup_phase("imports")
+
 # ========================
 #  FASTAPI SETUP
 # ========================
@@ -77,27 +178,29 @@ class RotatingSessionMiddleware(SessionMiddleware):
 
         connection = HTTPConnection(scope)
         initial_session_was_empty = True
-        if self.session_cookie in connection.cookies:
-            signed_data = connection.cookies[self.session_cookie].encode("utf-8")
-            for signer in (self.signer, *self.previous_signers):
-                try:
-                    decoded = signer.unsign(signed_data, max_age=self.max_age)
-                    scope["session"] = json.loads(base64.b64decode(decoded))
-                    initial_session_was_empty = False
-                    break
-                except (BadSignature, ValueError, json.JSONDecodeError):
-                    continue
+        with BFF_TRACER.span("session.load"):
+            if self.session_cookie in connection.cookies:
+                signed_data = connection.cookies[self.session_cookie].encode("utf-8")
+                for signer in (self.signer, *self.previous_signers):
+                    try:
+                        decoded = signer.unsign(signed_data, max_age=self.max_age)
+                        scope["session"] = json.loads(base64.b64decode(decoded))
+                        initial_session_was_empty = False
+                        break
+                    except (BadSignature, ValueError, json.JSONDecodeError):
+                        continue
+                else:
+                    scope["session"] = {}
             else:
                 scope["session"] = {}
-        else:
-            scope["session"] = {}
 
         async def send_wrapper(message):
             if message["type"] == "http.response.start":
                 headers = MutableHeaders(scope=message)
                 if scope["session"]:
-                    data = base64.b64encode(json.dumps(scope["session"]).encode("utf-8"))
-                    signed = self.signer.sign(data).decode("utf-8")
+                    with BFF_TRACER.span("session.save"):
+                        data = base64.b64encode(json.dumps(scope["session"]).encode("utf-8"))
+                        signed = self.signer.sign(data).decode("utf-8")
                     max_age = f"Max-Age={self.max_age}; " if self.max_age else ""
                     headers.append(
                         "Set-Cookie",
@@ -115,22 +218,64 @@ class RotatingSessionMiddleware(SessionMiddleware):
         await self.app(scope, receive, send_wrapper)
 
 
+class TracingMiddleware:
+    """
+    Open the server span of each HTTP request when tracing is enabled. The
+    span continues an incoming ``traceparent``; otherwise an ``X-Request-ID``
+    that is a valid trace id becomes the trace id, so logs and traces match.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not BFF_TRACER.enabled:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        with BFF_TRACER.start_trace(
+            f"HTTP {scope['method']}",
+            traceparent=headers.get(b"traceparent", b"").decode("latin-1"),
+            trace_id=headers.get(b"x-request-id", b"").decode("latin-1").lower(),
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def traced_send(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_error()
+                await send(message)
+
+            await self.app(scope, receive, traced_send)
+
+
 class RequestBodyLimitMiddleware:
-    """Reject request bodies that exceed the configured byte limit."""
+    """
+    Reject request bodies that exceed the configured byte limit. ``limit_for``
+    may return a different limit for a request, or ``None`` for the default.
+    """
 
-    def __init__(self, app, max_bytes: int):
+    def __init__(self, app, max_bytes: int, limit_for: Optional[Callable[[Dict[str, Any]], Optional[int]]] = None):
         self.app = app
         self.max_bytes = max_bytes
+        self.limit_for = limit_for
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
+        max_bytes = self.max_bytes
+        if self.limit_for is not None:
+            max_bytes = self.limit_for(scope) or self.max_bytes
         headers = dict(scope.get("headers") or [])
         content_length = headers.get(b"content-length")
         if content_length:
             try:
-                if int(content_length) > self.max_bytes:
+                if int(content_length) > max_bytes:
                     response = JSONResponse(
                         {"detail": "Request body too large"}, status_code=413
                     )
@@ -148,7 +293,7 @@ class RequestBodyLimitMiddleware:
             message = await receive()
             if message.get("type") == "http.request":
                 received += len(message.get("body", b""))
-                if received > self.max_bytes:
+                if received > max_bytes:
                     raise HTTPException(status_code=413, detail="Request body too large")
             return message
 
@@ -173,55 +318,6 @@ def _build_streamable_mcp_app(mcp_server, path: str = "/"):
     raise AttributeError("FastMCP server does not expose streamable_http_app() or http_app()")
 
 
-def _build_dynamic_module_name(file_path: str, name_hint: str) -> str:
-    """
-    Build a stable module name for manually loaded source files.
-
-    The name includes a sanitized hint for readability and a path hash to avoid
-    collisions between different files that share a class name or basename.
-    """
-    absolute_path = os.path.abspath(file_path)
-    modules_root = os.path.abspath(get_modules_path() or os.getcwd())
-
-    try:
-        relative_path = os.path.relpath(absolute_path, modules_root)
-    except ValueError:
-        relative_path = os.path.basename(absolute_path)
-
-    if relative_path.startswith(".."):
-        relative_path = os.path.basename(absolute_path)
-
-    sanitized_hint = re.sub(r"[^0-9a-zA-Z_]+", "_", name_hint).strip("_") or "module"
-    sanitized_path = re.sub(r"[^0-9a-zA-Z_]+", "_", relative_path.replace("\\", "/")).strip("_") or "source"
-    path_hash = hashlib.sha1(absolute_path.encode("utf-8")).hexdigest()[:12]
-    return f"pytincture_dynamic_{sanitized_hint}_{sanitized_path}_{path_hash}"
-
-
-def _load_source_module(file_path: str, name_hint: str):
-    """
-    Load a Python source file using importlib-compatible sys.modules registration.
-    """
-    module_name = _build_dynamic_module_name(file_path, name_hint)
-    loader = SourceFileLoader(module_name, file_path)
-    spec = importlib.util.spec_from_loader(module_name, loader)
-    if spec is None:
-        raise ImportError(f"Unable to create import spec for {file_path}")
-
-    module = importlib.util.module_from_spec(spec)
-    previous_module = sys.modules.get(spec.name)
-    sys.modules[spec.name] = module
-
-    try:
-        loader.exec_module(module)
-    except Exception:
-        if previous_module is None:
-            sys.modules.pop(spec.name, None)
-        else:
-            sys.modules[spec.name] = previous_module
-        raise
-
-    return module
-
 class _FilteredFastAPIApp:
     def __init__(self, source_app: FastAPI, operation_ids: Set[str]):
         self.source_app = source_app
@@ -247,8 +343,12 @@ class _FilteredFastAPIApp:
         await self.source_app(scope, receive, send)
 
 
+def _mcp_enabled() -> bool:
+    return os.getenv("ENABLE_MCP", "false").lower() == "true"
+
+
 def _mcp_operation_ids() -> Set[str]:
-    if os.getenv("ENABLE_MCP", "false").lower() != "true":
+    if not _mcp_enabled():
         return set()
     raw = os.getenv("MCP_EXPOSED_OPERATIONS", "[]")
     try:
@@ -259,8 +359,9 @@ def _mcp_operation_ids() -> Set[str]:
         raise RuntimeError("MCP_EXPOSED_OPERATIONS must be a JSON list")
     forbidden = {
         "handleUserAuth", "mcpAuth", "logoutUser", "postLogs",
-        "downloadAppcodePackage", "getLoginPage", "getMainApp",
-        "issueBffReplayTokens",
+        "downloadAppcodePackage", "getAppcodeManifest", "downloadAppcodeModule",
+        "getLoginPage", "getMainApp",
+        "issueBffReplayTokens", "getMetrics", "getBffProfile",
         "initiateGoogleAuth", "handleGoogleAuthCallback",
         "initiateMicrosoftAuth", "handleMicrosoftAuthCallback",
         "initiateSamlAuth", "initiateSamlProviderAuth",
@@ -287,6 +388,14 @@ def reload_mcp_tools():
     ]
     
     operation_ids = _mcp_operation_ids()
+    if not _mcp_enabled():
+        # Leave fastmcp unimported; the module ``__getattr__`` provides an
+        # empty ``mcp`` on demand.
+        globals().pop("mcp", None)
+        mcp_http_app = None
+        logger.info("MCP disabled; nothing mounted at /mcp")
+        return
+    FastMCP = _lazy_import("FastMCP")
     if operation_ids:
         mcp_source = _FilteredFastAPIApp(app, operation_ids)
         mcp = FastMCP.from_fastapi(app=mcp_source, name="pytincture")
@@ -325,6 +434,19 @@ def _local_python_imports(file_path: str, modules_root: str) -> Set[str]:
     return discovered
 
 
+def _walk_modules_tree(modules_root: str) -> Iterator[tuple]:
+    """``os.walk`` over the modules tree, skipping hidden, virtualenv, and build directories."""
+    for root, dirs, files in os.walk(modules_root):
+        dirs[:] = [
+            directory
+            for directory in dirs
+            if not directory.startswith(".")
+            and directory
+            not in {"__pycache__", ".venv", "venv", "node_modules", "build", "dist"}
+        ]
+        yield root, dirs, files
+
+
 def _configured_browser_files(modules_root: str) -> Set[str]:
     raw_patterns = os.getenv("PYTINCTURE_BROWSER_FILES", "").strip()
     if not raw_patterns:
@@ -336,14 +458,7 @@ def _configured_browser_files(modules_root: str) -> Set[str]:
     if not isinstance(patterns, list) or any(not isinstance(value, str) for value in patterns):
         raise RuntimeError("PYTINCTURE_BROWSER_FILES must be a JSON list or comma-separated globs")
     selected: Set[str] = set()
-    for root, dirs, files in os.walk(modules_root):
-        dirs[:] = [
-            directory
-            for directory in dirs
-            if not directory.startswith(".")
-            and directory
-            not in {"__pycache__", ".venv", "venv", "node_modules", "build", "dist"}
-        ]
+    for root, _, files in _walk_modules_tree(modules_root):
         for filename in files:
             absolute = os.path.abspath(os.path.join(root, filename))
             relative = os.path.relpath(absolute, modules_root).replace(os.sep, "/")
@@ -352,8 +467,72 @@ def _configured_browser_files(modules_root: str) -> Set[str]:
     return selected
 
 
-def _browser_package_files(application: str) -> Set[str]:
+def _modules_tree_fingerprint(modules_root: str) -> str:
+    """Hash the contents of every module and browser file a deployment bundle is built from."""
+    modules_root = os.path.abspath(modules_root)
+    selected = _configured_browser_files(modules_root)
+    for root, _, files in _walk_modules_tree(modules_root):
+        selected.update(os.path.join(root, filename) for filename in files if filename.endswith(".py"))
+    digest = hashlib.sha256()
+    for file_path in sorted(selected):
+        relative = os.path.relpath(file_path, modules_root).replace(os.sep, "/")
+        with open(file_path, "rb") as handle:
+            digest.update(relative.encode("utf-8") + b"\0" + hashlib.sha256(handle.read()).digest())
+    return digest.hexdigest()[:32]
+
+
+def _path_signatures(paths: Iterable[str]) -> Optional[Dict[str, tuple]]:
+    """``(mtime_ns, size)`` for each path, or ``None`` once one of them has gone."""
+    signatures: Dict[str, tuple] = {}
+    for path in paths:
+        try:
+            info = os.stat(path)
+        except OSError:
+            return None
+        signatures[path] = (info.st_mtime_ns, info.st_size)
+    return signatures
+
+
+# Package graphs by (modules root, application, PYTINCTURE_BROWSER_FILES), each
+# with the file and directory signatures it was derived from.
+_APPCODE_PACKAGES: Dict[tuple, tuple] = {}
+
+
+def _appcode_package(application: str) -> Dict[str, tuple]:
+    """
+    Signatures of the files in an application's browser package.
+
+    The import graph is parsed once and reused while neither its files nor any
+    directory of the modules tree has changed, so a warm lookup costs one stat
+    per file and directory instead of parsing every module again.
+    """
     modules_root = os.path.abspath(get_modules_path())
+    key = (modules_root, application, os.getenv("PYTINCTURE_BROWSER_FILES", ""))
+    cached = _APPCODE_PACKAGES.get(key)
+    if cached is not None:
+        files, directories = cached
+        current_files = _path_signatures(files)
+        if current_files == files and _path_signatures(directories) == directories:
+            return current_files
+    selected = _scan_browser_package(modules_root, application)
+    # A file created anywhere in the tree changes its directory's mtime, which
+    # catches imports and globs that start to resolve.
+    tree = {root for root, _, _ in _walk_modules_tree(modules_root)}
+    tree.update(os.path.dirname(file_path) for file_path in selected)
+    files = _path_signatures(selected)
+    directories = _path_signatures(tree)
+    if files is None or directories is None:
+        # The tree changed while it was being read; serve this scan uncached.
+        return _path_signatures(path for path in selected if os.path.exists(path)) or {}
+    _APPCODE_PACKAGES[key] = (files, directories)
+    return files
+
+
+def _browser_package_files(application: str) -> Set[str]:
+    return set(_appcode_package(application))
+
+
+def _scan_browser_package(modules_root: str, application: str) -> Set[str]:
     entrypoint = os.path.abspath(os.path.join(modules_root, f"{application}.py"))
     if os.path.commonpath((modules_root, entrypoint)) != modules_root or not os.path.isfile(entrypoint):
         raise HTTPException(status_code=404, detail="Application entrypoint not found")
@@ -364,37 +543,173 @@ def _browser_package_files(application: str) -> Set[str]:
             if imported not in selected:
                 selected.add(imported)
                 pending.append(imported)
-    for python_file in tuple(selected):
+    return _with_package_inits(selected, modules_root) | _configured_browser_files(modules_root)
+
+
+def _with_package_inits(python_files: Set[str], modules_root: str) -> Set[str]:
+    """Add the ``__init__.py`` of every package enclosing the given files."""
+    selected = set(python_files)
+    for python_file in python_files:
         parent = os.path.dirname(python_file)
         while parent != modules_root and os.path.commonpath((modules_root, parent)) == modules_root:
             package_init = os.path.join(parent, "__init__.py")
             if os.path.isfile(package_init):
                 selected.add(os.path.abspath(package_init))
             parent = os.path.dirname(parent)
-    return selected | _configured_browser_files(modules_root)
+    return selected
 
 
-def create_appcode_pkg_in_memory(host, protocol, application, replay_client=None):
-    """Generate an explicit browser-safe app package in memory."""
+APPCODE_BUILD_WORKERS = int(
+    os.getenv("PYTINCTURE_APPCODE_BUILD_WORKERS", str(min(8, os.cpu_count() or 1)))
+)
+if APPCODE_BUILD_WORKERS <= 0:
+    raise RuntimeError("PYTINCTURE_APPCODE_BUILD_WORKERS must be positive")
+_APPCODE_EXECUTORS: Dict[str, ThreadPoolExecutor] = {}
+_APPCODE_EXECUTORS_LOCK = threading.Lock()
+
+
+def _appcode_executor(role: str) -> ThreadPoolExecutor:
+    """
+    Threads for whole archive builds (``"build"``) and for the per-file work
+    inside them (``"file"``). Builds stay off anyio's shared thread limiter,
+    and the two roles never wait on each other's workers.
+    """
+    with _APPCODE_EXECUTORS_LOCK:
+        executor = _APPCODE_EXECUTORS.get(role)
+        if executor is None:
+            executor = _APPCODE_EXECUTORS[role] = ThreadPoolExecutor(
+                max_workers=APPCODE_BUILD_WORKERS,
+                thread_name_prefix=f"pytincture-appcode-{role}",
+            )
+        return executor
+
+
+def write_appcode_pkg(target, host, protocol, application, replay_client=None, compression=zipfile.ZIP_DEFLATED):
+    """Write an explicit browser-safe app package to a binary file object."""
     appcode_folder = os.path.abspath(get_modules_path())
-    in_memory_zip = io.BytesIO()
-    with zipfile.ZipFile(in_memory_zip, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file_path in sorted(_browser_package_files(application)):
+    file_paths = sorted(_browser_package_files(application))
+
+    def render(file_path):
+        if not file_path.endswith('.py'):
+            return None
+        return get_parsed_output(
+            file_path,
+            host,
+            protocol,
+            replay_client=replay_client,
+        ) or ""
+
+    with zipfile.ZipFile(target, 'w', compression) as zipf:
+        # Stubs are generated on the file pool while earlier entries are
+        # compressed here, in archive order.
+        rendered = _appcode_executor("file").map(render, file_paths)
+        for file_path, file_contents in zip(file_paths, rendered):
             arcname = os.path.relpath(file_path, appcode_folder).replace(os.sep, "/")
-            if file_path.endswith('.py'):
-                file_contents = get_parsed_output(
-                    file_path,
-                    host,
-                    protocol,
-                    replay_client=replay_client,
-                )
-                zipf.writestr(arcname, file_contents or "")
-            else:
+            if file_contents is None:
                 zipf.write(file_path, arcname)
+            else:
+                zipf.writestr(arcname, file_contents)
+
+
+def create_appcode_pkg_in_memory(host, protocol, application, replay_client=None, compression=zipfile.ZIP_DEFLATED):
+    """Generate an explicit browser-safe app package in memory."""
+    in_memory_zip = io.BytesIO()
+    write_appcode_pkg(in_memory_zip, host, protocol, application, replay_client, compression)
     in_memory_zip.seek(0)
     return in_memory_zip
 
 
+def _appcode_file_versions(host: str, protocol: str, application: str) -> Dict[str, str]:
+    """Map each packaged file's archive name to a token that changes with its generated contents."""
+    modules_root = os.path.abspath(get_modules_path())
+    settings = json.dumps(
+        [PYTINCTURE_VERSION, host.casefold(), protocol, stub_settings()],
+        sort_keys=True,
+    ).encode("utf-8")
+    versions: Dict[str, str] = {}
+    for file_path, (mtime_ns, size) in sorted(_appcode_package(application).items()):
+        arcname = os.path.relpath(file_path, modules_root).replace(os.sep, "/")
+        versions[arcname] = hashlib.sha256(
+            settings + f"\0{arcname}\0{mtime_ns}\0{size}".encode("utf-8")
+        ).hexdigest()[:16]
+    return versions
+
+
+def _appcode_archive_fingerprint(host: str, protocol: str, application: str) -> str:
+    """Identify a session-free archive by everything that shapes its bytes."""
+    versions = _appcode_file_versions(host, protocol, application)
+    return hashlib.sha256(json.dumps(versions, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def cached_appcode_archive(host: str, protocol: str, application: str) -> Optional[str]:
+    """Return the path of a session-free archive on disk, building it on first use."""
+    if APPCODE_ARCHIVE_CACHE is None or not APPCODE_ARCHIVE_CACHE.usable():
+        return None
+    prefix = f"{application}-{hashlib.sha256(f'{protocol}://{host.casefold()}'.encode('utf-8')).hexdigest()[:8]}-"
+    fingerprint = _appcode_archive_fingerprint(host, protocol, application)
+    path = APPCODE_ARCHIVE_CACHE.lookup(prefix, fingerprint)
+    if path is not None:
+        return path
+    build_started = time.perf_counter()
+    path = APPCODE_ARCHIVE_CACHE.store(
+        prefix,
+        fingerprint,
+        lambda target: write_appcode_pkg(target, host, protocol, application),
+    )
+    if path is not None:
+        BFF_METRICS.observe_appcode_build(
+            application, time.perf_counter() - build_started, os.path.getsize(path)
+        )
+    return path
+
+
+_APPCODE_BUILDS: Dict[tuple, asyncio.Future] = {}
+
+
+async def _run_appcode_build(func: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(
+        _appcode_executor("build"), partial(func, *args)
+    )
+
+
+def _appcode_archive_bytes(host, protocol, application, replay_client=None) -> bytes:
+    """Build an archive in memory and record the build."""
+    build_started = time.perf_counter()
+    payload = create_appcode_pkg_in_memory(host, protocol, application, replay_client).getvalue()
+    BFF_METRICS.observe_appcode_build(application, time.perf_counter() - build_started, len(payload))
+    return payload
+
+
+def _session_free_appcode_archive(host: str, protocol: str, application: str) -> Union[str, bytes]:
+    """The cached archive's path, or the archive itself when the file cache is unavailable."""
+    path = cached_appcode_archive(host, protocol, application)
+    if path is not None:
+        return path
+    return _appcode_archive_bytes(host, protocol, application)
+
+
+async def _shared_appcode_archive(host: str, protocol: str, application: str) -> Union[str, bytes]:
+    """``_session_free_appcode_archive`` where concurrent downloads of one archive share a single build."""
+    key = (application, protocol, host.casefold())
+    inflight = _APPCODE_BUILDS.get(key)
+    if inflight is not None:
+        BFF_METRICS.observe_appcode_build_waiter(application)
+        return await asyncio.shield(inflight)
+    future = asyncio.ensure_future(
+        _run_appcode_build(_session_free_appcode_archive, host, protocol, application)
+    )
+    _APPCODE_BUILDS[key] = future
+
+    def forget(done: asyncio.Future) -> None:
+        if _APPCODE_BUILDS.get(key) is done:
+            del _APPCODE_BUILDS[key]
+
+    future.add_done_callback(forget)
+    # Shielded so a client that disconnects does not cancel the build other
+    # downloads are waiting on.
+    return await asyncio.shield(future)
+
+
 def _get_default_application() -> Optional[str]:
     configured = os.getenv("PYTINCTURE_DEFAULT_APPLICATION", "").strip().strip("/")
     if not configured:
@@ -443,8 +758,11 @@ async def validation_exception_handler(request, exc):
 
 @app.middleware("http")
 async def correlation_id_middleware(request: Request, call_next):
-    correlation_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    span = current_span()
+    correlation_id = request.headers.get("x-request-id") or (span.trace_id if span else uuid.uuid4().hex)
     request.state.correlation_id = correlation_id
+    if span is not None:
+        span.set_attribute("pytincture.correlation_id", correlation_id)
     response = await call_next(request)
     response.headers["X-Request-ID"] = correlation_id
     csrf_token = request.session.get("csrf_token") if hasattr(request, "session") else None
@@ -473,6 +791,7 @@ async def sanitized_http_exception_handler(request: Request, exc: HTTPException)
         return JSONResponse(
             {"detail": "Internal server error", "correlation_id": correlation_id},
             status_code=exc.status_code,
+            headers=exc.headers,
         )
     return JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
 
@@ -561,10 +880,6 @@ if allowed_origins:
 else:
     logger.info("CORS middleware disabled; set CORS_ALLOWED_ORIGINS to enable it")
 
-from upstash_redis import Redis
-
-import json
-from upstash_redis import Redis  # or whatever your actual import is
 from markupsafe import escape
 
 class RedisDict:
@@ -574,7 +889,7 @@ class RedisDict:
     """
 
     def __init__(self, redis_url: str, redis_token: str, key_prefix: str = ""):
-        self._redis = Redis(url=redis_url, token=redis_token)
+        self._redis = _lazy_import("Redis")(url=redis_url, token=redis_token)
         self._prefix = key_prefix  # Optional prefix to avoid collisions
         self._cache = {}           # Local in-memory cache: { key: decoded_value }
 
@@ -616,12 +931,24 @@ class RedisDict:
         # Update local cache with the *decoded* form
         self._cache[key] = value
 
-    def set_with_ttl(self, key, value, ttl_seconds: int):
+    def set_with_ttl(self, key, value, ttl_seconds: int, cache_locally: bool = True):
         """Set a value that Redis removes automatically after the TTL."""
         full_key = self._prefix + key
         serialized = json.dumps(value) if isinstance(value, dict) else str(value)
         self._redis.set(full_key, serialized, ex=ttl_seconds)
-        self._cache[key] = value
+        if cache_locally:
+            self._cache[key] = value
+        else:
+            self._cache.pop(key, None)
+
+    def get_fresh(self, key, default=None):
+        """Read a value straight from Redis without populating the local cache."""
+        value = self._redis.get(self._prefix + key)
+        if not value:
+            return default
+        if isinstance(value, str) and value.startswith("{") and value.endswith("}"):
+            return json.loads(value)
+        return value
 
     def __delitem__(self, key):
         """Deletes the item from Redis and the local cache. Raises KeyError if missing."""
@@ -764,12 +1091,30 @@ if  USE_REDIS_INSTANCE == "true":
         redis_token=REDIS_UPSTASH_INSTANCE_TOKEN,
         key_prefix="bff-replay-token:",
     )
+    BFF_RESULT_CACHE_STORE = RedisDict(
+        redis_url=REDIS_UPSTASH_INSTANCE_URL,
+        redis_token=REDIS_UPSTASH_INSTANCE_TOKEN,
+        key_prefix="bff-cache:",
+    )
 else:
     USER_SESSION_DICT = {}
     AUTH_SESSION_REVOCATIONS = {}
     BFF_REPLAY_TOKEN_STORE = {}
+    BFF_RESULT_CACHE_STORE = None
 
 MODULE_PATH = get_modules_path()
+PYTINCTURE_BUNDLE_PATH = os.getenv("PYTINCTURE_BUNDLE_PATH", "").strip()
+DEPLOYMENT_BUNDLE = (
+    DeploymentBundle(PYTINCTURE_BUNDLE_PATH, _modules_tree_fingerprint(MODULE_PATH))
+    if PYTINCTURE_BUNDLE_PATH
+    else None
+)
+APPCODE_CACHE_DIR = os.getenv("PYTINCTURE_APPCODE_CACHE_DIR", "").strip()
+APPCODE_ARCHIVE_CACHE = (
+    None
+    if APPCODE_CACHE_DIR.lower() == "off"
+    else AppcodeArchiveCache(APPCODE_CACHE_DIR or default_cache_directory())
+)
 
 
 def build_bff_registry(modules_root: Optional[str] = None) -> Dict[tuple[str, str, str], Dict[str, Any]]:
@@ -800,8 +1145,13 @@ def build_bff_registry(modules_root: Optional[str] = None) -> Dict[tuple[str, st
     return registry
 
 
+_startup_phase("configuration")
 BFF_REGISTRY_ROOT = os.path.abspath(MODULE_PATH)
-BFF_REGISTRY = build_bff_registry(BFF_REGISTRY_ROOT)
+if DEPLOYMENT_BUNDLE is not None:
+    BFF_REGISTRY = DEPLOYMENT_BUNDLE.registry
+else:
+    BFF_REGISTRY = build_bff_registry(BFF_REGISTRY_ROOT)
+_startup_phase("bff registry")
 
 
 def reload_bff_registry(modules_root: Optional[str] = None):
@@ -819,6 +1169,183 @@ def _registered_bff_operation(
         reload_bff_registry(modules_root)
     return BFF_REGISTRY.get((relative_path.replace(os.sep, "/"), class_name, function_name))
 
+class BffResultCache:
+    """
+    Results of ``@bff_cache`` operations. Entries live in a bounded in-process
+    LRU and, when Upstash is configured, are shared between replicas through
+    Redis. Concurrent misses for the same key wait for a single computation.
+    """
+
+    def __init__(self, max_entries: int = 1024, shared_store=None):
+        self.max_entries = max_entries
+        self.shared_store = shared_store
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _record(self, operation: str, outcome: str) -> None:
+        counts = self._stats.setdefault(operation, {"hits": 0, "misses": 0, "coalesced": 0})
+        counts[outcome] += 1
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _lookup(self, key: str) -> tuple[bool, Any]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                return True, entry[1]
+            self._entries.pop(key, None)
+        if self.shared_store is not None:
+            # Upstash is reached over HTTP; keep the round trip off the event loop.
+            try:
+                shared = await anyio.to_thread.run_sync(self.shared_store.get_fresh, key)
+            except Exception:
+                logger.warning("Shared BFF cache read failed; treating it as a miss", exc_info=True)
+                return False, None
+            if isinstance(shared, dict) and float(shared.get("expires_at", 0)) > time.time():
+                self._remember(key, float(shared["expires_at"]), shared.get("value"))
+                return True, shared.get("value")
+        return False, None
+
+    async def _share(self, key: str, value: Any, expires_at: float, ttl: float) -> None:
+        """Best-effort write to the shared store; local waiters already have the value."""
+        try:
+            await anyio.to_thread.run_sync(
+                partial(
+                    self.shared_store.set_with_ttl,
+                    key,
+                    {"expires_at": expires_at, "value": value},
+                    max(1, int(math.ceil(ttl))),
+                    cache_locally=False,
+                )
+            )
+        except Exception:
+            logger.warning("Shared BFF cache write failed; the result stays local", exc_info=True)
+
+    async def get_or_load(self, operation: str, key: str, ttl: float, loader: Callable[[], Any]) -> Any:
+        found, value = await self._lookup(key)
+        if found:
+            self._record(operation, "hits")
+            return value
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._record(operation, "coalesced")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leading caller went away; compute the value for ourselves.
+                return await self.get_or_load(operation, key, ttl, loader)
+
+        self._record(operation, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            loaded = await loader()
+            if isinstance(loaded, Response):
+                # Binary and streamed responses cannot be shared; waiters load their own.
+                future.cancel()
+                return loaded
+            value = jsonable_encoder(loaded)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved when nobody else was waiting.
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        expires_at = time.time() + ttl
+        self._remember(key, expires_at, value)
+        future.set_result(value)
+        if self.shared_store is not None:
+            await self._share(key, value, expires_at, ttl)
+        return value
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-operation hit, miss, and coalesced counts with the hit ratio."""
+        report = {}
+        for operation, counts in self._stats.items():
+            total = counts["hits"] + counts["misses"] + counts["coalesced"]
+            served = counts["hits"] + counts["coalesced"]
+            report[operation] = {**counts, "hit_ratio": served / total if total else 0.0}
+        return report
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._stats.clear()
+
+
+BFF_CACHE_MAX_ENTRIES = int(os.getenv("BFF_CACHE_MAX_ENTRIES", "1024"))
+if BFF_CACHE_MAX_ENTRIES <= 0:
+    raise RuntimeError("BFF_CACHE_MAX_ENTRIES must be greater than zero")
+BFF_RESULT_CACHE = BffResultCache(BFF_CACHE_MAX_ENTRIES, BFF_RESULT_CACHE_STORE)
+
+
+def bff_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-operation ``@bff_cache`` hit-ratio metrics for this process."""
+    return BFF_RESULT_CACHE.stats()
+
+
+def _bff_user_identity(user: Any) -> List[str]:
+    policy_user = _coerce_policy_user(user)
+    return [
+        policy_user.get("auth_type", ""),
+        policy_user.get("auth_provider", ""),
+        policy_user.get("email", policy_user.get("value", "")),
+    ]
+
+
+def _bff_cache_key(
+    cache_config: Dict[str, Any],
+    identifier: str,
+    class_name: str,
+    function_name: str,
+    user: Any,
+    args: List[Any],
+    kwargs: Dict[str, Any],
+) -> str:
+    vary_on = cache_config.get("vary_on", ())
+    material: Dict[str, Any] = {"operation": [identifier, class_name, function_name]}
+    if "user" in vary_on:
+        material["user"] = _bff_user_identity(user)
+    if "args" in vary_on:
+        material["args"] = [args, kwargs]
+    encoded = json.dumps(jsonable_encoder(material), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+async def _cached_bff_result(
+    operation: Dict[str, Any],
+    identifier: str,
+    class_name: str,
+    function_name: str,
+    user: Any,
+    data: Any,
+    loader: Callable[[], Any],
+) -> Any:
+    """Serve ``@bff_cache`` operations from the result cache, else run ``loader``."""
+    cache_config = operation.get("cache")
+    if not cache_config:
+        return await loader()
+    args, kwargs = _bff_call_arguments(data)
+    key = _bff_cache_key(cache_config, identifier, class_name, function_name, user, args, kwargs)
+    return await BFF_RESULT_CACHE.get_or_load(
+        f"{identifier}:{class_name}.{function_name}",
+        key,
+        cache_config["ttl"],
+        loader,
+    )
+
 try:
     ALLOWED_NOAUTH_CLASSCALLS = json.loads(os.environ.get("ALLOWED_NOAUTH_CLASSCALLS", "[]"))
 except json.JSONDecodeError as e:
@@ -1336,6 +1863,21 @@ def _validate_csrf(request: Request, user: Any) -> None:
         raise HTTPException(status_code=403, detail="Origin validation failed")
 
 
+def _validate_websocket_csrf(websocket: WebSocket, user: Any) -> None:
+    """Browsers cannot set headers on a WebSocket handshake, so the token travels in the query string."""
+    if not isinstance(user, dict) or user.get("is_authenticated") is not True:
+        return
+    expected = websocket.session.get("csrf_token", "")
+    supplied = websocket.query_params.get("csrf", "")
+    if not expected or not supplied or not hmac.compare_digest(str(expected), supplied):
+        raise HTTPException(status_code=403, detail="CSRF validation failed")
+    origin = websocket.headers.get("origin")
+    expected_origin = _request_origin(websocket)
+    expected_origin = re.sub(r"^ws(s?)://", r"http\1://", expected_origin)
+    if origin and origin.rstrip("/") != expected_origin:
+        raise HTTPException(status_code=403, detail="Origin validation failed")
+
+
 def _bff_replay_subject(request: Request, user: Any) -> Optional[str]:
     if not isinstance(user, dict) or user.get("is_authenticated") is not True:
         return None
@@ -1531,24 +2073,173 @@ async def issue_bff_replay_tokens(
         headers={"Cache-Control": "no-store"},
     )
 
-@app.get("/{application}/appcode/appcode.pyt", operation_id="downloadAppcodePackage", responses={200: {"description": "StreamingResponse (ZIP file stream, media_type=\"application/zip\")"}, 401: {"description": "HTTPException (if authentication fails when required)"}})
-def download_appcode(request: Request, application: str, user=Depends(require_authenticated_user)):
+@app.get("/{application}/appcode/appcode.pyt", operation_id="downloadAppcodePackage", responses={200: {"description": "FileResponse or Response (ZIP archive, media_type=\"application/zip\")"}, 401: {"description": "HTTPException (if authentication fails when required)"}})
+async def download_appcode(request: Request, application: str, user=Depends(require_authenticated_user)):
     host = request.headers["host"]
     # Get the protocol from X-Forwarded-Proto header (if set)
     forwarded_proto = request.headers.get("x-forwarded-proto")
     protocol = forwarded_proto or request.url.scheme
     replay_client = _register_bff_replay_client(request, user)
-    file_like = create_appcode_pkg_in_memory(
-        host,
-        protocol,
-        application,
-        replay_client=replay_client,
+    prebuilt = _prebuilt_appcode_response(request, application, host, protocol, replay_client)
+    if prebuilt is not None:
+        return prebuilt
+    headers = {"Content-Disposition": "attachment; filename=appcode.pyt"}
+    if replay_client is None:
+        archive = await _shared_appcode_archive(host, protocol, application)
+    else:
+        # Archives carrying a per-session replay key are never written to disk
+        # or shared with other downloads.
+        archive = await _run_appcode_build(
+            _appcode_archive_bytes, host, protocol, application, replay_client
+        )
+    if isinstance(archive, str):
+        return FileResponse(archive, media_type="application/zip", headers=headers)
+    return Response(archive, media_type="application/zip", headers=headers)
+
+
+def _prebuilt_appcode_response(
+    request: Request,
+    application: str,
+    host: str,
+    protocol: str,
+    replay_client: Optional[Dict[str, Any]],
+) -> Optional[Response]:
+    """Serve the deployment bundle's archive when it was built for this URL and session-free."""
+    if DEPLOYMENT_BUNDLE is None or replay_client or not DEPLOYMENT_BUNDLE.serves(host, protocol):
+        return None
+    archive_path = DEPLOYMENT_BUNDLE.archive_path(application)
+    if archive_path is None:
+        return None
+    headers = {
+        "Content-Disposition": "attachment; filename=appcode.pyt",
+        "Vary": "Accept-Encoding",
+    }
+    gzip_path = DEPLOYMENT_BUNDLE.gzip_archive_path(application)
+    if gzip_path is not None and "gzip" in request.headers.get("accept-encoding", "").lower():
+        return FileResponse(gzip_path, media_type="application/zip", headers={**headers, "Content-Encoding": "gzip"})
+    return FileResponse(archive_path, media_type="application/zip", headers=headers)
+
+
+def _appcode_module_name(arcname: str) -> str:
+    name = arcname[:-len(".py")].replace("/", ".")
+    return name[:-len(".__init__")] if name.endswith(".__init__") else name
+
+
+def _appcode_chunk_replay_client(request: Request, user: Any) -> Optional[Dict[str, Any]]:
+    """Rebuild the replay client issued with the manifest from the capsule the browser sends back."""
+    if not ENABLE_BFF_REPLAY_TOKENS:
+        return None
+    session_id = _bff_replay_subject(request, user)
+    if session_id is None:
+        return None
+    return {
+        "capsule": request.headers.get("x-pytincture-client", ""),
+        "key": _bff_replay_client_key(request, session_id),
+    }
+
+
+@app.get("/{application}/appcode/manifest.json", operation_id="getAppcodeManifest", responses={200: {"description": "JSONResponse (module map, file versions and prefetch hints for chunked loading)"}, 401: {"description": "HTTPException (if authentication fails when required)"}})
+def appcode_manifest(request: Request, application: str, user=Depends(require_authenticated_user)):
+    """
+    Describe the browser package for chunked loading.
+
+    The browser fetches the ``prefetch`` modules (the entrypoint, its direct
+    imports and their packages) and the data files up front; every other
+    module is fetched from ``modules/<path>`` on first import.
+    """
+    host = request.headers["host"]
+    protocol = request.headers.get("x-forwarded-proto") or request.url.scheme
+    versions = _appcode_file_versions(host, protocol, application)
+    modules_root = os.path.abspath(get_modules_path())
+    entrypoint = os.path.abspath(os.path.join(modules_root, f"{application}.py"))
+    prefetch = _with_package_inits(
+        {entrypoint} | _local_python_imports(entrypoint, modules_root), modules_root
     )
-    return StreamingResponse(
-        file_like,
-        media_type="application/zip",
-        headers={"Content-Disposition": "attachment; filename=appcode.pyt"}
+    replay_client = _register_bff_replay_client(request, user)
+    return JSONResponse(
+        {
+            "format": 1,
+            "application": application,
+            "modules": {
+                _appcode_module_name(arcname): arcname
+                for arcname in versions
+                if arcname.endswith(".py")
+            },
+            "data": [arcname for arcname in versions if not arcname.endswith(".py")],
+            "versions": versions,
+            "prefetch": sorted(
+                os.path.relpath(file_path, modules_root).replace(os.sep, "/")
+                for file_path in prefetch
+            ),
+            "client": replay_client["capsule"] if replay_client else None,
+        },
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+# Generated session-free modules by (host, protocol, archive name, version).
+# The version covers the file's signature and the stub settings, so an entry
+# never goes stale; the oldest are dropped past APPCODE_MODULE_CACHE_ENTRIES.
+_APPCODE_MODULE_SOURCES: "OrderedDict[tuple, str]" = OrderedDict()
+_APPCODE_MODULE_SOURCES_LOCK = threading.Lock()
+APPCODE_MODULE_CACHE_ENTRIES = 1024
+
+
+def _appcode_module(
+    host: str,
+    protocol: str,
+    application: str,
+    module_path: str,
+    replay_client: Optional[Dict[str, Any]],
+) -> tuple:
+    """Resolve one packaged file to ``(path, version, generated source or None for data files)``."""
+    modules_root = os.path.abspath(get_modules_path())
+    file_path = os.path.join(modules_root, *module_path.split("/"))
+    version = _appcode_file_versions(host, protocol, application).get(module_path)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Module not found")
+    if not file_path.endswith(".py"):
+        return file_path, version, None
+    if replay_client:
+        return file_path, version, get_parsed_output(file_path, host, protocol, replay_client=replay_client) or ""
+    key = (host.casefold(), protocol, module_path, version)
+    with _APPCODE_MODULE_SOURCES_LOCK:
+        source = _APPCODE_MODULE_SOURCES.get(key)
+        if source is not None:
+            _APPCODE_MODULE_SOURCES.move_to_end(key)
+            return file_path, version, source
+    source = get_parsed_output(file_path, host, protocol) or ""
+    with _APPCODE_MODULE_SOURCES_LOCK:
+        _APPCODE_MODULE_SOURCES[key] = source
+        while len(_APPCODE_MODULE_SOURCES) > APPCODE_MODULE_CACHE_ENTRIES:
+            _APPCODE_MODULE_SOURCES.popitem(last=False)
+    return file_path, version, source
+
+
+@app.get("/{application}/appcode/modules/{module_path:path}", operation_id="downloadAppcodeModule", responses={200: {"description": "Response (one generated browser module) or FileResponse (data file)"}, 401: {"description": "HTTPException (if authentication fails when required)"}, 404: {"description": "HTTPException (if the file is not part of the browser package)"}, 409: {"description": "HTTPException (if the replay capsule is missing or expired)"}})
+async def download_appcode_module(request: Request, application: str, module_path: str, user=Depends(require_authenticated_user)):
+    """
+    One file of the browser package, generated exactly as it would be inside appcode.pyt.
+
+    Session-free files requested with their current ``v`` version are
+    immutable and cached by the browser for a year; the manifest hands out a
+    new version whenever the file or the stub settings change.
+    """
+    host = request.headers["host"]
+    protocol = request.headers.get("x-forwarded-proto") or request.url.scheme
+    replay_client = _appcode_chunk_replay_client(request, user)
+    file_path, version, source = await _run_appcode_build(
+        _appcode_module, host, protocol, application, module_path, replay_client
     )
+    if replay_client:
+        headers = {"Cache-Control": "no-store"}
+    elif request.query_params.get("v") == version:
+        headers = {"Cache-Control": "private, max-age=31536000, immutable"}
+    else:
+        headers = {"Cache-Control": "no-cache"}
+    if source is None:
+        return FileResponse(file_path, headers=headers)
+    return Response(source, media_type="text/x-python; charset=utf-8", headers=headers)
 
 
 _DEFAULT_PUBLIC_ASSET_EXTENSIONS = {
@@ -1577,56 +2268,902 @@ def _public_asset_allowed(relative_path: str) -> bool:
     )
 
 
-def _normalized_distribution_name(value: str) -> str:
-    return re.sub(r"[-_.]+", "-", value).casefold()
+def _normalized_distribution_name(value: str) -> str:
+    return re.sub(r"[-_.]+", "-", value).casefold()
+
+
+def _application_widget_wheel_allowed(
+    application: str,
+    relative_path: str,
+    modules_root: str,
+) -> bool:
+    """Allow only a root-level wheel for the widgetset detected for this app."""
+    if "/" in relative_path or not relative_path.lower().endswith(".whl"):
+        return False
+    wheel_match = re.fullmatch(
+        r"(?P<distribution>[A-Za-z0-9_.]+)-[^/]+-[^-]+-[^-]+-[^-]+\.whl",
+        relative_path,
+    )
+    if not wheel_match:
+        return False
+    widget_spec = get_widgetset(application, modules_root)
+    widget_distribution = widget_spec.split("==", 1)[0].strip()
+    if not widget_distribution:
+        return False
+    return _normalized_distribution_name(wheel_match.group("distribution")) == (
+        _normalized_distribution_name(widget_distribution)
+    )
+
+
+@app.api_route(
+    "/{application}/appcode/{asset_path:path}",
+    methods=["GET", "HEAD"],
+    include_in_schema=False,
+)
+async def public_app_asset(application: str, asset_path: str):
+    normalized = asset_path.replace("\\", "/").strip("/")
+    if not normalized or any(part in {"", ".", ".."} or part.startswith(".") for part in normalized.split("/")):
+        raise HTTPException(status_code=404, detail="Asset not found")
+    modules_root = os.path.realpath(get_modules_path())
+    absolute_path = os.path.realpath(os.path.join(modules_root, *normalized.split("/")))
+    try:
+        within_root = os.path.commonpath((modules_root, absolute_path)) == modules_root
+    except ValueError:
+        within_root = False
+    asset_allowed = _public_asset_allowed(normalized) or _application_widget_wheel_allowed(
+        application,
+        normalized,
+        modules_root,
+    )
+    if not within_root or not os.path.isfile(absolute_path) or not asset_allowed:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return FileResponse(absolute_path)
+
+def _resolve_bff_call_target(file_path: str):
+    """Normalize a BFF file identifier to its ``.py`` registry key."""
+    normalized_identifier = _normalize_file_identifier(file_path)
+    if not normalized_identifier:
+        raise HTTPException(status_code=400, detail="Invalid file path")
+
+    request_identifier_with_ext = normalized_identifier
+    if not request_identifier_with_ext.lower().endswith(".py"):
+        request_identifier_with_ext += ".py"
+    return request_identifier_with_ext
+
+
+def _resolve_bff_module_file(request_identifier_with_ext: str) -> tuple[str, str]:
+    """Return the modules root and the confined absolute path of a BFF module."""
+    modules_root = os.path.abspath(get_modules_path())
+    fs_relative = request_identifier_with_ext.replace("/", os.sep)
+    fs_relative = os.path.normpath(fs_relative)
+
+    if fs_relative.startswith("..") or os.path.isabs(fs_relative) or os.path.splitdrive(fs_relative)[0]:
+        raise HTTPException(status_code=400, detail="Invalid file path")
+
+    if os.path.basename(fs_relative).startswith("."):
+        raise HTTPException(status_code=400, detail="Invalid file name")
+
+    module_file_path = os.path.abspath(os.path.join(modules_root, fs_relative))
+
+    try:
+        common_root = os.path.commonpath([module_file_path, modules_root])
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid module path")
+
+    if common_root != modules_root:
+        raise HTTPException(status_code=400, detail="Invalid file path")
+
+    if not os.path.isfile(module_file_path):
+        raise HTTPException(status_code=404, detail=f"File {request_identifier_with_ext} not found in appcode folder")
+    return modules_root, module_file_path
+
+
+def _exported_bff_operation(
+    modules_root: str,
+    request_identifier_with_ext: str,
+    class_name: str,
+    function_name: str,
+) -> Dict[str, Any]:
+    operation = _registered_bff_operation(
+        modules_root,
+        request_identifier_with_ext,
+        class_name,
+        function_name,
+    )
+    if operation is None:
+        raise HTTPException(status_code=404, detail="BFF operation not exported")
+    return operation
+
+
+async def _run_bff_policy_hook(
+    request: Request,
+    user: Any,
+    operation: Dict[str, Any],
+    request_identifier_with_ext: str,
+    class_name: str,
+    function_name: str,
+) -> None:
+    policy_hook = _configured_bff_policy_hook()
+    if policy_hook:
+        policy_result = policy_hook(
+            user=_coerce_policy_user(user),
+            policy=operation.get("policy", {}),
+            class_name=class_name,
+            function_name=function_name,
+            module_path=request_identifier_with_ext,
+            request=request,
+        )
+        if inspect.isawaitable(policy_result):
+            await policy_result
+
+
+def _bff_call_arguments(data: Any) -> tuple[List[Any], Dict[str, Any]]:
+    """Split a decoded BFF request body into positional and keyword arguments."""
+    if isinstance(data, str):
+        try:
+            data = json.loads(str(data))
+        except json.JSONDecodeError as exc:
+            raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="BFF request body must be an object")
+    args = data.get("args", [])
+    kwargs = data.get("kwargs", {})
+    if not isinstance(args, list) or not isinstance(kwargs, dict):
+        raise HTTPException(status_code=400, detail="Invalid BFF arguments")
+
+    # Handle structured args format if present
+    if args and isinstance(args[0], dict) and 'value' in args[0]:
+        args = [arg['value'] for arg in args]
+    # Handle if args and kwargs do not exist in data
+    elif "args" not in data and "kwargs" not in data:
+        kwargs = data
+    return args, kwargs
+
+
+def _bff_upload_body_limit(scope: Dict[str, Any]) -> Optional[int]:
+    """Body limit of a ``@bff_upload`` operation, which replaces ``MAX_REQUEST_BODY_BYTES``."""
+    path = scope.get("path", "")
+    if scope.get("method") == "GET" or not path.startswith("/classcall/"):
+        return None
+    parts = path[len("/classcall/"):].rsplit("/", 2)
+    if len(parts) != 3:
+        return None
+    try:
+        operation = _registered_bff_operation(
+            os.path.abspath(get_modules_path()),
+            _resolve_bff_call_target(parts[0]),
+            parts[1],
+            parts[2],
+        )
+    except (HTTPException, RuntimeError):
+        return None  # class_call reports the problem.
+    if not operation or "upload" not in operation:
+        return None
+    return operation["upload"].get("max_bytes", BFF_UPLOAD_MAX_BYTES)
+
+
+async def _spool_bff_upload(request: Request):
+    """
+    Stream the request body into a temporary file that stays in memory up to
+    ``BFF_UPLOAD_SPOOL_BYTES`` and is written to disk from a worker thread
+    beyond that.
+    """
+    upload = tempfile.SpooledTemporaryFile(max_size=BFF_UPLOAD_SPOOL_BYTES)
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > BFF_UPLOAD_SPOOL_BYTES:
+                await anyio.to_thread.run_sync(upload.write, chunk)
+            else:
+                upload.write(chunk)
+        upload.seek(0)
+    except ClientDisconnect as exc:
+        upload.close()
+        raise HTTPException(status_code=499, detail="Client disconnected") from exc
+    except BaseException:
+        upload.close()
+        raise
+    return upload
+
+
+def _bff_function_flags(func) -> Dict[str, Any]:
+    function_obj = getattr(func, "__func__", func)
+    return {
+        "streaming": getattr(function_obj, "_bff_streaming", False),
+        "streaming_raw": getattr(function_obj, "_bff_streaming_raw", False),
+        "streaming_media_type": getattr(function_obj, "_bff_streaming_media_type", "text/event-stream"),
+        "streaming_sse": getattr(function_obj, "_bff_streaming_sse", False),
+        "async_gen": inspect.isasyncgenfunction(function_obj),
+        "coroutine": inspect.iscoroutinefunction(function_obj),
+    }
+
+
+def _serialize_stream_item(item, raw: bool = False) -> bytes:
+    # Ensure each streamed chunk is JSON encoded and newline-delimited unless raw passthrough is requested.
+    if isinstance(item, (bytes, bytearray)):
+        data_bytes = bytes(item)
+    elif isinstance(item, str):
+        data_bytes = item.encode("utf-8")
+    else:
+        data_bytes = json.dumps(item).encode("utf-8")
+    if not raw and not data_bytes.endswith(b"\n"):
+        data_bytes += b"\n"
+    return data_bytes
+
+
+def _close_iterator(iterator) -> None:
+    close = getattr(iterator, "close", None)
+    if callable(close):
+        close()
+
+
+def _sync_iterable(iterable: Iterable, raw: bool = False):
+    started = time.monotonic()
+    output_bytes = 0
+    iterator = iter(iterable)
+    try:
+        for item in iterator:
+            if time.monotonic() - started > BFF_STREAM_MAX_SECONDS:
+                return
+            serialized = _serialize_stream_item(item, raw)
+            output_bytes += len(serialized)
+            if output_bytes > BFF_STREAM_MAX_BYTES:
+                return
+            yield serialized
+    finally:
+        _close_iterator(iterator)
+
+
+async def _async_iterable(iterable: AsyncIterable, raw: bool = False):
+    started = time.monotonic()
+    output_bytes = 0
+    iterator = iterable.__aiter__()
+    try:
+        while True:
+            remaining = BFF_STREAM_MAX_SECONDS - (time.monotonic() - started)
+            if remaining <= 0:
+                return
+            try:
+                item = await asyncio.wait_for(iterator.__anext__(), timeout=remaining)
+            except (StopAsyncIteration, asyncio.TimeoutError):
+                return
+            serialized = _serialize_stream_item(item, raw)
+            output_bytes += len(serialized)
+            if output_bytes > BFF_STREAM_MAX_BYTES:
+                return
+            yield serialized
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if callable(aclose):
+            await aclose()
+
+
+async def _inline_iterable(iterable: Iterable):
+    for chunk in iterable:
+        yield chunk
+
+
+def bff_stream_stats() -> Dict[str, Any]:
+    """Throughput of active and recently finished ``@bff_stream`` responses, with per-operation totals."""
+    return {**BFF_STREAMS.stats(), "sse": BFF_SSE_STREAMS.stats()}
+
+
+async def _wait_for_bff_disconnect(request: Request) -> None:
+    """Return once the client has gone away; the request body must already be read."""
+    while True:
+        message = await request.receive()
+        if message.get("type") == "http.disconnect":
+            return
+
+
+async def _run_until_bff_disconnect(request: Request, awaitable) -> Any:
+    """
+    Await a BFF call unless the client disconnects first, in which case the
+    call is cancelled (which also signals the cancel token of sync calls).
+    """
+    call = asyncio.ensure_future(awaitable)
+    disconnect = asyncio.ensure_future(_wait_for_bff_disconnect(request))
+    try:
+        done, _ = await asyncio.wait({call, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        disconnect.cancel()
+        if not call.done():
+            call.cancel()
+    if call in done:
+        return call.result()
+    try:
+        await call
+    except (asyncio.CancelledError, Exception):
+        pass
+    raise HTTPException(status_code=499, detail="Client disconnected")
+
+
+async def _disconnect_guarded_stream(body, request: Request, cancel_token: threading.Event):
+    """
+    Relay a stream body until it ends or the client disconnects. When the
+    stream is abandoned the cancel token is set and the pending item is
+    cancelled; the body is always closed so the BFF generator's cleanup runs.
+    """
+    disconnect = asyncio.ensure_future(_wait_for_bff_disconnect(request))
+    context = contextvars.copy_context()
+    context.run(_CURRENT_CANCEL_TOKEN.set, cancel_token)
+    pending = None
+    finished = False
+    try:
+        while True:
+            pending = asyncio.get_running_loop().create_task(body.__anext__(), context=context)
+            await asyncio.wait({pending, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if not pending.done():
+                return
+            try:
+                item = pending.result()
+            except StopAsyncIteration:
+                finished = True
+                return
+            yield item
+    finally:
+        disconnect.cancel()
+        # Starlette may be cancelling this stream; cleanup must still finish.
+        with anyio.CancelScope(shield=True):
+            if not finished:
+                cancel_token.set()
+            if pending is not None and not pending.done():
+                pending.cancel()
+                try:
+                    await pending
+                except (asyncio.CancelledError, Exception):
+                    pass
+            await body.aclose()
+
+
+def _stream_chunks(result_obj, streaming_raw: bool):
+    if inspect.isasyncgen(result_obj) or hasattr(result_obj, "__aiter__"):
+        return _async_iterable(result_obj, streaming_raw)
+    if isinstance(result_obj, (str, bytes, bytearray, dict)):
+        return _inline_iterable(_sync_iterable([result_obj], streaming_raw))
+    if inspect.isgenerator(result_obj) or isinstance(result_obj, Iterable):
+        # One producer thread per stream instead of a threadpool hop per item.
+        return threaded_chunks(_sync_iterable(result_obj, streaming_raw), BFF_STREAM_QUEUE_ITEMS)
+    # Fallback: stream single value
+    return _inline_iterable(_sync_iterable([result_obj], streaming_raw))
+
+
+def _coalesced_body(chunks, operation: str):
+    return coalesced_chunks(
+        chunks,
+        BFF_STREAMS,
+        operation,
+        BFF_STREAM_COALESCE_BYTES,
+        BFF_STREAM_COALESCE_MS / 1000,
+    )
+
+
+def _as_streaming_response(
+    result_obj,
+    streaming_raw: bool,
+    streaming_media_type: str,
+    request: Optional[Request] = None,
+    cancel_token: Optional[threading.Event] = None,
+    operation: str = "",
+):
+    if isinstance(result_obj, StreamingResponse):
+        return result_obj
+
+    body = _coalesced_body(_stream_chunks(result_obj, streaming_raw), operation)
+    if request is not None:
+        body = _disconnect_guarded_stream(body, request, cancel_token or threading.Event())
+    return StreamingResponse(body, media_type=streaming_media_type)
+
+
+def _bff_sse_owner(operation: str, user: Any) -> str:
+    encoded = json.dumps([operation, _bff_user_identity(user)], separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _sse_subscription_response(stream, after_seq: int, request: Request, operation: str) -> StreamingResponse:
+    # Leaving the connection only unsubscribes; the stream's own resume window
+    # decides when the BFF generator is cancelled.
+    body = _disconnect_guarded_stream(
+        _coalesced_body(stream.subscribe(after_seq), operation),
+        request,
+        threading.Event(),
+    )
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _as_sse_response(
+    result_obj,
+    request: Request,
+    cancel_token: threading.Event,
+    operation: str,
+    user: Any,
+):
+    """Start a resumable ``@bff_stream(sse=True)`` stream and subscribe this request to it."""
+    if isinstance(result_obj, StreamingResponse):
+        return result_obj
+    context = contextvars.copy_context()
+    context.run(_CURRENT_CANCEL_TOKEN.set, cancel_token)
+    stream = BFF_SSE_STREAMS.create(
+        _bff_sse_owner(operation, user),
+        _stream_chunks(result_obj, True),
+        on_cancel=cancel_token.set,
+        context=context,
+    )
+    return _sse_subscription_response(stream, 0, request, operation)
+
+
+def _resumed_sse_response(request: Request, operation: str, user: Any) -> Optional[StreamingResponse]:
+    """
+    Serve a reconnect carrying ``Last-Event-ID`` from the stream's buffer.
+
+    An id this process does not know (expired, owned by someone else, or
+    issued by another worker) is rejected rather than re-running the method,
+    which would replay events the client already has.
+    """
+    last_event_id = request.headers.get("last-event-id")
+    if not last_event_id:
+        return None
+    resumed = BFF_SSE_STREAMS.resume(last_event_id, _bff_sse_owner(operation, user))
+    if resumed is None:
+        raise HTTPException(status_code=410, detail="Event stream is no longer resumable")
+    stream, after_seq = resumed
+    return _sse_subscription_response(stream, after_seq, request, operation)
+
+
+def _bff_etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored.
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def _http_cached_bff_response(request: Request, result: Any, http_cache: Dict[str, Any]) -> Response:
+    """Serialize a GET result with a weak ETag, answering 304 when it still matches."""
+    response = JSONResponse(content=jsonable_encoder(result))
+    etag = f'W/"{hashlib.sha256(response.body).hexdigest()[:32]}"'
+    visibility = "private" if http_cache.get("private", True) else "public"
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"{visibility}, max-age={int(http_cache.get('max_age', 0))}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _bff_etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
+
+
+BFF_BINARY_RESULT_HEADERS = {"X-Pytincture-Result": "binary"}
+BFF_BINARY_CHUNK_BYTES = 64 * 1024
+
+
+def _is_binary_bff_result(result: Any) -> bool:
+    # NamedTemporaryFile() returns a wrapper that proxies to, but is not, an io.IOBase.
+    return isinstance(
+        result,
+        (bytes, bytearray, memoryview, pathlib.PurePath, io.IOBase, tempfile._TemporaryFileWrapper),
+    )
+
+
+def _binary_result_source(result: Any):
+    """
+    Return ``(path, file, close)`` for a Path or file result. ``path`` is set
+    when the whole file can be served from disk, otherwise ``file`` is read
+    from its current position; ``close`` releases the handle once sent.
+    """
+    if isinstance(result, pathlib.PurePath):
+        return os.fspath(result), None, None
+    # Closing the temporary file wrapper, not its inner file, keeps it alive and
+    # deletes the file only after the response has been sent.
+    close = result.close
+    file = result.file if isinstance(result, tempfile._TemporaryFileWrapper) else result
+    if isinstance(file, io.TextIOBase):
+        file = getattr(file, "buffer", None)
+        if file is None:
+            close()
+            raise HTTPException(
+                status_code=500,
+                detail="Text BFF results without a binary buffer cannot be sent; return bytes or a binary file",
+            )
+    name = getattr(file, "name", None)
+    try:
+        at_start = file.tell() == 0
+    except (OSError, ValueError):
+        at_start = False
+    if at_start and isinstance(name, str) and os.path.isfile(name):
+        return name, file, close
+    return None, file, close
+
+
+def _binary_bff_response(result: Any) -> Response:
+    """
+    Serve bytes-like results without a copy and Path or file results with
+    ``FileResponse`` (sendfile and Range requests) instead of JSON encoding.
+    """
+    if isinstance(result, (bytes, memoryview)):
+        return Response(result, media_type="application/octet-stream", headers=BFF_BINARY_RESULT_HEADERS)
+    if isinstance(result, bytearray):
+        return Response(memoryview(result), media_type="application/octet-stream", headers=BFF_BINARY_RESULT_HEADERS)
+    path, file, close = _binary_result_source(result)
+    background = BackgroundTask(close) if close is not None else None
+    if path is not None:
+        if not os.path.isfile(path):
+            raise HTTPException(status_code=404, detail="File not found")
+        return FileResponse(path, headers=BFF_BINARY_RESULT_HEADERS, background=background)
+    return StreamingResponse(
+        iter(partial(file.read, BFF_BINARY_CHUNK_BYTES), b""),
+        media_type="application/octet-stream",
+        headers=BFF_BINARY_RESULT_HEADERS,
+        background=background,
+    )
+
+
+async def _columnar_bff_response(request: Request, result: Any) -> Any:
+    """
+    Encode a ``@bff_result("arrow")`` result as an Arrow IPC stream when the
+    client accepts one, else return it as JSON rows.
+    """
+    if ARROW_STREAM_MEDIA_TYPE in request.headers.get("accept", "") and arrow_available():
+        table = to_arrow_table(result)
+        if table is not None:
+            payload = await anyio.to_thread.run_sync(encode_arrow_stream, table)
+            return Response(
+                memoryview(payload),
+                media_type=ARROW_STREAM_MEDIA_TYPE,
+                headers={"X-Pytincture-Result": "arrow", "Vary": "Accept"},
+            )
+    return to_json_rows(result)
+
+
+async def _encoded_bff_result(request: Request, operation: Dict[str, Any], result: Any) -> Any:
+    """Turn binary and columnar results into responses; other results stay JSON."""
+    if _is_binary_bff_result(result):
+        return _binary_bff_response(result)
+    if operation.get("result_format") == "arrow":
+        return await _columnar_bff_response(request, result)
+    return result
+
+
+def _binary_bff_bytes(result: Any) -> bytes:
+    """Read a binary result into memory, for transports without a response body."""
+    if isinstance(result, (bytes, bytearray, memoryview)):
+        return bytes(result)
+    path, file, close = _binary_result_source(result)
+    if file is None:
+        if not os.path.isfile(path):
+            raise HTTPException(status_code=404, detail="File not found")
+        with open(path, "rb") as path_file:
+            return path_file.read()
+    try:
+        return file.read()
+    finally:
+        close()
+
+
+async def _invoke_bff_callable(
+    func,
+    flags: Dict[str, Any],
+    args: List[Any],
+    kwargs: Dict[str, Any],
+    executor: Optional[Dict[str, Any]] = None,
+    cancel_token: Optional[threading.Event] = None,
+    operation: Optional[str] = None,
+):
+    """
+    Run a BFF callable under the call timeout; streaming results are returned
+    unconsumed. ``operation`` labels the call's samples in the profiler.
+    """
+    cancel_token = cancel_token or threading.Event()
+    context_token = _CURRENT_CANCEL_TOKEN.set(cancel_token)
+    try:
+        return await _invoke_bff_callable_with_timeout(func, flags, args, kwargs, executor, operation)
+    except HTTPException as exc:
+        if exc.status_code == 504:
+            # Cooperative cancellation for sync methods that are still running.
+            cancel_token.set()
+        raise
+    except asyncio.CancelledError:
+        cancel_token.set()
+        raise
+    finally:
+        _CURRENT_CANCEL_TOKEN.reset(context_token)
+
+
+async def _invoke_bff_callable_with_timeout(
+    func,
+    flags: Dict[str, Any],
+    args: List[Any],
+    kwargs: Dict[str, Any],
+    executor: Optional[Dict[str, Any]],
+    operation: Optional[str] = None,
+):
+    if flags["async_gen"]:
+        result = func(*args, **kwargs)
+        if flags["streaming"]:
+            return result
+        collected_items = []
+        async def collect_items():
+            async for item in result:
+                collected_items.append(item)
+        try:
+            await asyncio.wait_for(
+                await_labelled(operation, collect_items()), timeout=BFF_CALL_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError as exc:
+            raise HTTPException(status_code=504, detail="BFF call timed out") from exc
+        return collected_items
+
+    if flags["coroutine"]:
+        try:
+            return await asyncio.wait_for(
+                await_labelled(operation, func(*args, **kwargs)), timeout=BFF_CALL_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError as exc:
+            raise HTTPException(status_code=504, detail="BFF call timed out") from exc
+    executor = executor or {}
+    pool = BFF_EXECUTORS.pool(
+        executor.get("pool"),
+        executor.get("max_workers"),
+        executor.get("max_queue"),
+    )
+    try:
+        return await asyncio.wait_for(
+            pool.run(run_labelled, operation, func, *args, **kwargs),
+            timeout=BFF_CALL_TIMEOUT_SECONDS,
+        )
+    except BffExecutorSaturated as exc:
+        raise HTTPException(
+            status_code=503,
+            detail="BFF executor is busy",
+            headers={"Retry-After": str(BFF_EXECUTOR_RETRY_AFTER_SECONDS)},
+        ) from exc
+    except asyncio.TimeoutError as exc:
+        raise HTTPException(status_code=504, detail="BFF call timed out") from exc
+
+
+def bff_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Utilization, queue depth, rejections, and wait times for each BFF executor pool."""
+    stats = BFF_EXECUTORS.stats()
+    if BFF_PROCESS_POOL is not None:
+        stats["process"] = BFF_PROCESS_POOL.stats()
+    return stats
+
+
+def _process_mode_preload_targets() -> List[tuple[str, str]]:
+    return sorted(
+        {
+            (os.path.join(BFF_REGISTRY_ROOT, relative_path.replace("/", os.sep)), class_name)
+            for (relative_path, class_name, _), operation in BFF_REGISTRY.items()
+            if operation.get("execution") == "process"
+        }
+    )
+
+
+def _bff_process_pool() -> BffProcessPool:
+    global BFF_PROCESS_POOL
+    if BFF_PROCESS_POOL is None:
+        BFF_PROCESS_POOL = BffProcessPool(
+            BFF_PROCESS_POOL_WORKERS,
+            preload_targets=_process_mode_preload_targets,
+            start_method=BFF_PROCESS_START_METHOD,
+            kill_grace=BFF_PROCESS_KILL_GRACE_SECONDS,
+        )
+    return BFF_PROCESS_POOL
+
 
+async def _invoke_bff_in_process(
+    module_file_path: str,
+    class_name: str,
+    function_name: str,
+    user: Any,
+    args: List[Any],
+    kwargs: Dict[str, Any],
+):
+    """Run a ``@bff_execution("process")`` method in the warm process pool."""
+    try:
+        return await _bff_process_pool().run(
+            BFF_CALL_TIMEOUT_SECONDS,
+            module_file_path,
+            class_name,
+            function_name,
+            user,
+            args,
+            kwargs,
+        )
+    except asyncio.TimeoutError as exc:
+        raise HTTPException(status_code=504, detail="BFF call timed out") from exc
+    except BrokenProcessPool as exc:
+        # A worker died (for example killed by the OS); the next call gets a fresh pool.
+        raise HTTPException(status_code=503, detail="BFF worker process unavailable") from exc
 
-def _application_widget_wheel_allowed(
-    application: str,
-    relative_path: str,
-    modules_root: str,
-) -> bool:
-    """Allow only a root-level wheel for the widgetset detected for this app."""
-    if "/" in relative_path or not relative_path.lower().endswith(".whl"):
-        return False
-    wheel_match = re.fullmatch(
-        r"(?P<distribution>[A-Za-z0-9_.]+)-[^/]+-[^-]+-[^-]+-[^-]+\.whl",
-        relative_path,
-    )
-    if not wheel_match:
-        return False
-    widget_spec = get_widgetset(application, modules_root)
-    widget_distribution = widget_spec.split("==", 1)[0].strip()
-    if not widget_distribution:
-        return False
-    return _normalized_distribution_name(wheel_match.group("distribution")) == (
-        _normalized_distribution_name(widget_distribution)
-    )
 
+@contextlib.contextmanager
+def _bff_phase(timer: Optional[BffCallTimer], phase: str, span_name: str):
+    """Time one phase of a BFF call for metrics and record it as a trace span."""
+    with timer.phase(phase) if timer else contextlib.nullcontext(), BFF_TRACER.span(span_name):
+        yield
 
-@app.api_route(
-    "/{application}/appcode/{asset_path:path}",
-    methods=["GET", "HEAD"],
-    include_in_schema=False,
+
+def _bound_bff_callable(
+    module_file_path: str,
+    class_name: str,
+    function_name: str,
+    user: Any,
+    cancel_token: Optional[threading.Event] = None,
+    timer: Optional[BffCallTimer] = None,
+):
+    with _bff_phase(timer, "load", "bff.load"):
+        module = _load_source_module(module_file_path, class_name)
+        cls = getattr(module, class_name)
+    with _bff_phase(timer, "instantiate", "bff.instantiate"):
+        instance = cls(_user=user, _bff_cancel_token=cancel_token)
+    return getattr(instance, function_name)
+
+
+def _bind_registered_bff_timer(
+    timer: BffCallTimer, identifier: str, class_name: str, function_name: str
+) -> None:
+    """Name the timer's operation as soon as the target is known to be registered."""
+    modules_root = os.path.abspath(get_modules_path())
+    if _registered_bff_operation(modules_root, identifier, class_name, function_name) is not None:
+        timer.bind(identifier, class_name, function_name)
+
+
+def _require_bff_http_method(operation: Dict[str, Any], method: str) -> None:
+    """Reject a call made with a method the operation does not declare."""
+    allowed_methods = tuple(operation["http_methods"])
+    if method not in allowed_methods:
+        raise HTTPException(
+            status_code=405,
+            detail="HTTP method not allowed for this BFF operation",
+            headers={"Allow": ", ".join(allowed_methods)},
+        )
+
+
+@app.post(
+    "/classcall/_batch",
+    operation_id="postClassCallBatch",
+    responses={
+        200: {"description": "JSONResponse ({\"results\": [...]}) with one entry per call, in request order"},
+        400: {"description": "HTTPException (if the batch body is invalid)"},
+        401: {"description": "HTTPException (if a call requires authentication)"},
+    },
 )
-async def public_app_asset(application: str, asset_path: str):
-    normalized = asset_path.replace("\\", "/").strip("/")
-    if not normalized or any(part in {"", ".", ".."} or part.startswith(".") for part in normalized.split("/")):
-        raise HTTPException(status_code=404, detail="Asset not found")
-    modules_root = os.path.realpath(get_modules_path())
-    absolute_path = os.path.realpath(os.path.join(modules_root, *normalized.split("/")))
+async def class_call_batch(request: Request):
+    """
+    Run several BFF calls in one request. Authentication, CSRF, and the replay
+    proof are checked once; each call is then authorized by the policy hook and
+    executed concurrently. Per-call failures are reported in place.
+    """
     try:
-        within_root = os.path.commonpath((modules_root, absolute_path)) == modules_root
-    except ValueError:
-        within_root = False
-    asset_allowed = _public_asset_allowed(normalized) or _application_widget_wheel_allowed(
-        application,
-        normalized,
-        modules_root,
+        data = await request.json()
+    except json.JSONDecodeError as exc:
+        raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError as exc:
+            raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
+    calls = data.get("calls") if isinstance(data, dict) else None
+    if not isinstance(calls, list) or any(not isinstance(call, dict) for call in calls):
+        raise HTTPException(status_code=400, detail="BFF batch body must contain a list of calls")
+    if len(calls) > BFF_BATCH_MAX_CALLS:
+        raise HTTPException(status_code=413, detail="Too many calls in BFF batch")
+
+    targets = []
+    session_user = None
+    session_resolved = False
+    for call in calls:
+        try:
+            identifier = _resolve_bff_call_target(str(call.get("file") or ""))
+        except HTTPException:
+            identifier = None
+        class_name = str(call.get("class") or "")
+        function_name = str(call.get("function") or "")
+        if identifier and is_noauth_allowed(identifier, class_name, function_name):
+            user = "noauth"
+        else:
+            if not session_resolved:
+                session_user = require_auth(request)
+                session_resolved = True
+            user = session_user
+        if not user:
+            raise HTTPException(status_code=401, detail="Call not authorized")
+        targets.append((identifier, class_name, function_name, user))
+
+    if session_resolved:
+        _validate_csrf(request, session_user)
+        _validate_bff_replay_token(request, session_user)
+
+    async def run_call(call: Dict[str, Any], identifier, class_name, function_name, user):
+        timer = BFF_METRICS.call_timer()
+        if identifier is not None:
+            _bind_registered_bff_timer(timer, identifier, class_name, function_name)
+        status = 499
+        try:
+            outcome = await execute_call(call, identifier, class_name, function_name, user)
+            status = outcome["status"]
+            return outcome
+        finally:
+            timer.finish(status)
+
+    async def execute_call(call: Dict[str, Any], identifier, class_name, function_name, user):
+        try:
+            if identifier is None:
+                raise HTTPException(status_code=400, detail="Invalid file path")
+            modules_root, module_file_path = _resolve_bff_module_file(identifier)
+            operation = _exported_bff_operation(modules_root, identifier, class_name, function_name)
+            # The batch itself is a POST, so each call must accept POST.
+            _require_bff_http_method(operation, "POST")
+            if operation.get("upload"):
+                raise HTTPException(status_code=400, detail="BFF uploads cannot be batched")
+            await _run_bff_policy_hook(request, user, operation, identifier, class_name, function_name)
+            call_data = {key: call[key] for key in ("args", "kwargs") if key in call}
+            args, kwargs = _bff_call_arguments(call_data)
+
+            async def load_result():
+                if operation.get("execution") == "process":
+                    return await _invoke_bff_in_process(
+                        module_file_path, class_name, function_name, user, args, kwargs
+                    )
+                cancel_token = threading.Event()
+                func = _bound_bff_callable(
+                    module_file_path, class_name, function_name, user, cancel_token
+                )
+                if not callable(func):
+                    return func
+                flags = _bff_function_flags(func)
+                if flags["streaming"]:
+                    raise HTTPException(status_code=400, detail="Streaming BFF operations cannot be batched")
+                return await _invoke_bff_callable(
+                    func,
+                    flags,
+                    args,
+                    kwargs,
+                    operation.get("executor"),
+                    cancel_token,
+                    f"{identifier}:{class_name}.{function_name}",
+                )
+
+            result = await _cached_bff_result(
+                operation, identifier, class_name, function_name, user, call_data, load_result
+            )
+            if _is_binary_bff_result(result):
+                raise HTTPException(status_code=400, detail="Binary BFF results cannot be batched")
+            return {"status": 200, "result": jsonable_encoder(to_json_rows(result))}
+        except HTTPException as exc:
+            if exc.status_code >= 500:
+                logger.error(
+                    "BFF batch call failed correlation_id=%s status=%s",
+                    getattr(request.state, "correlation_id", ""),
+                    exc.status_code,
+                    exc_info=exc,
+                )
+                return {"status": exc.status_code, "error": "Internal server error"}
+            return {"status": exc.status_code, "error": exc.detail}
+        except Exception:
+            logger.exception(
+                "BFF batch call failed correlation_id=%s",
+                getattr(request.state, "correlation_id", ""),
+            )
+            return {"status": 500, "error": "Internal server error"}
+
+    results = await _run_until_bff_disconnect(
+        request,
+        asyncio.gather(*(run_call(call, *target) for call, target in zip(calls, targets))),
     )
-    if not within_root or not os.path.isfile(absolute_path) or not asset_allowed:
-        raise HTTPException(status_code=404, detail="Asset not found")
-    return FileResponse(absolute_path)
+    return {"results": list(results)}
+
 
 @app.get("/classcall/{file_path:path}/{class_name}/{function_name}", operation_id="getClassCall", response_model=Any, responses={200: {"description": "Any (dynamic based on called function return, suggest annotating as Union[Dict, List, str, int, float]) or StreamingResponse for streaming methods"}, 401: {"description": "HTTPException (if not authorized)"}, 404: {"description": "HTTPException (if file not found)"}, 500: {"description": "HTTPException (if function call fails)"}})
 @app.post("/classcall/{file_path:path}/{class_name}/{function_name}", operation_id="postClassCall", response_model=Any, responses={200: {"description": "Any (dynamic based on called function return, suggest annotating as Union[Dict, List, str, int, float]) or StreamingResponse for streaming methods"}, 401: {"description": "HTTPException (if not authorized)"}, 404: {"description": "HTTPException (if file not found)"}, 500: {"description": "HTTPException (if function call fails)"}})
@@ -1639,224 +3176,333 @@ async def class_call(
     function_name: str,
     request: Request
 ):
-    
-    # Determine if this call is allowed without auth.
-    normalized_identifier = _normalize_file_identifier(file_path)
-    if not normalized_identifier:
-        raise HTTPException(status_code=400, detail="Invalid file path")
+    timer = BFF_METRICS.call_timer()
+    status = 500
+    try:
+        response = await _class_call(file_path, class_name, function_name, request, timer)
+        status = response.status_code
+        return response
+    except HTTPException as exc:
+        status = exc.status_code
+        raise
+    except asyncio.CancelledError:
+        status = 499
+        raise
+    finally:
+        timer.finish(status)
 
-    request_identifier_with_ext = normalized_identifier
-    if not request_identifier_with_ext.lower().endswith(".py"):
-        request_identifier_with_ext += ".py"
 
-    if is_noauth_allowed(request_identifier_with_ext, class_name, function_name):
-        user = "noauth"
-    else:
-        # Perform authentication check for calls not whitelisted for no-auth.
-        user = require_auth(request)
+async def _class_call(
+    file_path: str,
+    class_name: str,
+    function_name: str,
+    request: Request,
+    timer: BffCallTimer,
+) -> Response:
+    # Determine if this call is allowed without auth.
+    request_identifier_with_ext = _resolve_bff_call_target(file_path)
+    # Bound before authentication so rejected calls to real operations are counted.
+    _bind_registered_bff_timer(timer, request_identifier_with_ext, class_name, function_name)
+
+    with _bff_phase(timer, "auth", "bff.auth"):
+        if is_noauth_allowed(request_identifier_with_ext, class_name, function_name):
+            user = "noauth"
+        else:
+            # Perform authentication check for calls not whitelisted for no-auth.
+            user = require_auth(request)
 
     if not user:
         raise HTTPException(status_code=401, detail="Call not authorized")
 
-    modules_root = os.path.abspath(get_modules_path())
-    fs_relative = request_identifier_with_ext.replace("/", os.sep)
-    fs_relative = os.path.normpath(fs_relative)
-
-    if fs_relative.startswith("..") or os.path.isabs(fs_relative) or os.path.splitdrive(fs_relative)[0]:
-        raise HTTPException(status_code=400, detail="Invalid file path")
-
-    if os.path.basename(fs_relative).startswith("."):
-        raise HTTPException(status_code=400, detail="Invalid file name")
-
-    module_file_path = os.path.abspath(os.path.join(modules_root, fs_relative))
-
-    try:
-        common_root = os.path.commonpath([module_file_path, modules_root])
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid module path")
-
-    if common_root != modules_root:
-        raise HTTPException(status_code=400, detail="Invalid file path")
-
-    if not os.path.isfile(module_file_path):
-        raise HTTPException(status_code=404, detail=f"File {request_identifier_with_ext} not found in appcode folder")
-
-    operation = _registered_bff_operation(
+    modules_root, module_file_path = _resolve_bff_module_file(request_identifier_with_ext)
+    operation = _exported_bff_operation(
         modules_root,
         request_identifier_with_ext,
         class_name,
         function_name,
     )
-    if operation is None:
-        raise HTTPException(status_code=404, detail="BFF operation not exported")
-    allowed_methods = tuple(operation["http_methods"])
-    if request.method not in allowed_methods:
-        raise HTTPException(
-            status_code=405,
-            detail="HTTP method not allowed for this BFF operation",
-            headers={"Allow": ", ".join(allowed_methods)},
+    span = current_span()
+    if span is not None:
+        span.set_attribute(
+            "pytincture.bff.operation",
+            f"{request_identifier_with_ext}:{class_name}.{function_name}",
         )
-
-    _validate_csrf(request, user)
-    _validate_bff_replay_token(request, user)
-    policy_hook = _configured_bff_policy_hook()
-    if policy_hook:
-        policy_result = policy_hook(
-            user=_coerce_policy_user(user),
-            policy=operation.get("policy", {}),
-            class_name=class_name,
-            function_name=function_name,
-            module_path=request_identifier_with_ext,
-            request=request,
+    _require_bff_http_method(operation, request.method)
+
+    with _bff_phase(timer, "auth", "bff.csrf"):
+        _validate_csrf(request, user)
+    with _bff_phase(timer, "replay", "bff.replay"):
+        _validate_bff_replay_token(request, user)
+    with _bff_phase(timer, "auth", "bff.policy"):
+        await _run_bff_policy_hook(
+            request,
+            user,
+            operation,
+            request_identifier_with_ext,
+            class_name,
+            function_name,
         )
-        if inspect.isawaitable(policy_result):
-            await policy_result
-
-    module = _load_source_module(module_file_path, class_name)
-    cls = getattr(module, class_name)
-    instance = cls(_user=user)
 
-    # 3) Get the function
-    func = getattr(instance, function_name)
-    function_obj = getattr(func, "__func__", func)
-    is_streaming = getattr(function_obj, "_bff_streaming", False)
-    streaming_raw = getattr(function_obj, "_bff_streaming_raw", False)
-    streaming_media_type = getattr(function_obj, "_bff_streaming_media_type", "text/event-stream")
-    is_async_gen_function = inspect.isasyncgenfunction(function_obj)
-    is_coroutine_function = inspect.iscoroutinefunction(function_obj)
-
-    # 4) If it's a POST, parse JSON body
+    # If it's a POST, parse JSON body
     data = {}
-    if request.method in {"POST", "PUT", "PATCH", "DELETE"}:
+    upload = None
+    upload_config = operation.get("upload")
+    if upload_config:
+        upload = await _spool_bff_upload(request)
+        data = {"kwargs": {**request.query_params, upload_config["param"]: upload}}
+    elif request.method in {"POST", "PUT", "PATCH", "DELETE"}:
         try:
             data = await request.json()
         except json.JSONDecodeError as exc:
             raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
-    
-    if isinstance(data, str):
-        try:
-            data = json.loads(str(data))
-        except json.JSONDecodeError as exc:
-            raise HTTPException(status_code=400, detail="Invalid JSON body") from exc
 
-    if callable(func):
-        if not isinstance(data, dict):
-            raise HTTPException(status_code=400, detail="BFF request body must be an object")
-        args = data.get("args", [])
-        kwargs = data.get("kwargs", {})
-        if not isinstance(args, list) or not isinstance(kwargs, dict):
-            raise HTTPException(status_code=400, detail="Invalid BFF arguments")
-
-        # Handle structured args format if present
-        if args and isinstance(args[0], dict) and 'value' in args[0]:
-            args = [arg['value'] for arg in args]
-        # Handle if args and kwargs do not exist in data
-        elif "args" not in data and "kwargs" not in data:
-            kwargs = data
-
-        def _serialize_stream_item(item, raw: bool = False):
-            # Ensure each streamed chunk is JSON encoded and newline-delimited unless raw passthrough is requested.
-            if isinstance(item, (bytes, bytearray)):
-                data_bytes = bytes(item)
-                if not raw and not data_bytes.endswith(b"\n"):
-                    data_bytes += b"\n"
-                return data_bytes
-            if isinstance(item, str):
-                data_text = item
-            else:
-                data_text = json.dumps(item)
-            if not raw and not data_text.endswith("\n"):
-                data_text += "\n"
-            return data_text
-
-        def _sync_iterable(iterable: Iterable, raw: bool = False):
-            started = time.monotonic()
-            output_bytes = 0
-            for item in iterable:
-                if time.monotonic() - started > BFF_STREAM_MAX_SECONDS:
-                    return
-                serialized = _serialize_stream_item(item, raw)
-                output_bytes += len(serialized.encode("utf-8") if isinstance(serialized, str) else serialized)
-                if output_bytes > BFF_STREAM_MAX_BYTES:
-                    return
-                yield serialized
+    async def load_result():
+        if operation.get("execution") == "process":
+            args, kwargs = _bff_call_arguments(data)
+            with _bff_phase(timer, "execute", "bff.execute"):
+                result = await _invoke_bff_in_process(
+                    module_file_path, class_name, function_name, user, args, kwargs
+                )
+            with _bff_phase(timer, "serialize", "bff.serialize"):
+                return await _encoded_bff_result(request, operation, result)
 
-        async def _async_iterable(iterable: AsyncIterable, raw: bool = False):
-            started = time.monotonic()
-            output_bytes = 0
-            iterator = iterable.__aiter__()
-            while True:
-                remaining = BFF_STREAM_MAX_SECONDS - (time.monotonic() - started)
-                if remaining <= 0:
-                    return
-                try:
-                    item = await asyncio.wait_for(iterator.__anext__(), timeout=remaining)
-                except (StopAsyncIteration, asyncio.TimeoutError):
-                    return
-                serialized = _serialize_stream_item(item, raw)
-                output_bytes += len(serialized.encode("utf-8") if isinstance(serialized, str) else serialized)
-                if output_bytes > BFF_STREAM_MAX_BYTES:
-                    return
-                yield serialized
+        # Get the function
+        cancel_token = threading.Event()
+        func = _bound_bff_callable(
+            module_file_path, class_name, function_name, user, cancel_token, timer
+        )
+        if not callable(func):
+            return func
+        flags = _bff_function_flags(func)
+        operation_name = f"{request_identifier_with_ext}:{class_name}.{function_name}"
+        if flags["streaming_sse"]:
+            resumed = _resumed_sse_response(request, operation_name, user)
+            if resumed is not None:
+                return resumed
+        args, kwargs = _bff_call_arguments(data)
+
+        # Execute the target callable
+        with _bff_phase(timer, "execute", "bff.execute"):
+            result = await _invoke_bff_callable(
+                func, flags, args, kwargs, operation.get("executor"), cancel_token, operation_name
+            )
 
-        def _as_streaming_response(result_obj):
-            if isinstance(result_obj, StreamingResponse):
-                return result_obj
+        if flags["streaming_sse"]:
+            return _as_sse_response(result, request, cancel_token, operation_name, user)
+        if flags["streaming"]:
+            return _as_streaming_response(
+                result,
+                flags["streaming_raw"],
+                flags["streaming_media_type"],
+                request,
+                cancel_token,
+                operation_name,
+            )
+        with _bff_phase(timer, "serialize", "bff.serialize"):
+            return await _encoded_bff_result(request, operation, result)
 
-            if inspect.isasyncgen(result_obj) or hasattr(result_obj, "__aiter__"):
-                async_iter = result_obj if inspect.isasyncgen(result_obj) else result_obj
-                return StreamingResponse(_async_iterable(async_iter, streaming_raw), media_type=streaming_media_type)
+    try:
+        result = await _run_until_bff_disconnect(
+            request,
+            _cached_bff_result(
+                operation,
+                request_identifier_with_ext,
+                class_name,
+                function_name,
+                user,
+                data,
+                load_result,
+            ),
+        )
+    finally:
+        if upload is not None:
+            upload.close()
+    if isinstance(result, Response):
+        return result
+    with _bff_phase(timer, "serialize", "bff.serialize"):
+        http_cache = operation.get("http_cache")
+        if http_cache and request.method == "GET":
+            return _http_cached_bff_response(request, result, http_cache)
+        return Response(_BFF_JSON_RESULT.dump_json(result), media_type="application/json")
 
-            if isinstance(result_obj, (str, bytes, bytearray)):
-                return StreamingResponse(_sync_iterable([result_obj], streaming_raw), media_type=streaming_media_type)
 
-            if isinstance(result_obj, dict):
-                return StreamingResponse(_sync_iterable([result_obj], streaming_raw), media_type=streaming_media_type)
+# Serializes plain results the way FastAPI would for ``response_model=Any``.
+_BFF_JSON_RESULT = TypeAdapter(Any)
 
-            if inspect.isgenerator(result_obj) or isinstance(result_obj, Iterable):
-                iterable_obj = result_obj if inspect.isgenerator(result_obj) else result_obj
-                return StreamingResponse(_sync_iterable(iterable_obj, streaming_raw), media_type=streaming_media_type)
 
-            # Fallback: stream single value
-            return StreamingResponse(_sync_iterable([result_obj], streaming_raw), media_type=streaming_media_type)
+class _BffStreamResult:
+    """A streaming BFF result to be relayed over the WebSocket transport."""
 
-        # Execute the target callable
-        if is_async_gen_function:
-            result = func(*args, **kwargs)
-            if is_streaming:
-                return _as_streaming_response(result)
-            collected_items = []
-            async def collect_items():
-                async for item in result:
-                    collected_items.append(item)
-            try:
-                await asyncio.wait_for(collect_items(), timeout=BFF_CALL_TIMEOUT_SECONDS)
-            except asyncio.TimeoutError as exc:
-                raise HTTPException(status_code=504, detail="BFF call timed out") from exc
-            return collected_items
+    def __init__(self, result: Any, raw: bool, cancel_token: threading.Event):
+        self.result = result
+        self.raw = raw
+        self.cancel_token = cancel_token
 
-        if is_coroutine_function:
-            try:
-                result = await asyncio.wait_for(
-                    func(*args, **kwargs), timeout=BFF_CALL_TIMEOUT_SECONDS
+
+@app.websocket("/classcall/_ws")
+async def class_call_websocket(websocket: WebSocket):
+    """
+    Multiplex BFF calls and streams over one connection per browser session.
+
+    Authentication, CSRF, and the origin check run once at the handshake and
+    the session is re-validated every ``BFF_WS_REAUTH_SECONDS``. Each message
+    carries an ``id`` that the server echoes on its result, stream chunks, or
+    error; ``{"type": "cancel", "id": ...}`` abandons a call.
+    """
+    if not ENABLE_BFF_WEBSOCKET:
+        await websocket.close(code=4404)
+        return
+    session_user = require_auth(websocket)
+    if not session_user:
+        await websocket.close(code=4401)
+        return
+    try:
+        _validate_websocket_csrf(websocket, session_user)
+    except HTTPException:
+        await websocket.close(code=4403)
+        return
+    await websocket.accept()
+
+    send_lock = asyncio.Lock()
+    tasks: Dict[Any, asyncio.Task] = {}
+    authenticated_at = time.monotonic()
+
+    async def send(message: Dict[str, Any]) -> None:
+        try:
+            async with send_lock:
+                await websocket.send_text(json.dumps(jsonable_encoder(message)))
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # The client is gone; its calls are being cancelled.
+
+    async def send_error(call_id: Any, status_code: int, detail: Any) -> None:
+        error = "Internal server error" if status_code >= 500 else detail
+        await send({"id": call_id, "type": "error", "status": status_code, "error": error})
+
+    async def relay_stream(call_id: Any, stream: _BffStreamResult, operation_name: str) -> None:
+        _CURRENT_CANCEL_TOKEN.set(stream.cancel_token)
+        body = _coalesced_body(_stream_chunks(stream.result, stream.raw), operation_name)
+        try:
+            async for chunk in body:
+                await send({"id": call_id, "type": "chunk", "data": chunk.decode("utf-8", errors="replace")})
+            await send({"id": call_id, "type": "end"})
+        except asyncio.CancelledError:
+            stream.cancel_token.set()
+            raise
+        finally:
+            await body.aclose()
+
+    async def run_call(call_id: Any, call: Dict[str, Any]) -> None:
+        timer = BFF_METRICS.call_timer()
+        status = 499
+        try:
+            identifier = _resolve_bff_call_target(str(call.get("file") or ""))
+            class_name = str(call.get("class") or "")
+            function_name = str(call.get("function") or "")
+            _bind_registered_bff_timer(timer, identifier, class_name, function_name)
+            user = "noauth" if is_noauth_allowed(identifier, class_name, function_name) else session_user
+            modules_root, module_file_path = _resolve_bff_module_file(identifier)
+            operation = _exported_bff_operation(modules_root, identifier, class_name, function_name)
+            _require_bff_http_method(operation, "POST")
+            if operation.get("upload"):
+                raise HTTPException(status_code=400, detail="BFF uploads require an HTTP request")
+            await _run_bff_policy_hook(websocket, user, operation, identifier, class_name, function_name)
+            call_data = {key: call[key] for key in ("args", "kwargs") if key in call}
+            args, kwargs = _bff_call_arguments(call_data)
+
+            async def load_result():
+                if operation.get("execution") == "process":
+                    return await _invoke_bff_in_process(
+                        module_file_path, class_name, function_name, user, args, kwargs
+                    )
+                cancel_token = threading.Event()
+                func = _bound_bff_callable(
+                    module_file_path, class_name, function_name, user, cancel_token
                 )
-            except asyncio.TimeoutError as exc:
-                raise HTTPException(status_code=504, detail="BFF call timed out") from exc
-        else:
-            try:
-                result = await asyncio.wait_for(
-                    run_in_threadpool(func, *args, **kwargs),
-                    timeout=BFF_CALL_TIMEOUT_SECONDS,
+                if not callable(func):
+                    return func
+                flags = _bff_function_flags(func)
+                result = await _invoke_bff_callable(
+                    func,
+                    flags,
+                    args,
+                    kwargs,
+                    operation.get("executor"),
+                    cancel_token,
+                    f"{identifier}:{class_name}.{function_name}",
                 )
-            except asyncio.TimeoutError as exc:
-                raise HTTPException(status_code=504, detail="BFF call timed out") from exc
+                if flags["streaming"]:
+                    return _BffStreamResult(result, flags["streaming_raw"], cancel_token)
+                return result
 
-        if is_streaming:
-            return _as_streaming_response(result)
+            result = await _cached_bff_result(
+                operation, identifier, class_name, function_name, user, call_data, load_result
+            )
+            if isinstance(result, _BffStreamResult):
+                await relay_stream(call_id, result, f"{identifier}:{class_name}.{function_name}")
+            elif _is_binary_bff_result(result):
+                payload = await anyio.to_thread.run_sync(_binary_bff_bytes, result)
+                await send({
+                    "id": call_id,
+                    "type": "result",
+                    "status": 200,
+                    "binary": base64.b64encode(payload).decode("ascii"),
+                })
+            else:
+                await send({"id": call_id, "type": "result", "status": 200, "result": to_json_rows(result)})
+            status = 200
+        except HTTPException as exc:
+            status = exc.status_code
+            if exc.status_code >= 500:
+                logger.error("BFF WebSocket call failed status=%s", exc.status_code, exc_info=exc)
+            await send_error(call_id, exc.status_code, exc.detail)
+        except Exception:
+            status = 500
+            logger.exception("BFF WebSocket call failed")
+            await send_error(call_id, 500, None)
+        finally:
+            timer.finish(status)
+            tasks.pop(call_id, None)
 
-        return result
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000), frame.get("reason"))
+            try:
+                # Binary frames carry no call and are rejected like malformed text.
+                message = json.loads(frame["text"]) if frame.get("text") is not None else None
+            except json.JSONDecodeError:
+                message = None
+            if not isinstance(message, dict) or not isinstance(message.get("id"), (str, int)):
+                await send_error(None, 400, "Invalid BFF WebSocket message")
+                continue
+            call_id = message["id"]
+            kind = message.get("type", "call")
+            if kind == "cancel":
+                task = tasks.get(call_id)
+                if task is not None:
+                    task.cancel()
+                continue
+            if kind != "call" or call_id in tasks:
+                await send_error(call_id, 400, "Invalid BFF WebSocket message")
+                continue
+            if len(tasks) >= BFF_WS_MAX_INFLIGHT:
+                await send_error(call_id, 429, "Too many concurrent BFF calls")
+                continue
+            if time.monotonic() - authenticated_at > BFF_WS_REAUTH_SECONDS:
+                if not require_auth(websocket):
+                    await websocket.close(code=4401)
+                    return
+                authenticated_at = time.monotonic()
+            tasks[call_id] = asyncio.ensure_future(run_call(call_id, message))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pending = list(tasks.values())
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
-    return func
 
 @app.post("/logs", operation_id="postLogs", responses={200: {"description": "JSONResponse ({\"status\": \"ok\"})"}, 401: {"description": "HTTPException (if authentication fails)"}})
 async def logs_endpoint(request: Request, user=Depends(require_authenticated_user)):
@@ -1946,11 +3592,99 @@ if AUTH_SESSION_SAME_SITE not in {"lax", "strict", "none"}:
 MAX_REQUEST_BODY_BYTES = int(os.getenv("MAX_REQUEST_BODY_BYTES", str(2 * 1024 * 1024)))
 if MAX_REQUEST_BODY_BYTES <= 0:
     raise RuntimeError("MAX_REQUEST_BODY_BYTES must be greater than zero")
+BFF_UPLOAD_MAX_BYTES = int(os.getenv("BFF_UPLOAD_MAX_BYTES", str(1024 * 1024 * 1024)))
+BFF_UPLOAD_SPOOL_BYTES = int(os.getenv("BFF_UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+if BFF_UPLOAD_MAX_BYTES <= 0 or BFF_UPLOAD_SPOOL_BYTES < 0:
+    raise RuntimeError("BFF upload limits must be positive")
 BFF_CALL_TIMEOUT_SECONDS = float(os.getenv("BFF_CALL_TIMEOUT_SECONDS", "30"))
 BFF_STREAM_MAX_SECONDS = float(os.getenv("BFF_STREAM_MAX_SECONDS", "300"))
 BFF_STREAM_MAX_BYTES = int(os.getenv("BFF_STREAM_MAX_BYTES", str(10 * 1024 * 1024)))
 if BFF_CALL_TIMEOUT_SECONDS <= 0 or BFF_STREAM_MAX_SECONDS <= 0 or BFF_STREAM_MAX_BYTES <= 0:
     raise RuntimeError("BFF timeout and stream limits must be greater than zero")
+BFF_STREAM_COALESCE_BYTES = int(os.getenv("BFF_STREAM_COALESCE_BYTES", "16384"))
+BFF_STREAM_COALESCE_MS = float(os.getenv("BFF_STREAM_COALESCE_MS", "10"))
+BFF_STREAM_QUEUE_ITEMS = int(os.getenv("BFF_STREAM_QUEUE_ITEMS", "64"))
+if BFF_STREAM_COALESCE_BYTES <= 0 or BFF_STREAM_QUEUE_ITEMS <= 0 or BFF_STREAM_COALESCE_MS < 0:
+    raise RuntimeError("BFF stream coalescing and queue sizes must be positive")
+BFF_METRICS = BffMetrics()
+BFF_STREAMS = BffStreamRegistry(on_close=BFF_METRICS.observe_stream)
+BFF_SSE_BUFFER_EVENTS = int(os.getenv("BFF_SSE_BUFFER_EVENTS", "512"))
+BFF_SSE_RESUME_SECONDS = float(os.getenv("BFF_SSE_RESUME_SECONDS", "30"))
+BFF_SSE_KEEPALIVE_SECONDS = float(os.getenv("BFF_SSE_KEEPALIVE_SECONDS", "15"))
+if BFF_SSE_BUFFER_EVENTS <= 0 or BFF_SSE_RESUME_SECONDS <= 0 or BFF_SSE_KEEPALIVE_SECONDS <= 0:
+    raise RuntimeError("BFF SSE buffer, resume, and keepalive settings must be greater than zero")
+BFF_SSE_STREAMS = BffSseRegistry(
+    buffer_events=BFF_SSE_BUFFER_EVENTS,
+    resume_seconds=BFF_SSE_RESUME_SECONDS,
+    keepalive_seconds=BFF_SSE_KEEPALIVE_SECONDS,
+)
+BFF_BATCH_MAX_CALLS = int(os.getenv("BFF_BATCH_MAX_CALLS", "50"))
+if BFF_BATCH_MAX_CALLS <= 0:
+    raise RuntimeError("BFF_BATCH_MAX_CALLS must be greater than zero")
+BFF_EXECUTOR_MAX_WORKERS = int(os.getenv("BFF_EXECUTOR_MAX_WORKERS", "16"))
+BFF_EXECUTOR_MAX_QUEUE = int(os.getenv("BFF_EXECUTOR_MAX_QUEUE", "64"))
+BFF_EXECUTOR_RETRY_AFTER_SECONDS = int(os.getenv("BFF_EXECUTOR_RETRY_AFTER_SECONDS", "1"))
+if BFF_EXECUTOR_MAX_WORKERS <= 0 or BFF_EXECUTOR_MAX_QUEUE < 0 or BFF_EXECUTOR_RETRY_AFTER_SECONDS < 0:
+    raise RuntimeError("BFF executor limits must be positive")
+BFF_PROCESS_POOL_WORKERS = int(
+    os.getenv("BFF_PROCESS_POOL_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+BFF_PROCESS_START_METHOD = os.getenv("BFF_PROCESS_START_METHOD", "spawn")
+if BFF_PROCESS_POOL_WORKERS <= 0:
+    raise RuntimeError("BFF_PROCESS_POOL_WORKERS must be greater than zero")
+if BFF_PROCESS_START_METHOD not in {"spawn", "forkserver", "fork"}:
+    raise RuntimeError("BFF_PROCESS_START_METHOD must be spawn, forkserver, or fork")
+BFF_PROCESS_KILL_GRACE_SECONDS = float(os.getenv("BFF_PROCESS_KILL_GRACE_SECONDS", "2"))
+if BFF_PROCESS_KILL_GRACE_SECONDS < 0:
+    raise RuntimeError("BFF_PROCESS_KILL_GRACE_SECONDS must not be negative")
+BFF_MAX_ZOMBIE_CALLS = os.getenv("BFF_MAX_ZOMBIE_CALLS")
+if BFF_MAX_ZOMBIE_CALLS is not None:
+    BFF_MAX_ZOMBIE_CALLS = int(BFF_MAX_ZOMBIE_CALLS)
+    if BFF_MAX_ZOMBIE_CALLS <= 0:
+        raise RuntimeError("BFF_MAX_ZOMBIE_CALLS must be greater than zero")
+BFF_PROCESS_POOL: Optional[BffProcessPool] = None
+BFF_EXECUTORS = BffExecutorRegistry(
+    load_executor_pool_config(os.getenv("BFF_EXECUTOR_POOLS", "")),
+    default_max_workers=BFF_EXECUTOR_MAX_WORKERS,
+    default_max_queue=BFF_EXECUTOR_MAX_QUEUE,
+    max_zombies=BFF_MAX_ZOMBIE_CALLS,
+)
+ENABLE_BFF_WEBSOCKET = os.getenv("ENABLE_BFF_WEBSOCKET", "false").lower() == "true"
+BFF_WS_MAX_INFLIGHT = int(os.getenv("BFF_WS_MAX_INFLIGHT", "32"))
+BFF_WS_REAUTH_SECONDS = float(os.getenv("BFF_WS_REAUTH_SECONDS", "60"))
+if BFF_WS_MAX_INFLIGHT <= 0 or BFF_WS_REAUTH_SECONDS <= 0:
+    raise RuntimeError("BFF WebSocket limits must be greater than zero")
+ENABLE_BFF_METRICS = os.getenv("ENABLE_BFF_METRICS", "false").lower() == "true"
+BFF_METRICS_PATH = os.getenv("BFF_METRICS_PATH", "/metrics")
+BFF_METRICS_TOKEN = os.getenv("BFF_METRICS_TOKEN", "")
+if not BFF_METRICS_PATH.startswith("/") or BFF_METRICS_PATH.startswith("/classcall/"):
+    raise RuntimeError("BFF_METRICS_PATH must be an absolute path outside /classcall/")
+ENABLE_BFF_PROFILER = os.getenv("ENABLE_BFF_PROFILER", "false").lower() == "true"
+BFF_PROFILER_ADMINS = {
+    email.strip().lower()
+    for email in os.getenv("BFF_PROFILER_ADMINS", "").split(",")
+    if email.strip()
+}
+BFF_PROFILER_MAX_SECONDS = float(os.getenv("BFF_PROFILER_MAX_SECONDS", "60"))
+if BFF_PROFILER_MAX_SECONDS <= 0:
+    raise RuntimeError("BFF_PROFILER_MAX_SECONDS must be greater than zero")
+if ENABLE_BFF_PROFILER and not BFF_PROFILER_ADMINS:
+    raise RuntimeError("ENABLE_BFF_PROFILER needs at least one address in BFF_PROFILER_ADMINS")
+BFF_PROFILER = SamplingProfiler()
+ENABLE_BFF_TRACING = os.getenv("ENABLE_BFF_TRACING", "false").lower() == "true"
+BFF_TRACE_FILE = os.getenv("BFF_TRACE_FILE", "")
+BFF_TRACE_OTLP_ENDPOINT = os.getenv("BFF_TRACE_OTLP_ENDPOINT", "")
+if ENABLE_BFF_TRACING and not (BFF_TRACE_FILE or BFF_TRACE_OTLP_ENDPOINT):
+    raise RuntimeError("ENABLE_BFF_TRACING needs BFF_TRACE_FILE or BFF_TRACE_OTLP_ENDPOINT")
+BFF_TRACE_EXPORTERS: List[Any] = []
+if ENABLE_BFF_TRACING and BFF_TRACE_FILE:
+    BFF_TRACE_EXPORTERS.append(FileSpanExporter(BFF_TRACE_FILE))
+if ENABLE_BFF_TRACING and BFF_TRACE_OTLP_ENDPOINT:
+    BFF_TRACE_EXPORTERS.append(OtlpHttpSpanExporter(BFF_TRACE_OTLP_ENDPOINT))
+BFF_TRACER = Tracer(
+    BFF_TRACE_EXPORTERS,
+    service_name=os.getenv("BFF_TRACE_SERVICE_NAME", "pytincture"),
+)
 ENABLE_BFF_REPLAY_TOKENS = os.getenv("ENABLE_BFF_REPLAY_TOKENS", "false").lower() == "true"
 BFF_REPLAY_TOKEN_BATCH_SIZE = int(os.getenv("BFF_REPLAY_TOKEN_BATCH_SIZE", "12"))
 BFF_REPLAY_TOKEN_LOW_WATERMARK = int(os.getenv("BFF_REPLAY_TOKEN_LOW_WATERMARK", "3"))
@@ -2179,7 +3913,7 @@ def _load_saml_relay_state(token: Optional[str]) -> Dict[str, Any]:
 
 
 def _replace_saml_relay_state(
-    saml_auth: OneLogin_Saml2_Auth,
+    saml_auth: "OneLogin_Saml2_Auth",
     auth_url: str,
     relay_state: str,
 ) -> str:
@@ -2438,13 +4172,13 @@ def _build_saml_request_data(request: Request, post_data: Optional[Dict[str, Any
     }
 
 
-def _init_saml_auth(request: Request, application: str, provider: Optional[Dict[str, Any]] = None, post_data: Optional[Dict[str, Any]] = None) -> OneLogin_Saml2_Auth:
+def _init_saml_auth(request: Request, application: str, provider: Optional[Dict[str, Any]] = None, post_data: Optional[Dict[str, Any]] = None) -> "OneLogin_Saml2_Auth":
     """
     Convenience wrapper to instantiate a SAML Auth client.
     """
     request_data = _build_saml_request_data(request, post_data=post_data)
     settings = _build_saml_settings(request, application, provider=provider)
-    return OneLogin_Saml2_Auth(request_data, old_settings=settings)
+    return _lazy_import("OneLogin_Saml2_Auth")(request_data, old_settings=settings)
 
 
 def _get_saml_default_redirect(application: str, request: Request, provider: Optional[Dict[str, Any]] = None) -> str:
@@ -2507,7 +4241,7 @@ def _sanitize_return_to(value: Optional[str]) -> Optional[str]:
 
 # Create an OAuth object and register supported providers
 if ENABLE_GOOGLE_AUTH or ENABLE_MICROSOFT_AUTH:
-    oauth = OAuth(config)
+    oauth = _lazy_import("OAuth")(config)
     if ENABLE_GOOGLE_AUTH:
         oauth.register(
             name="google",
@@ -2537,7 +4271,63 @@ app.add_middleware(
     same_site=AUTH_SESSION_SAME_SITE,
     https_only=AUTH_SESSION_HTTPS_ONLY,
 )
-app.add_middleware(RequestBodyLimitMiddleware, max_bytes=MAX_REQUEST_BODY_BYTES)
+app.add_middleware(
+    RequestBodyLimitMiddleware,
+    max_bytes=MAX_REQUEST_BODY_BYTES,
+    limit_for=_bff_upload_body_limit,
+)
+app.add_middleware(TracingMiddleware)
+
+@app.get(BFF_METRICS_PATH, operation_id="getMetrics", include_in_schema=False)
+def metrics(request: Request):
+    """Prometheus text exposition of BFF call, stream, and appcode build metrics."""
+    if not ENABLE_BFF_METRICS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if BFF_METRICS_TOKEN:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(token, BFF_METRICS_TOKEN):
+            raise HTTPException(status_code=401, detail="Metrics token required")
+    return Response(
+        BFF_METRICS.render(),
+        media_type=PROMETHEUS_MEDIA_TYPE,
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@app.get("/_pytincture/profile", operation_id="getBffProfile", include_in_schema=False)
+async def bff_profile(
+    request: Request,
+    seconds: float = 10.0,
+    format: str = "collapsed",
+    interval_ms: float = 5.0,
+    idle: bool = False,
+):
+    """
+    Sample this worker's stacks for ``seconds`` and return collapsed stacks or
+    a speedscope file. Only sessions listed in ``BFF_PROFILER_ADMINS`` may run it.
+    """
+    if not ENABLE_BFF_PROFILER:
+        raise HTTPException(status_code=404, detail="Not found")
+    user = require_auth(request)
+    email = str((user or {}).get("email") or "").strip().lower()
+    if not user or not user.get("is_authenticated") or email not in BFF_PROFILER_ADMINS:
+        raise HTTPException(status_code=403, detail="Profiling is limited to administrators")
+    if format not in {"collapsed", "speedscope"}:
+        raise HTTPException(status_code=400, detail="format must be collapsed or speedscope")
+    if not 0 < seconds <= BFF_PROFILER_MAX_SECONDS or not 1 <= interval_ms <= 1000:
+        raise HTTPException(status_code=400, detail="Invalid profile duration or interval")
+    try:
+        profile = await anyio.to_thread.run_sync(
+            partial(BFF_PROFILER.run, seconds, interval_ms / 1000, include_idle=idle)
+        )
+    except ProfileBusy as exc:
+        raise HTTPException(status_code=409, detail="A profile is already running") from exc
+    headers = {"Cache-Control": "no-store", "X-Pytincture-Samples": str(profile.sample_count)}
+    if format == "speedscope":
+        headers["Content-Disposition"] = f"attachment; filename=pytincture-{os.getpid()}.speedscope.json"
+        return JSONResponse(profile.speedscope(), headers=headers)
+    return Response(profile.collapsed(), media_type="text/plain; charset=utf-8", headers=headers)
+
 
 # ================
 # SAML SSO SETUP
@@ -2674,7 +4464,7 @@ async def _saml_assertion_consumer(request: Request, application: str, provider_
         request.session.pop("saml_provider_id", None)
         try:
             saml_auth.process_response(request_id=request_id)
-        except OneLogin_Saml2_ValidationError as validation_error:
+        except _lazy_import("OneLogin_Saml2_ValidationError") as validation_error:
             logger.warning(
                 "SAML response validation failed correlation_id=%s code=%s",
                 getattr(request.state, "correlation_id", ""),
@@ -2813,7 +4603,7 @@ async def _saml_metadata(request: Request, application: str, provider_id: Option
 
     try:
         provider = _get_saml_provider(provider_id)
-        settings = OneLogin_Saml2_Settings(settings=_build_saml_settings(request, application, provider=provider), sp_validation_only=True)
+        settings = _lazy_import("OneLogin_Saml2_Settings")(settings=_build_saml_settings(request, application, provider=provider), sp_validation_only=True)
         metadata_xml = settings.get_sp_metadata()
         errors = settings.validate_metadata(metadata_xml)
         if errors:
@@ -2849,7 +4639,7 @@ async def auth_google_callback(request: Request, application: str):
     """
     try:
         token = await oauth.google.authorize_access_token(request)
-    except OAuthError as e:
+    except _lazy_import("OAuthError") as e:
         logger.info("Google OAuth callback rejected", exc_info=e)
         return JSONResponse({"error": "Authentication failed"}, status_code=401)
     
@@ -2904,7 +4694,7 @@ async def auth_microsoft_callback(request: Request, application: str):
 
     try:
         token = await oauth.microsoft.authorize_access_token(request)
-    except OAuthError as e:
+    except _lazy_import("OAuthError") as e:
         logger.info("Microsoft OAuth callback rejected", exc_info=e)
         return JSONResponse({"error": "Authentication failed"}, status_code=401)
 
@@ -3199,6 +4989,14 @@ async def main_app_route(response: Response, application: str, request: Request)
         return RedirectResponse(url=f"/{application}/login")
 
     # Already logged in, proceed normally
+    index_html = DEPLOYMENT_BUNDLE.index_html(application) if DEPLOYMENT_BUNDLE is not None else None
+    if index_html is None:
+        index_html = _render_index_html(application)
+    return HTMLResponse(content=index_html)
+
+
+def _render_index_html(application: str) -> str:
+    """The application page: index.html with the entrypoint, widgetset, title and favicons filled in."""
     appcode_folder = get_modules_path()
     widgetset = get_widgetset(application, appcode_folder)
     safe_application = escape(application)
@@ -3230,7 +5028,15 @@ async def main_app_route(response: Response, application: str, request: Request)
     index_html = index_html.replace("***FAVICON_LINK***", favicon_markup)
 
     index_html = index_html.replace("***WIDGETSET***", widgetset)
-    return HTMLResponse(content=index_html)
+    index_html = index_html.replace("***APPCODE_MODE***", _appcode_mode())
+    return index_html
+
+
+def _appcode_mode() -> str:
+    configured = os.getenv("PYTINCTURE_APPCODE_MODE", "archive").strip().lower() or "archive"
+    if configured not in ("archive", "chunked"):
+        raise RuntimeError("PYTINCTURE_APPCODE_MODE must be 'archive' or 'chunked'")
+    return configured
 
 def find_main_window_subclass(file_path):
     """
@@ -3537,8 +5343,65 @@ async def configured_favicon_asset(application: str, asset_name: str):
     return FileResponse(asset_path)
 
 
+def _bundle_applications(modules_root: str) -> List[str]:
+    """Root-level modules, each of which can be opened as ``/{application}``."""
+    return sorted(
+        filename[:-3]
+        for filename in os.listdir(modules_root)
+        if filename.endswith(".py")
+        and not filename.startswith((".", "_"))
+        and os.path.isfile(os.path.join(modules_root, filename))
+    )
+
+
+def build_deployment_bundle(
+    output_path: str,
+    public_url: str,
+    applications: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Precompute the registry, session-free appcode archives, index pages,
+    favicon markup and OpenAPI schema for ``public_url`` and write them as a
+    deployment bundle. Returns the bundle manifest.
+    """
+    parsed = urlsplit(public_url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        raise ValueError("public_url must be an absolute http(s) URL such as https://app.example.com")
+    modules_root = os.path.abspath(get_modules_path())
+    built: Dict[str, Dict[str, Any]] = {}
+    for application in applications or _bundle_applications(modules_root):
+        archive = create_appcode_pkg_in_memory(parsed.netloc, parsed.scheme, application).getvalue()
+        # Uncompressed members gzip better as a whole than deflated ones.
+        stored = create_appcode_pkg_in_memory(
+            parsed.netloc, parsed.scheme, application, compression=zipfile.ZIP_STORED
+        ).getvalue()
+        archive_gzip = gzip.compress(stored, compresslevel=9, mtime=0)
+        built[application] = {
+            "archive": archive,
+            "archive_gzip": archive_gzip if len(archive_gzip) < len(archive) else None,
+            "index_html": _render_index_html(application),
+        }
+    return write_bundle(
+        output_path,
+        public_host=parsed.netloc,
+        public_protocol=parsed.scheme,
+        registry=build_bff_registry(modules_root),
+        applications=built,
+        openapi=app.openapi(),
+        pytincture_version=PYTINCTURE_VERSION,
+        modules_fingerprint=_modules_tree_fingerprint(modules_root),
+    )
+
+
+_startup_phase("routes")
 add_bff_docs_to_app(app)
+if DEPLOYMENT_BUNDLE is not None and DEPLOYMENT_BUNDLE.openapi is not None:
+    app.openapi_schema = DEPLOYMENT_BUNDLE.openapi
+_startup_phase("bff docs")
 reload_mcp_tools()
+_startup_phase("mcp")
+if os.getenv("PYTINCTURE_STARTUP_REPORT", "false").lower() == "true":
+    logger.warning("pytincture startup report: %s", json.dumps(startup_report()))
 
 # =================
 # RUN THE APP
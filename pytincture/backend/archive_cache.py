@@ -0,0 +1,136 @@
+"""
+On-disk cache for session-free appcode archives.
+
+An archive is written once per application, public URL and source fingerprint,
+then served with ``FileResponse``. Downloads stream from the OS page cache
+instead of each holding an in-memory copy, and every worker process on the
+host shares the same file, so worker memory does not grow with the number of
+applications. Workers that miss on the same archive at once wait on a file
+lock so only one of them builds it. Archives that embed per-session replay
+material never reach this cache.
+"""
+import contextlib
+import logging
+import os
+import stat
+import tempfile
+import time
+from typing import BinaryIO, Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".pyt"
+# Superseded archives are only removed once they are this old, so a download
+# that has already resolved the path in another worker can still open it.
+STALE_ARCHIVE_GRACE_SECONDS = 300.0
+
+
+def default_cache_directory() -> str:
+    """A per-user directory under the system temp dir."""
+    getuid = getattr(os, "getuid", None)
+    suffix = f"-{getuid()}" if getuid is not None else ""
+    return os.path.join(tempfile.gettempdir(), f"pytincture-appcode{suffix}")
+
+
+class AppcodeArchiveCache:
+    """Archives stored as ``<prefix><fingerprint>.pyt`` files in one private directory."""
+
+    def __init__(self, directory: str):
+        self.directory = os.path.abspath(directory)
+        self._usable: Optional[bool] = None
+
+    def usable(self) -> bool:
+        """Create the directory on first use; refuse one another user could write to."""
+        if self._usable is None:
+            self._usable = self._prepare()
+        return self._usable
+
+    def _prepare(self) -> bool:
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            info = os.stat(self.directory)
+        except OSError as exc:
+            logger.warning("Appcode archive cache disabled: %s", exc)
+            return False
+        getuid = getattr(os, "getuid", None)
+        if getuid is not None and (
+            info.st_uid != getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+        ):
+            logger.warning(
+                "Appcode archive cache disabled: %s is not a private directory owned by this user",
+                self.directory,
+            )
+            return False
+        return True
+
+    def _path(self, prefix: str, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"{prefix}{fingerprint}{ARCHIVE_SUFFIX}")
+
+    def lookup(self, prefix: str, fingerprint: str) -> Optional[str]:
+        if not self.usable():
+            return None
+        path = self._path(prefix, fingerprint)
+        return path if os.path.isfile(path) else None
+
+    def store(self, prefix: str, fingerprint: str, write: Callable[[BinaryIO], None]) -> Optional[str]:
+        """
+        Write an archive with ``write(handle)`` and return its path.
+
+        The file is written under a temporary name and renamed into place, so
+        a partial file is never served. Workers storing the same archive
+        concurrently queue on a lock and reuse the first one's result. Older
+        archives sharing ``prefix`` are pruned afterwards.
+        """
+        if not self.usable():
+            return None
+        path = self._path(prefix, fingerprint)
+        with self._build_lock(f"{prefix}{fingerprint}"):
+            if os.path.isfile(path):
+                return path
+            handle, temporary = tempfile.mkstemp(prefix=".building-", dir=self.directory)
+            try:
+                with os.fdopen(handle, "wb") as target:
+                    write(target)
+                os.chmod(temporary, 0o644)
+                os.replace(temporary, path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(temporary)
+                raise
+        self._prune(prefix, keep=os.path.basename(path))
+        return path
+
+    @contextlib.contextmanager
+    def _build_lock(self, name: str) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, f".{name}.lock"), "a+b") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _prune(self, prefix: str, keep: str) -> None:
+        cutoff = time.time() - STALE_ARCHIVE_GRACE_SECONDS
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        lock_keep = f".{keep[:-len(ARCHIVE_SUFFIX)]}.lock"
+        for name in names:
+            stale_archive = name.startswith(prefix) and name.endswith(ARCHIVE_SUFFIX)
+            stale_lock = name.startswith(f".{prefix}") and name.endswith(".lock")
+            if name in (keep, lock_keep) or not (stale_archive or stale_lock):
+                continue
+            path = os.path.join(self.directory, name)
+            with contextlib.suppress(OSError):
+                if os.stat(path).st_mtime < cutoff:
+                    os.unlink(path)
+
@@ -0,0 +1,211 @@
+"""
+Prebuilt deployment bundles.
+
+``python -m pytincture build`` precomputes what the server would otherwise
+derive from the modules tree at runtime: the BFF registry, one appcode archive
+per application (plus a gzip variant), the rendered index page, favicon markup
+and the OpenAPI schema. A server started with ``PYTINCTURE_BUNDLE_PATH`` loads
+the bundle once and serves from it, so no module is parsed and no archive is
+zipped on the request path.
+
+Layout of a bundle directory::
+
+    manifest.json           format, bundle id, version, public URL, stub
+                            settings, modules tree fingerprint
+    registry.txt            BFF registry as a Python literal
+    openapi.json            OpenAPI schema (also feeds the MCP tools)
+    apps/<application>/     appcode.pyt, appcode.pyt.gz, index.html
+
+Stubs embed the public URL and the stub-related settings, so a bundle is only
+used when both match the running server; anything else falls back to runtime
+generation. A bundle built by another pytincture version, with other stub
+settings, or from a different modules tree refuses to load.
+"""
+import ast
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from pytincture import __version__ as PYTINCTURE_VERSION
+
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+
+# Environment settings that change generated stubs or the package contents.
+STUB_SETTINGS_DEFAULTS = {
+    "BFF_REPLAY_TOKEN_LOW_WATERMARK": "3",
+    "BFF_STUB_COALESCE_MS": "0",
+    "BFF_BATCH_MAX_CALLS": "50",
+    "ENABLE_BFF_WEBSOCKET": "false",
+    "ENABLE_BFF_TRACING": "false",
+    "PYTINCTURE_BROWSER_FILES": "",
+    "PYTINCTURE_APPCODE_MODE": "archive",
+}
+
+
+def stub_settings() -> Dict[str, str]:
+    """The current values of the settings baked into prebuilt archives."""
+    return {name: os.getenv(name, default).strip() for name, default in STUB_SETTINGS_DEFAULTS.items()}
+
+
+def write_bundle(
+    output_path: str,
+    *,
+    public_host: str,
+    public_protocol: str,
+    registry: Dict[Tuple[str, str, str], Dict[str, Any]],
+    applications: Dict[str, Dict[str, Any]],
+    openapi: Optional[Dict[str, Any]],
+    pytincture_version: str,
+    modules_fingerprint: str,
+) -> Dict[str, Any]:
+    """
+    Write a bundle to ``output_path`` and return its manifest.
+
+    ``applications`` maps names to ``archive``/``archive_gzip`` bytes and
+    ``index_html`` text. The directory is written next to the target and
+    swapped in, so a server never sees a half-written bundle.
+    """
+    output_path = os.path.abspath(output_path)
+    parent = os.path.dirname(output_path)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".bundle-", dir=parent)
+    os.chmod(staging, 0o755)
+    digest = hashlib.sha256()
+
+    def put(relative: str, data: bytes) -> str:
+        path = os.path.join(staging, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as handle:
+            handle.write(data)
+        digest.update(relative.encode("utf-8") + b"\0" + data)
+        return relative
+
+    try:
+        registry_file = put(
+            "registry.txt",
+            repr({key: registry[key] for key in sorted(registry)}).encode("utf-8"),
+        )
+        openapi_file = None
+        if openapi is not None:
+            openapi_file = put("openapi.json", json.dumps(openapi, sort_keys=True).encode("utf-8"))
+        app_entries = {}
+        for application in sorted(applications):
+            built = applications[application]
+            prefix = f"apps/{application}"
+            entry = {
+                "archive": put(f"{prefix}/appcode.pyt", built["archive"]),
+                "archive_sha256": hashlib.sha256(built["archive"]).hexdigest(),
+                "index_html": put(f"{prefix}/index.html", built["index_html"].encode("utf-8")),
+            }
+            if built.get("archive_gzip"):
+                entry["archive_gzip"] = put(f"{prefix}/appcode.pyt.gz", built["archive_gzip"])
+            app_entries[application] = entry
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "bundle_id": digest.hexdigest()[:16],
+            "pytincture_version": pytincture_version,
+            "modules_fingerprint": modules_fingerprint,
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "public_host": public_host,
+            "public_protocol": public_protocol,
+            "stub_settings": stub_settings(),
+            "registry": registry_file,
+            "openapi": openapi_file,
+            "applications": app_entries,
+        }
+        with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        if os.path.isdir(output_path):
+            retired = f"{output_path}.old-{os.getpid()}"
+            os.replace(output_path, retired)
+            os.replace(staging, output_path)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, output_path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+
+class DeploymentBundle:
+    """
+    A loaded bundle. The manifest, registry, schema and index pages are read
+    once at load time; archives stay on disk and are served as files.
+    """
+
+    def __init__(self, path: str, modules_fingerprint: Optional[str] = None):
+        self.path = os.path.abspath(path)
+        try:
+            with open(os.path.join(self.path, MANIFEST_NAME), encoding="utf-8") as handle:
+                self.manifest = json.load(handle)
+        except (OSError, json.JSONDecodeError) as exc:
+            raise RuntimeError(f"PYTINCTURE_BUNDLE_PATH does not contain a readable bundle: {exc}") from exc
+        if self.manifest.get("format") != BUNDLE_FORMAT:
+            raise RuntimeError(
+                f"Unsupported bundle format {self.manifest.get('format')!r}; rebuild it with python -m pytincture build"
+            )
+        if self.manifest.get("pytincture_version") != PYTINCTURE_VERSION:
+            raise RuntimeError(
+                f"The deployment bundle was built by pytincture {self.manifest.get('pytincture_version')}, "
+                f"not {PYTINCTURE_VERSION}; rebuild it with python -m pytincture build"
+            )
+        mismatched = sorted(
+            name
+            for name, value in stub_settings().items()
+            if self.manifest.get("stub_settings", {}).get(name, STUB_SETTINGS_DEFAULTS[name]) != value
+        )
+        if mismatched:
+            raise RuntimeError(
+                "The deployment bundle was built with different settings for "
+                + ", ".join(mismatched)
+                + "; rebuild it with the production environment"
+            )
+        if modules_fingerprint is not None and self.manifest.get("modules_fingerprint") != modules_fingerprint:
+            raise RuntimeError(
+                "The modules tree has changed since the deployment bundle was built; "
+                "rebuild it with python -m pytincture build"
+            )
+        self.bundle_id = self.manifest["bundle_id"]
+        self.registry = ast.literal_eval(self._read(self.manifest["registry"]).decode("utf-8"))
+        self.openapi = json.loads(self._read(self.manifest["openapi"])) if self.manifest.get("openapi") else None
+        self._archives: Dict[str, str] = {}
+        self._gzip_archives: Dict[str, str] = {}
+        self._index_html: Dict[str, str] = {}
+        for application, entry in self.manifest["applications"].items():
+            self._archives[application] = self._file(entry["archive"])
+            if entry.get("archive_gzip"):
+                self._gzip_archives[application] = self._file(entry["archive_gzip"])
+            self._index_html[application] = self._read(entry["index_html"]).decode("utf-8")
+
+    def _file(self, relative: str) -> str:
+        path = os.path.join(self.path, relative)
+        if not os.path.isfile(path):
+            raise RuntimeError(f"The deployment bundle is missing {relative}; rebuild it with python -m pytincture build")
+        return path
+
+    def _read(self, relative: str) -> bytes:
+        with open(self._file(relative), "rb") as handle:
+            return handle.read()
+
+    def serves(self, host: str, protocol: str) -> bool:
+        """Whether archives built for the bundle's public URL fit this request."""
+        return (
+            host.casefold() == self.manifest["public_host"].casefold()
+            and protocol == self.manifest["public_protocol"]
+        )
+
+    def archive_path(self, application: str) -> Optional[str]:
+        return self._archives.get(application)
+
+    def gzip_archive_path(self, application: str) -> Optional[str]:
+        return self._gzip_archives.get(application)
+
+    def index_html(self, application: str) -> Optional[str]:
+        return self._index_html.get(application)
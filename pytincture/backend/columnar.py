@@ -0,0 +1,82 @@
+"""
+Columnar encoding for ``@bff_result("arrow")`` operations.
+
+Tabular results are written as an Arrow IPC stream when pyarrow is installed.
+pyarrow, pandas, and numpy are all optional: results from libraries that are
+not loaded are never seen here, and without pyarrow callers fall back to JSON
+rows.
+"""
+import sys
+from typing import Any, List
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - depends on installation
+    pyarrow = None
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def arrow_available() -> bool:
+    return pyarrow is not None
+
+
+def _pandas_frame(result: Any) -> bool:
+    pandas = sys.modules.get("pandas")
+    return pandas is not None and isinstance(result, pandas.DataFrame)
+
+
+def _record_array(result: Any) -> bool:
+    dtype = getattr(result, "dtype", None)
+    return bool(getattr(dtype, "names", None)) and hasattr(result, "tolist")
+
+
+def _column_dict(result: Any) -> bool:
+    return isinstance(result, dict) and bool(result) and all(
+        isinstance(values, (list, tuple)) for values in result.values()
+    )
+
+
+def _row_list(result: Any) -> bool:
+    return isinstance(result, list) and all(isinstance(row, dict) for row in result)
+
+
+def to_arrow_table(result: Any):
+    """Return ``result`` as a ``pyarrow.Table``, or ``None`` if it is not tabular."""
+    if pyarrow is None:
+        return None
+    if isinstance(result, pyarrow.Table):
+        return result
+    if isinstance(result, pyarrow.RecordBatch):
+        return pyarrow.Table.from_batches([result])
+    if _pandas_frame(result):
+        return pyarrow.Table.from_pandas(result, preserve_index=False)
+    if _record_array(result):
+        return pyarrow.Table.from_pydict({name: result[name] for name in result.dtype.names})
+    if _column_dict(result):
+        return pyarrow.Table.from_pydict({str(name): list(values) for name, values in result.items()})
+    if _row_list(result):
+        return pyarrow.Table.from_pylist(result)
+    return None
+
+
+def encode_arrow_stream(table) -> "pyarrow.Buffer":
+    """Serialize a table as an Arrow IPC stream held in a single buffer."""
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def to_json_rows(result: Any) -> Any:
+    """Convert tabular objects that JSON cannot encode into a list of row dicts."""
+    if pyarrow is not None and isinstance(result, (pyarrow.Table, pyarrow.RecordBatch)):
+        return result.to_pylist()
+    if _pandas_frame(result):
+        return result.to_dict(orient="records")
+    if _record_array(result):
+        names: List[str] = list(result.dtype.names)
+        return [dict(zip(names, row)) for row in result.tolist()]
+    return result
+
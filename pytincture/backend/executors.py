@@ -0,0 +1,358 @@
+"""
+Sized thread pools for synchronous backend_for_frontend methods, and the warm
+process pool used by ``@bff_execution("process")``.
+
+Sync BFF methods run here instead of anyio's shared thread limiter, so a slow
+operation cannot starve appcode downloads or logins. Each pool owns its worker
+threads and a bounded wait queue; calls beyond ``max_workers + max_queue`` are
+rejected immediately so the caller can shed load.
+"""
+import asyncio
+import contextvars
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pytincture.backend.process_worker import BffWorkerTimeout, preload_bff_modules, run_bff_method
+
+
+DEFAULT_POOL_NAME = "default"
+
+
+class BffExecutorSaturated(Exception):
+    """Raised when a pool has no free worker and its wait queue is full."""
+
+    def __init__(self, pool_name: str):
+        super().__init__(f"BFF executor pool {pool_name!r} is saturated")
+        self.pool_name = pool_name
+
+
+class BffExecutorPool:
+    """A named thread pool with a bounded queue and utilization counters."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, max_zombies: Optional[int] = None):
+        if max_workers <= 0 or max_queue < 0:
+            raise ValueError("BFF executor pools need max_workers > 0 and max_queue >= 0")
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        # Calls whose caller gave up while the thread kept running. They still
+        # hold a worker, so the pool sheds load once too many accumulate.
+        self.max_zombies = max_workers if max_zombies is None else max_zombies
+        self._zombies = 0
+        self._abandoned = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"pytincture-bff-{name}",
+        )
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            if (
+                self._active + self._queued >= self.max_workers + self.max_queue
+                or self._zombies >= self.max_zombies
+            ):
+                self._rejected += 1
+                raise BffExecutorSaturated(self.name)
+            self._queued += 1
+
+        submitted_at = time.monotonic()
+        context = contextvars.copy_context()
+
+        def call():
+            waited = time.monotonic() - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_seconds_total += waited
+                self._wait_seconds_max = max(self._wait_seconds_max, waited)
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        future = self._executor.submit(call)
+
+        def release_if_never_started(done_future):
+            # A call cancelled while still queued never reaches call().
+            if done_future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        future.add_done_callback(release_if_never_started)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancel() and not future.done():
+                self._track_zombie(future)
+            raise
+
+    def _track_zombie(self, future) -> None:
+        with self._lock:
+            self._zombies += 1
+            self._abandoned += 1
+
+        def release_zombie(_):
+            with self._lock:
+                self._zombies -= 1
+
+        future.add_done_callback(release_zombie)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "zombies": self._zombies,
+                "max_zombies": self.max_zombies,
+                "abandoned": self._abandoned,
+                "utilization": self._active / self.max_workers,
+                "wait_seconds_total": self._wait_seconds_total,
+                "wait_seconds_max": self._wait_seconds_max,
+                "wait_seconds_avg": self._wait_seconds_total / started if started else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class BffExecutorRegistry:
+    """
+    Lazily created pools keyed by name. Sizes from ``BFF_EXECUTOR_POOLS`` take
+    precedence over sizes declared with ``@bff_executor`` so operators can tune
+    a deployment without editing application code.
+    """
+
+    def __init__(
+        self,
+        configured_pools: Optional[Dict[str, Dict[str, int]]] = None,
+        default_max_workers: int = 16,
+        default_max_queue: int = 64,
+        max_zombies: Optional[int] = None,
+    ):
+        self.configured_pools = dict(configured_pools or {})
+        self.default_max_workers = default_max_workers
+        self.default_max_queue = default_max_queue
+        self.max_zombies = max_zombies
+        self._pools: Dict[str, BffExecutorPool] = {}
+        self._lock = threading.Lock()
+
+    def pool(
+        self,
+        name: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ) -> BffExecutorPool:
+        pool_name = name or DEFAULT_POOL_NAME
+        existing = self._pools.get(pool_name)
+        if existing is not None:
+            return existing
+        with self._lock:
+            existing = self._pools.get(pool_name)
+            if existing is not None:
+                return existing
+            sizing = {
+                "max_workers": max_workers or self.default_max_workers,
+                "max_queue": self.default_max_queue if max_queue is None else max_queue,
+            }
+            sizing.update(self.configured_pools.get(pool_name, {}))
+            created = BffExecutorPool(
+                pool_name,
+                sizing["max_workers"],
+                sizing["max_queue"],
+                max_zombies=self.max_zombies,
+            )
+            self._pools[pool_name] = created
+            return created
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.shutdown()
+
+
+class BffProcessPool:
+    """
+    Warm worker processes for CPU-bound BFF methods.
+
+    Workers preload the modules of process-mode operations when they start.
+    Each call arms an alarm inside its worker so an overrunning method is
+    interrupted and the worker stays warm. If the worker does not answer within
+    ``kill_grace`` seconds after that, the pool is retired: new calls go to a
+    fresh pool, calls already running on its healthy workers finish, and its
+    processes, including the stuck one, are killed once the last of them has
+    returned.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        preload_targets: Optional[Callable[[], Iterable[Tuple[str, str]]]] = None,
+        start_method: str = "spawn",
+        kill_grace: float = 2.0,
+    ):
+        if max_workers <= 0:
+            raise ValueError("BFF process pools need max_workers > 0")
+        self.max_workers = max_workers
+        self.start_method = start_method
+        self.kill_grace = kill_grace
+        self._preload_targets = preload_targets or (lambda: ())
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[ProcessPoolExecutor, int] = {}
+        self._retired: set = set()
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._timeouts = 0
+        self._recycled = 0
+        self._killed = 0
+
+    def _current_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=preload_bff_modules,
+                    initargs=(tuple(self._preload_targets()),),
+                )
+                self._in_flight[self._executor] = 0
+            self._in_flight[self._executor] += 1
+            return self._executor
+
+    def _retire(self, executor: ProcessPoolExecutor, stuck: bool = False) -> None:
+        """Stop routing calls to ``executor``; ``_release`` terminates it once drained."""
+        with self._lock:
+            if executor not in self._in_flight:
+                # Already terminated, or the pool was shut down.
+                return
+            if self._executor is executor:
+                self._executor = None
+                self._recycled += 1
+            if stuck and executor not in self._retired:
+                self._killed += 1
+            self._retired.add(executor)
+
+    def _release(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if executor not in self._in_flight:
+                return
+            self._in_flight[executor] -= 1
+            finished = executor in self._retired and self._in_flight[executor] == 0
+            if finished:
+                self._retired.discard(executor)
+                self._in_flight.pop(executor, None)
+        if finished:
+            _terminate_process_executor(executor)
+
+    async def run(
+        self,
+        timeout: float,
+        file_path: str,
+        class_name: str,
+        function_name: str,
+        user: Any,
+        args: List[Any],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        executor = self._current_executor()
+        try:
+            future = executor.submit(
+                run_bff_method, file_path, class_name, function_name, user, args, kwargs, timeout
+            )
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=timeout + self.kill_grace
+            )
+        except BffWorkerTimeout:
+            with self._lock:
+                self._timeouts += 1
+            raise asyncio.TimeoutError() from None
+        except asyncio.TimeoutError:
+            # The worker ignored its alarm (for example inside C code). Killing
+            # it now would break every other call on this pool, so the pool is
+            # retired and killed after those calls return.
+            with self._lock:
+                self._timeouts += 1
+            self._retire(executor, stuck=True)
+            raise
+        except BrokenProcessPool:
+            self._retire(executor)
+            raise
+        finally:
+            self._release(executor)
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "in_flight": sum(self._in_flight.values()),
+                "completed": self._completed,
+                "timeouts": self._timeouts,
+                "recycled": self._recycled,
+                "killed": self._killed,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executors = list(self._in_flight)
+            self._executor = None
+            self._in_flight.clear()
+            self._retired.clear()
+        for executor in executors:
+            _terminate_process_executor(executor)
+
+
+def _terminate_process_executor(executor: ProcessPoolExecutor) -> None:
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def load_executor_pool_config(raw_value: str) -> Dict[str, Dict[str, int]]:
+    """Parse ``BFF_EXECUTOR_POOLS``: a JSON object of pool name to sizing."""
+    try:
+        parsed = json.loads(raw_value or "{}")
+    except json.JSONDecodeError as exc:
+        raise RuntimeError("Invalid JSON in BFF_EXECUTOR_POOLS environment variable") from exc
+    if not isinstance(parsed, dict):
+        raise RuntimeError("BFF_EXECUTOR_POOLS must be a JSON object")
+    pools: Dict[str, Dict[str, int]] = {}
+    for name, sizing in parsed.items():
+        if not isinstance(sizing, dict):
+            raise RuntimeError(f"BFF_EXECUTOR_POOLS entry {name!r} must be an object")
+        try:
+            normalized = {
+                key: int(sizing[key]) for key in ("max_workers", "max_queue") if key in sizing
+            }
+        except (TypeError, ValueError) as exc:
+            raise RuntimeError(f"BFF_EXECUTOR_POOLS entry {name!r} must use integer sizes") from exc
+        if normalized.get("max_workers", 1) <= 0 or normalized.get("max_queue", 0) < 0:
+            raise RuntimeError(f"BFF_EXECUTOR_POOLS entry {name!r} has invalid sizes")
+        pools[str(name)] = normalized
+    return pools
@@ -0,0 +1,64 @@
+"""
+Loading of application source files outside the normal import system.
+
+Kept separate from the FastAPI app so process-pool workers can load BFF modules
+without importing the web application.
+"""
+import hashlib
+import importlib.util
+import os
+import re
+import sys
+from importlib.machinery import SourceFileLoader
+
+from pytincture import get_modules_path
+
+
+def _build_dynamic_module_name(file_path: str, name_hint: str) -> str:
+    """
+    Build a stable module name for manually loaded source files.
+
+    The name includes a sanitized hint for readability and a path hash to avoid
+    collisions between different files that share a class name or basename.
+    """
+    absolute_path = os.path.abspath(file_path)
+    modules_root = os.path.abspath(get_modules_path() or os.getcwd())
+
+    try:
+        relative_path = os.path.relpath(absolute_path, modules_root)
+    except ValueError:
+        relative_path = os.path.basename(absolute_path)
+
+    if relative_path.startswith(".."):
+        relative_path = os.path.basename(absolute_path)
+
+    sanitized_hint = re.sub(r"[^0-9a-zA-Z_]+", "_", name_hint).strip("_") or "module"
+    sanitized_path = re.sub(r"[^0-9a-zA-Z_]+", "_", relative_path.replace("\\", "/")).strip("_") or "source"
+    path_hash = hashlib.sha1(absolute_path.encode("utf-8")).hexdigest()[:12]
+    return f"pytincture_dynamic_{sanitized_hint}_{sanitized_path}_{path_hash}"
+
+
+def _load_source_module(file_path: str, name_hint: str):
+    """
+    Load a Python source file using importlib-compatible sys.modules registration.
+    """
+    module_name = _build_dynamic_module_name(file_path, name_hint)
+    loader = SourceFileLoader(module_name, file_path)
+    spec = importlib.util.spec_from_loader(module_name, loader)
+    if spec is None:
+        raise ImportError(f"Unable to create import spec for {file_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    previous_module = sys.modules.get(spec.name)
+    sys.modules[spec.name] = module
+
+    try:
+        loader.exec_module(module)
+    except Exception:
+        if previous_module is None:
+            sys.modules.pop(spec.name, None)
+        else:
+            sys.modules[spec.name] = previous_module
+        raise
+
+    return module
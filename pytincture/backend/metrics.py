@@ -0,0 +1,246 @@
+"""
+Prometheus-style metrics for BFF calls, streams, and appcode archives.
+
+Counters, gauges, and histograms are kept in process memory and rendered in
+the Prometheus text exposition format on request, so no client library is
+needed. BFF series are labelled with the ``(file, class, function)`` of
+registered operations only, which keeps label cardinality bounded by the
+application rather than by whatever paths clients send.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+SIZE_BUCKETS = (
+    1024, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864, 268435456,
+)
+BFF_PHASES = ("auth", "replay", "load", "instantiate", "execute", "serialize")
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_FAMILIES = {
+    "pytincture_bff_requests_total": ("counter", "BFF calls by response status."),
+    "pytincture_bff_request_seconds": ("histogram", "End-to-end BFF call latency."),
+    "pytincture_bff_phase_seconds": ("histogram", "BFF call latency split by phase."),
+    "pytincture_bff_in_flight": ("gauge", "BFF calls currently being handled."),
+    "pytincture_bff_timeouts_total": ("counter", "BFF calls that hit the call timeout."),
+    "pytincture_bff_errors_total": ("counter", "BFF calls that failed with a server error."),
+    "pytincture_bff_streams_total": ("counter", "Finished BFF streams by outcome."),
+    "pytincture_bff_stream_bytes_total": ("counter", "Bytes written by BFF streams."),
+    "pytincture_bff_stream_seconds": ("histogram", "Duration of BFF streams."),
+    "pytincture_appcode_builds_total": ("counter", "Appcode archives built."),
+    "pytincture_appcode_build_seconds": ("histogram", "Time spent building appcode archives."),
+    "pytincture_appcode_archive_bytes": ("histogram", "Size of built appcode archives."),
+    "pytincture_appcode_build_waiters_total": ("counter", "Appcode downloads that joined a build already in progress."),
+}
+
+
+def bff_labels(file: str, class_name: str, function: str) -> Labels:
+    return (("file", file), ("class", class_name), ("function", function))
+
+
+def _operation_labels(operation: str) -> Labels:
+    """Split a ``file:Class.function`` operation name into BFF labels."""
+    file, _, qualified = operation.rpartition(":")
+    class_name, _, function = qualified.partition(".")
+    return bff_labels(file, class_name, function)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class BffMetrics:
+    """Thread-safe metric store rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+
+    def inc(self, name: str, labels: Labels, value: float = 1) -> None:
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + value
+
+    def observe(
+        self,
+        name: str,
+        labels: Labels,
+        value: float,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        with self._lock:
+            self._observe(name, labels, value, buckets)
+
+    def _observe(self, name: str, labels: Labels, value: float, buckets: Sequence[float]) -> None:
+        series = self._histograms.setdefault(name, {})
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = _Histogram(buckets)
+        histogram.observe(value)
+
+    def call_timer(self) -> "BffCallTimer":
+        return BffCallTimer(self)
+
+    def observe_call(
+        self,
+        labels: Labels,
+        status: int,
+        seconds: float,
+        phases: Dict[str, float],
+    ) -> None:
+        with self._lock:
+            requests = self._values.setdefault("pytincture_bff_requests_total", {})
+            key = labels + (("status", str(status)),)
+            requests[key] = requests.get(key, 0) + 1
+            self._observe("pytincture_bff_request_seconds", labels, seconds, LATENCY_BUCKETS)
+            for phase, elapsed in phases.items():
+                self._observe(
+                    "pytincture_bff_phase_seconds", labels + (("phase", phase),), elapsed, LATENCY_BUCKETS
+                )
+            if status == 504:
+                failures = self._values.setdefault("pytincture_bff_timeouts_total", {})
+            elif status >= 500:
+                failures = self._values.setdefault("pytincture_bff_errors_total", {})
+            else:
+                return
+            failures[labels] = failures.get(labels, 0) + 1
+
+    def observe_stream(self, stats) -> None:
+        """``BffStreamRegistry`` close hook: record a finished stream's bytes and duration."""
+        labels = _operation_labels(stats.operation)
+        with self._lock:
+            streams = self._values.setdefault("pytincture_bff_streams_total", {})
+            key = labels + (("outcome", stats.outcome),)
+            streams[key] = streams.get(key, 0) + 1
+            written = self._values.setdefault("pytincture_bff_stream_bytes_total", {})
+            written[labels] = written.get(labels, 0) + stats.bytes
+            self._observe(
+                "pytincture_bff_stream_seconds",
+                labels,
+                stats.finished_at - stats.started_at,
+                LATENCY_BUCKETS,
+            )
+
+    def observe_appcode_build(self, application: str, seconds: float, size: int) -> None:
+        labels = (("application", application),)
+        with self._lock:
+            builds = self._values.setdefault("pytincture_appcode_builds_total", {})
+            builds[labels] = builds.get(labels, 0) + 1
+            self._observe("pytincture_appcode_build_seconds", labels, seconds, LATENCY_BUCKETS)
+            self._observe("pytincture_appcode_archive_bytes", labels, size, SIZE_BUCKETS)
+
+    def observe_appcode_build_waiter(self, application: str) -> None:
+        self.inc("pytincture_appcode_build_waiters_total", (("application", application),))
+
+    def render(self) -> str:
+        """Return every recorded series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, description) in _FAMILIES.items():
+                if kind == "histogram":
+                    series = self._histograms.get(name)
+                else:
+                    series = self._values.get(name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(series.items()):
+                    if kind == "histogram":
+                        lines.extend(_histogram_lines(name, labels, value))
+                    else:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def clear(self) -> None:
+        with self._lock:
+            in_flight = self._values.get("pytincture_bff_in_flight", {})
+            self._values = {"pytincture_bff_in_flight": in_flight} if in_flight else {}
+            self._histograms = {}
+
+
+class BffCallTimer:
+    """
+    Times the phases of one BFF call. Phases may run before the operation is
+    known (authentication happens first), so they are kept on the timer and
+    recorded together by ``finish`` once ``bind`` has named the operation.
+    """
+
+    def __init__(self, metrics: BffMetrics):
+        self.metrics = metrics
+        self.labels: Optional[Labels] = None
+        self.phases: Dict[str, float] = {}
+        self.started_at = time.perf_counter()
+        self._finished = False
+
+    def bind(self, file: str, class_name: str, function: str) -> None:
+        if self.labels is not None:
+            return
+        self.labels = bff_labels(file, class_name, function)
+        self.metrics.inc("pytincture_bff_in_flight", self.labels)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def finish(self, status: int) -> None:
+        if self._finished or self.labels is None:
+            return
+        self._finished = True
+        self.metrics.inc("pytincture_bff_in_flight", self.labels, -1)
+        self.metrics.observe_call(
+            self.labels, status, time.perf_counter() - self.started_at, self.phases
+        )
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, labels: Labels, histogram: _Histogram) -> Iterator[str]:
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        bucket_labels = labels + (("le", _format_value(float(bound))),)
+        yield f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+    yield f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}"
+    yield f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}"
+    yield f"{name}_count{_format_labels(labels)} {histogram.count}"
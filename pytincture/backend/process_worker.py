@@ -0,0 +1,69 @@
+"""
+Entry points executed inside process-pool workers for ``@bff_execution("process")``.
+
+Workers keep loaded BFF modules between calls and reload a module only when its
+source file changes, so each call pays for construction and the method itself.
+"""
+import logging
+import os
+import signal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pytincture.backend.loader import _load_source_module
+
+logger = logging.getLogger("pytincture.process_worker")
+
+_LOADED_MODULES: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+
+
+def _worker_module(file_path: str, class_name: str):
+    key = (file_path, class_name)
+    modified_at = os.path.getmtime(file_path)
+    cached = _LOADED_MODULES.get(key)
+    if cached is not None and cached[0] == modified_at:
+        return cached[1]
+    module = _load_source_module(file_path, class_name)
+    _LOADED_MODULES[key] = (modified_at, module)
+    return module
+
+
+def preload_bff_modules(targets: Iterable[Tuple[str, str]]) -> None:
+    """Pool initializer: import the modules of process-mode operations up front."""
+    for file_path, class_name in targets:
+        try:
+            _worker_module(file_path, class_name)
+        except Exception:
+            # The call itself will surface the failure with a proper response.
+            logger.exception("Unable to preload BFF module %s", os.path.basename(file_path))
+
+
+class BffWorkerTimeout(Exception):
+    """Raised inside a worker when a process-mode call exceeds its timeout."""
+
+
+def _raise_worker_timeout(signum, frame):
+    raise BffWorkerTimeout("BFF call timed out")
+
+
+def run_bff_method(
+    file_path: str,
+    class_name: str,
+    function_name: str,
+    user: Any,
+    args: List[Any],
+    kwargs: Dict[str, Any],
+    timeout: Optional[float] = None,
+) -> Any:
+    """Construct the BFF class for ``user`` and call ``function_name`` in this worker."""
+    use_alarm = bool(timeout) and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_worker_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        module = _worker_module(file_path, class_name)
+        instance = getattr(module, class_name)(_user=user)
+        return getattr(instance, function_name)(*args, **kwargs)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
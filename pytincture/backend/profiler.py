@@ -0,0 +1,161 @@
+"""
+Stack-sampling profiler for live workers.
+
+A background thread reads every thread's stack with ``sys._current_frames()``
+at a fixed interval, so it needs nothing beyond the standard library and does
+not slow down the code being profiled beyond the sampling itself. Samples are
+labelled with the BFF operation that was running: ``class_call`` runs
+operations through ``run_labelled`` and ``await_labelled``, and the sampler
+reads the ``label`` local of those frames. Results are rendered as collapsed
+stacks (for flamegraph tools) or as a speedscope file.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+UNLABELLED = "(no BFF operation)"
+
+# Innermost frames of threads that are parked rather than working.
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+Frame = Tuple[str, str, int]
+
+
+def run_labelled(label: Optional[str], func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+    """Call ``func`` so that samples taken inside it carry ``label``."""
+    return func(*args, **kwargs)
+
+
+async def await_labelled(label: Optional[str], awaitable: Awaitable[Any]) -> Any:
+    """Await ``awaitable`` so that samples taken while it runs carry ``label``."""
+    return await awaitable
+
+
+_LABEL_CODES = {run_labelled.__code__, await_labelled.__code__}
+
+
+class ProfileBusy(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+class SamplingProfile:
+    """Samples collected by one profiling run."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format; the BFF operation is the root frame."""
+        lines = []
+        for (label, thread_name, stack), count in sorted(self.samples.items()):
+            frames = [label, f"thread:{thread_name}", *(_frame_name(frame) for frame in stack)]
+            lines.append(";".join(name.replace(";", ":") for name in frames) + f" {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def speedscope(self) -> Dict[str, Any]:
+        """A speedscope file with one sampled profile per BFF operation."""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict[str, Any]] = []
+        profiles: Dict[str, Dict[str, Any]] = {}
+        for (label, _, stack), count in sorted(self.samples.items()):
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indexes.append(frame_index[frame])
+            profile = profiles.setdefault(label, {
+                "type": "sampled",
+                "name": label,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": [],
+                "weights": [],
+            })
+            profile["samples"].append(indexes)
+            profile["weights"].append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": list(profiles.values()),
+            "name": f"pytincture worker {os.getpid()}",
+            "exporter": "pytincture",
+        }
+
+
+class SamplingProfiler:
+    """Runs one profile at a time; concurrent requests get ``ProfileBusy``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def run(self, seconds: float, interval: float = 0.005, include_idle: bool = False) -> SamplingProfile:
+        """Sample every other thread for ``seconds``. Blocks the calling thread."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfileBusy()
+        try:
+            return self._sample(seconds, interval, include_idle)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float, include_idle: bool) -> SamplingProfile:
+        profile = SamplingProfile(interval)
+        own_thread = threading.get_ident()
+        started = time.monotonic()
+        deadline = started + seconds
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                label, stack = _walk(frame)
+                if not include_idle and _is_idle(stack):
+                    continue
+                key = (label or UNLABELLED, names.get(thread_id, str(thread_id)), stack)
+                profile.samples[key] += 1
+                profile.sample_count += 1
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            time.sleep(min(interval, deadline - now))
+        profile.duration = time.monotonic() - started
+        return profile
+
+
+def _walk(frame) -> Tuple[Optional[str], Tuple[Frame, ...]]:
+    """Return the innermost BFF label and the stack, outermost frame first."""
+    label = None
+    stack: List[Frame] = []
+    while frame is not None:
+        code = frame.f_code
+        if label is None and code in _LABEL_CODES:
+            label = frame.f_locals.get("label")
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return label, tuple(stack)
+
+
+def _is_idle(stack: Tuple[Frame, ...]) -> bool:
+    if not stack:
+        return True
+    name, filename, _ = stack[-1]
+    return (os.path.basename(filename), name) in _IDLE_FRAMES
+
+
+def _frame_name(frame: Frame) -> str:
+    name, filename, line = frame
+    return f"{name} ({os.path.basename(filename)}:{line})"
@@ -0,0 +1,423 @@
+"""
+Streaming engine for ``@bff_stream`` responses.
+
+Sync generators are driven by one dedicated producer thread per stream that
+hands serialized chunks to the event loop through a bounded queue, so a slow
+client pauses the generator instead of letting output pile up in memory.
+Small chunks are coalesced into larger writes bounded by a byte and a latency
+budget, and every stream records its throughput. Streams declared with
+``@bff_stream(sse=True)`` are framed as Server-Sent Events and can be resumed.
+"""
+import asyncio
+import contextvars
+import hmac
+import logging
+import queue
+import secrets
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional
+
+import anyio
+
+logger = logging.getLogger("pytincture.streaming")
+
+_END = object()
+
+
+class _ProducerFailure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class BffStreamStats:
+    """Throughput counters for a single streamed response."""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.items = 0
+        self.bytes = 0
+        self.writes = 0
+        self.outcome = "active"
+
+    def as_dict(self) -> Dict[str, Any]:
+        duration = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "operation": self.operation,
+            "outcome": self.outcome,
+            "items": self.items,
+            "bytes": self.bytes,
+            "writes": self.writes,
+            "seconds": duration,
+            "items_per_second": self.items / duration if duration > 0 else 0.0,
+            "bytes_per_second": self.bytes / duration if duration > 0 else 0.0,
+        }
+
+
+class BffStreamRegistry:
+    """Active streams, the most recently finished ones, and per-operation totals."""
+
+    def __init__(self, history: int = 100, on_close: Optional[Callable[[BffStreamStats], None]] = None):
+        self._on_close = on_close
+        self._lock = threading.Lock()
+        self._active: Dict[int, BffStreamStats] = {}
+        self._recent: Deque[BffStreamStats] = deque(maxlen=history)
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def open(self, operation: str) -> BffStreamStats:
+        stats = BffStreamStats(operation)
+        with self._lock:
+            self._active[id(stats)] = stats
+        return stats
+
+    def close(self, stats: BffStreamStats, outcome: str) -> None:
+        stats.finished_at = time.monotonic()
+        stats.outcome = outcome
+        with self._lock:
+            self._active.pop(id(stats), None)
+            self._recent.append(stats)
+            totals = self._totals.setdefault(
+                stats.operation,
+                {"streams": 0, "abandoned": 0, "items": 0, "bytes": 0, "writes": 0, "seconds": 0.0},
+            )
+            totals["streams"] += 1
+            totals["abandoned"] += outcome != "completed"
+            totals["items"] += stats.items
+            totals["bytes"] += stats.bytes
+            totals["writes"] += stats.writes
+            totals["seconds"] += stats.finished_at - stats.started_at
+        if self._on_close is not None:
+            self._on_close(stats)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            active = [stats.as_dict() for stats in self._active.values()]
+            recent = [stats.as_dict() for stats in self._recent]
+            operations = {}
+            for operation, totals in self._totals.items():
+                seconds = totals["seconds"]
+                operations[operation] = {
+                    **totals,
+                    "items_per_second": totals["items"] / seconds if seconds > 0 else 0.0,
+                    "bytes_per_second": totals["bytes"] / seconds if seconds > 0 else 0.0,
+                }
+        return {"active": active, "recent": recent, "operations": operations}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._totals.clear()
+
+
+async def threaded_chunks(iterator: Iterator[bytes], max_queue: int) -> AsyncIterator[bytes]:
+    """
+    Run ``iterator`` in its own thread and yield its chunks on the event loop.
+
+    The thread blocks once ``max_queue`` chunks are waiting, which propagates
+    back-pressure from a slow client to the generator. The iterator is closed
+    from the producer thread, after its current ``next()`` returns.
+    """
+    loop = asyncio.get_running_loop()
+    chunks: "queue.Queue[Any]" = queue.Queue(max_queue)
+    ready = asyncio.Event()
+    stopped = threading.Event()
+    finished = loop.create_future()
+
+    def call_soon(callback) -> None:
+        try:
+            loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            pass  # The loop is already closed.
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                chunks.put(item, timeout=0.05)
+            except queue.Full:
+                continue
+            call_soon(ready.set)
+            return True
+        return False
+
+    def mark_finished() -> None:
+        if not finished.done():
+            finished.set_result(None)
+
+    def produce() -> None:
+        try:
+            for chunk in iterator:
+                if not put(chunk):
+                    break
+        except BaseException as exc:
+            put(_ProducerFailure(exc))
+        finally:
+            try:
+                close = getattr(iterator, "close", None)
+                if callable(close):
+                    close()
+            finally:
+                put(_END)
+                call_soon(mark_finished)
+
+    thread = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(produce,),
+        name="pytincture-bff-stream",
+        daemon=True,
+    )
+    thread.start()
+    try:
+        while True:
+            try:
+                item = chunks.get_nowait()
+            except queue.Empty:
+                ready.clear()
+                if chunks.empty():
+                    await ready.wait()
+                continue
+            if item is _END:
+                return
+            if isinstance(item, _ProducerFailure):
+                raise item.exc
+            yield item
+    finally:
+        stopped.set()
+        # Wait for the producer to close the generator so its cleanup has run.
+        with anyio.CancelScope(shield=True):
+            await finished
+
+
+async def coalesced_chunks(
+    source: AsyncIterator[bytes],
+    registry: BffStreamRegistry,
+    operation: str,
+    max_bytes: int,
+    max_delay: float,
+) -> AsyncIterator[bytes]:
+    """
+    Join chunks from ``source`` into writes of up to ``max_bytes``. A partial
+    write is flushed once its first chunk has waited ``max_delay`` seconds.
+    """
+    loop = asyncio.get_running_loop()
+    stats = registry.open(operation)
+    pending: Optional[asyncio.Future] = None
+    batch: List[bytes] = []
+    batch_bytes = 0
+    deadline: Optional[float] = None
+    outcome = "closed"
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(source.__anext__())
+            timeout = None if not batch else max(0.0, deadline - loop.time())
+            await asyncio.wait({pending}, timeout=timeout)
+            if pending.done():
+                completed, pending = pending, None
+                try:
+                    chunk = completed.result()
+                except StopAsyncIteration:
+                    outcome = "completed"
+                    if batch:
+                        stats.writes += 1
+                        yield b"".join(batch)
+                    return
+                batch.append(chunk)
+                batch_bytes += len(chunk)
+                stats.items += 1
+                stats.bytes += len(chunk)
+                if batch_bytes < max_bytes and max_delay > 0:
+                    if deadline is None:
+                        deadline = loop.time() + max_delay
+                    continue
+            if batch:
+                data = b"".join(batch)
+                batch, batch_bytes, deadline = [], 0, None
+                stats.writes += 1
+                yield data
+    finally:
+        with anyio.CancelScope(shield=True):
+            if pending is not None and not pending.done():
+                pending.cancel()
+                try:
+                    await pending
+                except (asyncio.CancelledError, Exception):
+                    pass
+            await source.aclose()
+        registry.close(stats, outcome)
+
+
+class BffSseStream:
+    """
+    One resumable Server-Sent Events stream.
+
+    A pump task drains the BFF generator into a ring buffer independently of
+    any connection, so a client that reconnects with ``Last-Event-ID`` is
+    served the events it missed instead of restarting the work. The pump never
+    runs more than ``buffer_events`` ahead of the slowest subscriber (or of
+    where the last one left off), so events a client may still need are not
+    overwritten; a resume that asks for events already gone gets a terminal
+    ``gap`` event. Once the last subscriber leaves, the stream is kept for the
+    resume window and then cancelled (or, if it already finished, forgotten).
+    Streams live in process memory, so only the worker that started a stream
+    can resume it.
+    """
+
+    def __init__(self, registry: "BffSseRegistry", stream_id: str, owner: str, on_cancel):
+        self.registry = registry
+        self.stream_id = stream_id
+        self.owner = owner
+        self.events: Deque[tuple] = deque(maxlen=registry.buffer_events)
+        self.last_seq = 0
+        self.finished = False
+        self.failed = False
+        self.subscribers = 0
+        # Sequence number each live subscriber has been sent, and the lowest
+        # one any client may still resume from.
+        self._positions: Dict[object, int] = {}
+        self._floor = 0
+        self._on_cancel = on_cancel
+        self._changed = asyncio.Event()
+        self._pump: Optional[asyncio.Task] = None
+        self._expiry: Optional[asyncio.TimerHandle] = None
+
+    def start(self, chunks: AsyncIterator[bytes], context: Optional[contextvars.Context] = None) -> None:
+        self._pump = asyncio.get_running_loop().create_task(self._run(chunks), context=context)
+        self._schedule_expiry()
+
+    async def _run(self, chunks: AsyncIterator[bytes]) -> None:
+        try:
+            async for chunk in chunks:
+                while self.last_seq - self._floor >= self.registry.buffer_events:
+                    await self._changed.wait()
+                self._append(chunk)
+        except asyncio.CancelledError:
+            self.failed = True
+        except Exception:
+            self.failed = True
+            logger.exception("BFF event stream %s failed", self.stream_id)
+        finally:
+            self.finished = True
+            self._notify()
+            with anyio.CancelScope(shield=True):
+                await chunks.aclose()
+
+    def _append(self, data: bytes) -> None:
+        self.last_seq += 1
+        event_id = f"{self.stream_id}.{self.last_seq}".encode("ascii")
+        lines = b"".join(b"data: " + line + b"\n" for line in data.split(b"\n"))
+        self.events.append((self.last_seq, b"id: " + event_id + b"\n" + lines + b"\n"))
+        self._notify()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def subscribe(self, after_seq: int = 0) -> AsyncIterator[bytes]:
+        """Yield framed events after ``after_seq``, then live events, keepalives, and a final ``end``."""
+        self.subscribers += 1
+        token = object()
+        self._advance(token, after_seq)
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        try:
+            yield f"retry: {self.registry.retry_ms}\n\n".encode("ascii")
+            seq = after_seq
+            while True:
+                while self.events and self.events[-1][0] > seq:
+                    index = seq + 1 - self.events[0][0]
+                    if index < 0:
+                        # Events this client has not seen were already dropped.
+                        yield b"event: gap\ndata: {}\n\n"
+                        return
+                    seq, frame = self.events[index]
+                    yield frame
+                    self._advance(token, seq)
+                if self.finished and seq >= self.last_seq:
+                    yield b"event: error\ndata: {}\n\n" if self.failed else b"event: end\ndata: {}\n\n"
+                    return
+                changed = self._changed
+                try:
+                    await asyncio.wait_for(changed.wait(), self.registry.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self.subscribers -= 1
+            # The floor stays where this subscriber left off until someone resumes.
+            self._positions.pop(token, None)
+            self._schedule_expiry()
+
+    def _advance(self, token: object, seq: int) -> None:
+        self._positions[token] = seq
+        floor = min(self._positions.values())
+        if floor != self._floor:
+            self._floor = floor
+            self._notify()
+
+    def _schedule_expiry(self) -> None:
+        if self.subscribers or self._expiry is not None:
+            return
+        self._expiry = asyncio.get_running_loop().call_later(
+            self.registry.resume_seconds, self._expire
+        )
+
+    def _expire(self) -> None:
+        self._expiry = None
+        if self.subscribers:
+            return
+        if not self.finished:
+            self._on_cancel()
+            self._pump.cancel()
+        self.registry._discard(self)
+
+
+class BffSseRegistry:
+    """Resumable event streams by id, bounded per stream by ``buffer_events``."""
+
+    def __init__(
+        self,
+        buffer_events: int = 512,
+        resume_seconds: float = 30.0,
+        keepalive_seconds: float = 15.0,
+        retry_ms: int = 1000,
+    ):
+        self.buffer_events = buffer_events
+        self.resume_seconds = resume_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.retry_ms = retry_ms
+        self._streams: Dict[str, BffSseStream] = {}
+
+    def create(
+        self,
+        owner: str,
+        chunks: AsyncIterator[bytes],
+        on_cancel=lambda: None,
+        context: Optional[contextvars.Context] = None,
+    ) -> BffSseStream:
+        stream = BffSseStream(self, secrets.token_urlsafe(16), owner, on_cancel)
+        self._streams[stream.stream_id] = stream
+        stream.start(chunks, context)
+        return stream
+
+    def resume(self, last_event_id: str, owner: str) -> Optional[tuple]:
+        """Return ``(stream, seq)`` for a ``Last-Event-ID`` issued to ``owner``, if still resumable."""
+        stream_id, _, seq = (last_event_id or "").strip().rpartition(".")
+        stream = self._streams.get(stream_id)
+        if stream is None or not hmac.compare_digest(stream.owner, owner) or not seq.isdigit():
+            return None
+        return stream, int(seq)
+
+    def _discard(self, stream: BffSseStream) -> None:
+        if self._streams.get(stream.stream_id) is stream:
+            del self._streams[stream.stream_id]
+
+    def stats(self) -> Dict[str, Any]:
+        streams = list(self._streams.values())
+        return {
+            "streams": len(streams),
+            "running": sum(not stream.finished for stream in streams),
+            "subscribers": sum(stream.subscribers for stream in streams),
+        }
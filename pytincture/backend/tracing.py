@@ -0,0 +1,291 @@
+"""
+Request-lifecycle spans compatible with OpenTelemetry.
+
+Spans follow the OpenTelemetry data model: W3C ``traceparent`` propagation,
+16-byte trace ids, 8-byte span ids, and OTLP/JSON export. They are written as
+JSON lines to a local file, posted to an OTLP/HTTP collector, or both. Spans
+end on the request path but are exported from a background thread in batches,
+so a slow exporter never delays a response. When the export queue is full,
+new spans are dropped and counted.
+"""
+import json
+import logging
+import queue
+import re
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("pytincture.tracing")
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_TRACE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+_CURRENT_SPAN: ContextVar[Optional["Span"]] = ContextVar("pytincture_current_span", default=None)
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """Return ``(trace_id, parent_span_id, sampled)`` from a W3C ``traceparent`` header."""
+    match = _TRACEPARENT.match((value or "").strip().lower())
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 1)
+
+
+def is_trace_id(value: Optional[str]) -> bool:
+    return bool(value) and _TRACE_ID.match(value) is not None and value != "0" * 32
+
+
+def current_span() -> Optional["Span"]:
+    return _CURRENT_SPAN.get()
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_span_id", "name", "kind",
+        "attributes", "start_ns", "end_ns", "status", "status_message",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_span_id: Optional[str] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = 0
+        self.status_message = ""
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str = "") -> None:
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or self.start_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status, "message": self.status_message} if self.status else {},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def otlp_payload(spans: Sequence[Span], service_name: str) -> Dict[str, Any]:
+    """Wrap spans in an OTLP/JSON ``ExportTraceServiceRequest``."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+            "scopeSpans": [{
+                "scope": {"name": "pytincture"},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]
+    }
+
+
+class FileSpanExporter:
+    """Append each batch as one OTLP/JSON line to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span], service_name: str) -> None:
+        line = json.dumps(otlp_payload(spans, service_name), separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+
+
+class OtlpHttpSpanExporter:
+    """POST batches to an OTLP/HTTP collector, for example ``http://localhost:4318/v1/traces``."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, spans: Sequence[Span], service_name: str) -> None:
+        body = json.dumps(otlp_payload(spans, service_name)).encode("utf-8")
+        request = urllib.request.Request(
+            self.endpoint, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to the exporters. A tracer without
+    exporters is disabled: ``start_trace`` and ``span`` yield ``None`` and
+    cost one attribute check.
+    """
+
+    def __init__(
+        self,
+        exporters: Sequence[Any] = (),
+        service_name: str = "pytincture",
+        max_queue: int = 2048,
+        batch_size: int = 256,
+        flush_seconds: float = 1.0,
+    ):
+        self.exporters = list(exporters)
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.dropped = 0
+        self._queue: "queue.Queue[Span]" = queue.Queue(max_queue)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    @contextmanager
+    def start_trace(
+        self,
+        name: str,
+        traceparent: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Optional[Span]]:
+        """
+        Open the server span for a request. It continues the caller's trace
+        from ``traceparent``; otherwise it starts one with ``trace_id`` (or a
+        random id). A caller that marked its trace unsampled gets no spans.
+        """
+        if not self.enabled:
+            yield None
+            return
+        parent = parse_traceparent(traceparent)
+        if parent is not None and not parent[2]:
+            yield None
+            return
+        if parent is not None:
+            trace_id, parent_span_id = parent[0], parent[1]
+        else:
+            trace_id = trace_id if is_trace_id(trace_id) else secrets.token_hex(16)
+            parent_span_id = None
+        with self._activate(Span(name, trace_id, parent_span_id, SPAN_KIND_SERVER, attributes)) as span:
+            yield span
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Open a child of the current span; a no-op outside a trace."""
+        parent = _CURRENT_SPAN.get()
+        if parent is None or not self.enabled:
+            yield None
+            return
+        with self._activate(Span(name, parent.trace_id, parent.span_id, attributes=attributes)) as span:
+            yield span
+
+    @contextmanager
+    def _activate(self, span: Span) -> Iterator[Span]:
+        token = _CURRENT_SPAN.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set_error(type(exc).__name__)
+            raise
+        finally:
+            _CURRENT_SPAN.reset(token)
+            span.end_ns = time.time_ns()
+            self._enqueue(span)
+
+    def _enqueue(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self._worker is None:
+            self._start_worker()
+
+    def _start_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="pytincture-trace-export", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_seconds)
+            except queue.Empty:
+                continue
+            self._export([first, *self._drain(self.batch_size - 1)])
+
+    def _drain(self, limit: int) -> List[Span]:
+        spans: List[Span] = []
+        while len(spans) < limit:
+            try:
+                spans.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return spans
+
+    def _export(self, spans: List[Span]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans, self.service_name)
+            except Exception:  # noqa: BLE001
+                logger.warning("Span export to %s failed", type(exporter).__name__, exc_info=True)
+
+    def flush(self) -> None:
+        """Export every queued span from the calling thread."""
+        while True:
+            spans = self._drain(self.batch_size)
+            if not spans:
+                return
+            self._export(spans)
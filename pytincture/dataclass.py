@@ -2,6 +2,8 @@ import ast
 from decimal import Subnormal
 import os
 import sys
+import threading
+from contextvars import ContextVar
 from typing import Optional, Set
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
@@ -92,7 +94,38 @@ def _module_relative_identifier(file_path: str) -> str:
     return rel_path
 
 
-def bff_stream(func=None, *, raw: bool = False, media_type: str = "text/event-stream"):
+class BffCancelled(Exception):
+    """Raised by :func:`bff_check_cancelled` once the caller has given up on a BFF call."""
+
+
+_CURRENT_CANCEL_TOKEN: ContextVar[Optional[threading.Event]] = ContextVar(
+    "pytincture_bff_cancel_token", default=None
+)
+
+
+def bff_cancel_token() -> Optional[threading.Event]:
+    """Return the cancellation token of the BFF call running in this context, if any."""
+    return _CURRENT_CANCEL_TOKEN.get()
+
+
+def bff_check_cancelled() -> None:
+    """
+    Raise :class:`BffCancelled` if the current BFF call timed out or its client
+    went away. Long-running synchronous methods should call this between units
+    of work; the token is also available as ``self._bff_cancel_token``.
+    """
+    token = _CURRENT_CANCEL_TOKEN.get()
+    if token is not None and token.is_set():
+        raise BffCancelled("BFF call was cancelled")
+
+
+def bff_stream(
+    func=None,
+    *,
+    raw: bool = False,
+    media_type: str = "text/event-stream",
+    sse: bool = False,
+):
     """
     Mark a backend_for_frontend method as streaming.
 
@@ -100,12 +133,16 @@ def bff_stream(func=None, *, raw: bool = False, media_type: str = "text/event-st
         raw: When False (default), streamed Python values will be JSON-encoded and newline-delimited.
              When True, values are forwarded as-is (strings/bytes recommended).
         media_type: Content type to advertise for the stream response.
+        sse: Frame the stream as Server-Sent Events with event IDs. The server
+             buffers recent events so a client reconnecting with ``Last-Event-ID``
+             resumes where it left off instead of restarting the method.
     """
 
     def _apply(target):
         setattr(target, "_bff_streaming", True)
         setattr(target, "_bff_streaming_raw", raw)
-        setattr(target, "_bff_streaming_media_type", media_type)
+        setattr(target, "_bff_streaming_media_type", "text/event-stream" if sse else media_type)
+        setattr(target, "_bff_streaming_sse", sse)
         return target
 
     if func is None:
@@ -149,6 +186,187 @@ def bff_http_methods(*methods: str):
     return _apply
 
 
+_BFF_CACHE_VARY_KEYS = ("user", "args")
+
+
+def _normalized_cache_config(ttl: Any, vary_on: Any) -> Dict[str, Any]:
+    try:
+        ttl_seconds = float(ttl)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("bff_cache ttl must be a number of seconds") from exc
+    if ttl_seconds <= 0:
+        raise ValueError("bff_cache ttl must be greater than zero")
+    if isinstance(vary_on, str):
+        vary_on = (vary_on,)
+    try:
+        vary = tuple(dict.fromkeys(str(key) for key in vary_on))
+    except TypeError as exc:
+        raise ValueError("bff_cache vary_on must be a sequence of names") from exc
+    if any(key not in _BFF_CACHE_VARY_KEYS for key in vary):
+        raise ValueError("bff_cache vary_on accepts only 'user' and 'args'")
+    return {"ttl": ttl_seconds, "vary_on": vary}
+
+
+def bff_cache(ttl: float = 60, vary_on=("user", "args")):
+    """Cache the result of a side-effect-free BFF method on the server.
+
+    Hits are answered by ``class_call`` before the module is imported or the
+    class is constructed. ``vary_on`` chooses what separates entries: ``"user"``
+    (the authenticated identity) and/or ``"args"`` (the call arguments).
+    Arguments must be literals so the cache is known from the static manifest.
+    """
+    config = _normalized_cache_config(ttl, vary_on)
+
+    def _apply(target):
+        setattr(target, "_bff_cache", config)
+        return target
+
+    return _apply
+
+
+def bff_http_cache(max_age: int = 0, private: bool = True):
+    """Let browsers revalidate the result of a GET BFF operation.
+
+    ``class_call`` answers with a weak ``ETag`` derived from the serialized
+    result and ``Cache-Control: private, max-age=<max_age>`` (or ``public``),
+    and replies ``304 Not Modified`` when ``If-None-Match`` still matches.
+    """
+    config = _normalized_http_cache_config(max_age, private)
+
+    def _apply(target):
+        setattr(target, "_bff_http_cache", config)
+        return target
+
+    return _apply
+
+
+def _normalized_executor_config(pool: Any, max_workers: Any, max_queue: Any) -> Dict[str, Any]:
+    if not isinstance(pool, str) or not pool.strip():
+        raise ValueError("bff_executor requires a pool name")
+    config: Dict[str, Any] = {"pool": pool.strip()}
+    if max_workers is not None:
+        if isinstance(max_workers, bool) or not isinstance(max_workers, int) or max_workers <= 0:
+            raise ValueError("bff_executor max_workers must be a positive integer")
+        config["max_workers"] = max_workers
+    if max_queue is not None:
+        if isinstance(max_queue, bool) or not isinstance(max_queue, int) or max_queue < 0:
+            raise ValueError("bff_executor max_queue must be a non-negative integer")
+        config["max_queue"] = max_queue
+    return config
+
+
+def bff_executor(pool: str, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+    """Run a class's or method's synchronous BFF calls in a dedicated thread pool.
+
+    Pools are shared by name. ``max_workers`` and ``max_queue`` size the pool
+    unless ``BFF_EXECUTOR_POOLS`` configures it; calls beyond both limits are
+    rejected with 503 instead of waiting.
+    """
+    config = _normalized_executor_config(pool, max_workers, max_queue)
+
+    def _apply(target):
+        setattr(target, "_bff_executor", config)
+        return target
+
+    return _apply
+
+
+_BFF_EXECUTION_MODES = ("thread", "process")
+
+
+def bff_execution(mode: str):
+    """Choose where a synchronous BFF method runs.
+
+    ``"thread"`` (the default) uses the BFF executor pools. ``"process"`` runs
+    the method in a warm worker process so CPU-bound work does not hold the
+    GIL of the web worker; arguments, results, and ``_user`` must be picklable.
+    """
+    if mode not in _BFF_EXECUTION_MODES:
+        raise ValueError("bff_execution mode must be 'thread' or 'process'")
+
+    def _apply(target):
+        setattr(target, "_bff_execution", mode)
+        return target
+
+    return _apply
+
+
+def _normalized_upload_config(param: Any, max_bytes: Any) -> Dict[str, Any]:
+    if not isinstance(param, str) or not param.isidentifier():
+        raise ValueError("bff_upload param must be a parameter name")
+    config: Dict[str, Any] = {"param": param}
+    if max_bytes is not None:
+        if isinstance(max_bytes, bool) or not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("bff_upload max_bytes must be a positive integer")
+        config["max_bytes"] = max_bytes
+    return config
+
+
+def bff_upload(param: str = "upload", max_bytes: Optional[int] = None):
+    """Receive the raw request body of a BFF method as a file-like object.
+
+    ``class_call`` streams the body into a temporary file, kept in memory up
+    to ``BFF_UPLOAD_SPOOL_BYTES``, and passes it as the ``param`` keyword
+    argument; query parameters become the other keyword arguments. The body
+    may be up to ``max_bytes`` (default ``BFF_UPLOAD_MAX_BYTES``) long, which
+    is independent of ``MAX_REQUEST_BODY_BYTES``.
+    """
+    config = _normalized_upload_config(param, max_bytes)
+
+    def _apply(target):
+        setattr(target, "_bff_upload", config)
+        return target
+
+    return _apply
+
+
+_BFF_RESULT_FORMATS = ("json", "arrow")
+
+
+def bff_result(format: str):
+    """Choose how a BFF method's result is encoded.
+
+    ``"arrow"`` sends tabular results (lists of dicts, dicts of columns, pandas
+    DataFrames, pyarrow tables, numpy record arrays) as an Arrow IPC stream to
+    clients that accept ``application/vnd.apache.arrow.stream`` and can load
+    pyarrow; everyone else receives the rows as JSON. Requires pyarrow on the
+    server for the binary encoding.
+    """
+    if format not in _BFF_RESULT_FORMATS:
+        raise ValueError("bff_result format must be 'json' or 'arrow'")
+
+    def _apply(target):
+        setattr(target, "_bff_result_format", format)
+        return target
+
+    return _apply
+
+
+def _normalized_http_cache_config(max_age: Any, private: Any) -> Dict[str, Any]:
+    if isinstance(max_age, bool) or not isinstance(max_age, int) or max_age < 0:
+        raise ValueError("bff_http_cache max_age must be a non-negative integer")
+    if not isinstance(private, bool):
+        raise ValueError("bff_http_cache private must be True or False")
+    return {"max_age": max_age, "private": private}
+
+
+def _literal_decorator_arguments(
+    decorator_node: ast.Call, decorator_name: str, parameter_names: tuple[str, ...]
+) -> Dict[str, Any]:
+    named_arguments = list(zip(parameter_names, decorator_node.args))
+    for keyword in decorator_node.keywords:
+        if keyword.arg not in parameter_names:
+            raise ValueError(f"{decorator_name} does not accept {keyword.arg!r}")
+        named_arguments.append((keyword.arg, keyword.value))
+    options: Dict[str, Any] = {}
+    for name, argument in named_arguments:
+        try:
+            options[name] = ast.literal_eval(argument)
+        except (ValueError, TypeError, SyntaxError) as exc:
+            raise ValueError(f"{decorator_name} arguments must be literal values") from exc
+    return options
+
+
 def _literal_keyword_metadata(
     decorators: list[ast.expr],
     *,
@@ -212,6 +430,120 @@ def _declared_http_methods(
     return ("POST",)
 
 
+def _find_decorator_call(
+    decorators: list[ast.expr],
+    name: str,
+    import_aliases: Set[str],
+    module_aliases: Set[str],
+    require_call: bool = True,
+) -> Optional[ast.expr]:
+    """Return the first ``name`` decorator, or None; a bare one is rejected when ``require_call``."""
+    for decorator in decorators:
+        matches, decorator_node = _decorator_matches(
+            decorator,
+            decorator_name=name,
+            import_aliases=import_aliases,
+            module_aliases=module_aliases,
+        )
+        if not matches:
+            continue
+        if require_call and not isinstance(decorator_node, ast.Call):
+            raise ValueError(f"{name} must be called with its options, for example @{name}(...)")
+        return decorator_node
+    return None
+
+
+def _declared_cache(
+    decorators: list[ast.expr],
+    *,
+    import_aliases: Set[str],
+    module_aliases: Set[str],
+) -> Optional[Dict[str, Any]]:
+    decorator_node = _find_decorator_call(decorators, "bff_cache", import_aliases, module_aliases)
+    if decorator_node is None:
+        return None
+    options: Dict[str, Any] = {"ttl": 60, "vary_on": _BFF_CACHE_VARY_KEYS}
+    options.update(_literal_decorator_arguments(decorator_node, "bff_cache", ("ttl", "vary_on")))
+    return _normalized_cache_config(options["ttl"], options["vary_on"])
+
+
+def _declared_executor(
+    decorators: list[ast.expr],
+    *,
+    import_aliases: Set[str],
+    module_aliases: Set[str],
+) -> Optional[Dict[str, Any]]:
+    decorator_node = _find_decorator_call(decorators, "bff_executor", import_aliases, module_aliases)
+    if decorator_node is None:
+        return None
+    options: Dict[str, Any] = {"pool": None, "max_workers": None, "max_queue": None}
+    options.update(
+        _literal_decorator_arguments(decorator_node, "bff_executor", ("pool", "max_workers", "max_queue"))
+    )
+    return _normalized_executor_config(options["pool"], options["max_workers"], options["max_queue"])
+
+
+def _declared_execution(
+    decorators: list[ast.expr],
+    *,
+    import_aliases: Set[str],
+    module_aliases: Set[str],
+) -> Optional[str]:
+    decorator_node = _find_decorator_call(decorators, "bff_execution", import_aliases, module_aliases)
+    if decorator_node is None:
+        return None
+    mode = _literal_decorator_arguments(decorator_node, "bff_execution", ("mode",)).get("mode")
+    if mode not in _BFF_EXECUTION_MODES:
+        raise ValueError("bff_execution mode must be 'thread' or 'process'")
+    return mode
+
+
+def _declared_http_cache(
+    decorators: list[ast.expr],
+    *,
+    import_aliases: Set[str],
+    module_aliases: Set[str],
+) -> Optional[Dict[str, Any]]:
+    decorator_node = _find_decorator_call(decorators, "bff_http_cache", import_aliases, module_aliases)
+    if decorator_node is None:
+        return None
+    options: Dict[str, Any] = {"max_age": 0, "private": True}
+    options.update(_literal_decorator_arguments(decorator_node, "bff_http_cache", ("max_age", "private")))
+    return _normalized_http_cache_config(options["max_age"], options["private"])
+
+
+def _declared_result_format(
+    decorators: list[ast.expr],
+    *,
+    import_aliases: Set[str],
+    module_aliases: Set[str],
+) -> Optional[str]:
+    decorator_node = _find_decorator_call(decorators, "bff_result", import_aliases, module_aliases)
+    if decorator_node is None:
+        return None
+    result_format = _literal_decorator_arguments(decorator_node, "bff_result", ("format",)).get("format")
+    if result_format not in _BFF_RESULT_FORMATS:
+        raise ValueError("bff_result format must be 'json' or 'arrow'")
+    return result_format
+
+
+def _declared_upload(
+    decorators: list[ast.expr],
+    *,
+    import_aliases: Set[str],
+    module_aliases: Set[str],
+) -> Optional[Dict[str, Any]]:
+    decorator_node = _find_decorator_call(
+        decorators, "bff_upload", import_aliases, module_aliases, require_call=False
+    )
+    if decorator_node is None:
+        return None
+    options: Dict[str, Any] = {"param": "upload", "max_bytes": None}
+    if isinstance(decorator_node, ast.Call):
+        options.update(_literal_decorator_arguments(decorator_node, "bff_upload", ("param", "max_bytes")))
+    return _normalized_upload_config(options["param"], options["max_bytes"])
+
+
 def get_bff_manifest(file_path: str) -> Dict[tuple[str, str], Dict[str, Any]]:
     """Statically discover exported BFF operations without importing app code."""
     with open(file_path, "r", encoding="utf-8") as source_file:
@@ -221,6 +553,13 @@ def get_bff_manifest(file_path: str) -> Dict[tuple[str, str], Dict[str, Any]]:
     bff_aliases = _collect_import_aliases(module, "backend_for_frontend")
     policy_aliases = _collect_import_aliases(module, "bff_policy")
     method_aliases = _collect_import_aliases(module, "bff_http_methods")
+    cache_aliases = _collect_import_aliases(module, "bff_cache")
+    stream_aliases = _collect_import_aliases(module, "bff_stream")
+    http_cache_aliases = _collect_import_aliases(module, "bff_http_cache")
+    executor_aliases = _collect_import_aliases(module, "bff_executor")
+    execution_aliases = _collect_import_aliases(module, "bff_execution")
+    upload_aliases = _collect_import_aliases(module, "bff_upload")
+    result_aliases = _collect_import_aliases(module, "bff_result")
     manifest: Dict[tuple[str, str], Dict[str, Any]] = {}
 
     for class_node in (node for node in module.body if isinstance(node, ast.ClassDef)):
@@ -242,10 +581,29 @@ def get_bff_manifest(file_path: str) -> Dict[tuple[str, str], Dict[str, Any]]:
             import_aliases=policy_aliases,
             module_aliases=module_aliases,
         )
+        class_executor = _declared_executor(
+            class_node.decorator_list,
+            import_aliases=executor_aliases,
+            module_aliases=module_aliases,
+        )
+        class_execution = _declared_execution(
+            class_node.decorator_list,
+            import_aliases=execution_aliases,
+            module_aliases=module_aliases,
+        )
         for member in class_node.body:
             if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 if member.name.startswith("_"):
                     continue
+                is_streaming = any(
+                    _decorator_matches(
+                        decorator,
+                        decorator_name="bff_stream",
+                        import_aliases=stream_aliases,
+                        module_aliases=module_aliases,
+                    )[0]
+                    for decorator in member.decorator_list
+                )
                 method_policy = _literal_keyword_metadata(
                     member.decorator_list,
                     decorator_name="bff_policy",
@@ -261,6 +619,70 @@ def get_bff_manifest(file_path: str) -> Dict[tuple[str, str], Dict[str, Any]]:
                     ),
                     "kind": "method",
                 }
+                cache_config = _declared_cache(
+                    member.decorator_list,
+                    import_aliases=cache_aliases,
+                    module_aliases=module_aliases,
+                )
+                if cache_config is not None:
+                    if is_streaming:
+                        raise ValueError("bff_cache cannot be combined with bff_stream")
+                    manifest[(class_node.name, member.name)]["cache"] = cache_config
+                http_cache_config = _declared_http_cache(
+                    member.decorator_list,
+                    import_aliases=http_cache_aliases,
+                    module_aliases=module_aliases,
+                )
+                if http_cache_config is not None:
+                    if "GET" not in manifest[(class_node.name, member.name)]["http_methods"]:
+                        raise ValueError("bff_http_cache requires @bff_http_methods(\"GET\")")
+                    manifest[(class_node.name, member.name)]["http_cache"] = http_cache_config
+                executor_config = _declared_executor(
+                    member.decorator_list,
+                    import_aliases=executor_aliases,
+                    module_aliases=module_aliases,
+                ) or class_executor
+                if executor_config is not None:
+                    manifest[(class_node.name, member.name)]["executor"] = dict(executor_config)
+                execution_mode = _declared_execution(
+                    member.decorator_list,
+                    import_aliases=execution_aliases,
+                    module_aliases=module_aliases,
+                ) or class_execution
+                if execution_mode == "process":
+                    if isinstance(member, ast.AsyncFunctionDef) or is_streaming:
+                        raise ValueError(
+                            "bff_execution('process') supports only synchronous, non-streaming methods"
+                        )
+                if execution_mode is not None:
+                    manifest[(class_node.name, member.name)]["execution"] = execution_mode
+                upload_config = _declared_upload(
+                    member.decorator_list,
+                    import_aliases=upload_aliases,
+                    module_aliases=module_aliases,
+                )
+                if upload_config is not None:
+                    operation = manifest[(class_node.name, member.name)]
+                    if is_streaming or "cache" in operation or execution_mode == "process":
+                        raise ValueError(
+                            "bff_upload cannot be combined with bff_stream, bff_cache, or process execution"
+                        )
+                    if "GET" in operation["http_methods"]:
+                        raise ValueError("bff_upload requires a method with a request body")
+                    operation["upload"] = upload_config
+                result_format = _declared_result_format(
+                    member.decorator_list,
+                    import_aliases=result_aliases,
+                    module_aliases=module_aliases,
+                )
+                if result_format == "arrow":
+                    if is_streaming:
+                        raise ValueError("bff_result('arrow') cannot be combined with bff_stream")
+                    manifest[(class_node.name, member.name)]["result_format"] = result_format
+                if "cache" in manifest[(class_node.name, member.name)] and (
+                    result_format == "arrow" or _returns_binary(member)
+                ):
+                    raise ValueError("bff_cache cannot be combined with binary or arrow results")
             elif isinstance(member, (ast.Assign, ast.AnnAssign)):
                 targets = member.targets if isinstance(member, ast.Assign) else [member.target]
                 for target in targets:
@@ -352,7 +774,10 @@ def backend_for_frontend(cls):
             streaming_enabled = getattr(method, "_bff_streaming", False)
             streaming_raw = getattr(method, "_bff_streaming_raw", False)
             streaming_media_type = getattr(method, "_bff_streaming_media_type", "text/event-stream")
+            streaming_sse = getattr(method, "_bff_streaming_sse", False)
             declared_http_methods = getattr(method, "_bff_http_methods", ("POST",))
+            upload_config = getattr(method, "_bff_upload", None)
+            result_format = getattr(method, "_bff_result_format", "json")
 
             # Create list of parameters in order (excluding self)
             param_list = [
@@ -430,6 +855,11 @@ def backend_for_frontend(cls):
                 operation_spec['x-bff-streaming'] = True
                 operation_spec['x-bff-streaming-raw'] = streaming_raw
                 operation_spec['x-bff-streaming-media-type'] = streaming_media_type
+                operation_spec['x-bff-streaming-sse'] = streaming_sse
+            if upload_config:
+                operation_spec['x-bff-upload'] = dict(upload_config)
+            if result_format != "json":
+                operation_spec['x-bff-result-format'] = result_format
             
             # Add example if we have parameters
             if param_list:
@@ -463,6 +893,7 @@ def backend_for_frontend(cls):
     class BackendForFrontendWrapper:
         def __init__(self, *args, **kwargs):
             self._user = kwargs.pop('_user', None)
+            self._bff_cancel_token = kwargs.pop('_bff_cancel_token', None) or threading.Event()
             constructor_kwargs = dict(kwargs)
             constructor_args = list(args)
             user_parameter = _constructor_accepts_user_argument(cls)
@@ -476,6 +907,10 @@ def backend_for_frontend(cls):
             self._real_instance = cls(*constructor_args, **constructor_kwargs)
             if self._user is not None and user_parameter is None:
                 setattr(self._real_instance, '_user', self._user)
+            try:
+                setattr(self._real_instance, '_bff_cancel_token', self._bff_cancel_token)
+            except AttributeError:
+                pass  # Classes with __slots__ can still use bff_check_cancelled().
 
         def __getattr__(self, item):
             return getattr(self._real_instance, item)
@@ -599,6 +1034,21 @@ def get_imports_used_in_class(file_path, class_name):
 
     return import_lines, imports_used
 
+_BINARY_RETURN_NAMES = {"bytes", "bytearray", "memoryview", "Path", "PurePath", "BinaryIO"}
+
+
+def _returns_binary(node: ast.AST) -> bool:
+    """Whether a method's return annotation declares a binary result."""
+    returns = getattr(node, "returns", None)
+    if isinstance(returns, ast.Constant) and isinstance(returns.value, str):
+        return returns.value.rsplit(".", 1)[-1] in _BINARY_RETURN_NAMES
+    if isinstance(returns, ast.Name):
+        return returns.id in _BINARY_RETURN_NAMES
+    if isinstance(returns, ast.Attribute):
+        return returns.attr in _BINARY_RETURN_NAMES
+    return False
+
+
 def generate_stub_classes(file_path, return_url, return_protocol, replay_client=None):
     with open(file_path, 'r') as file:
         code = file.read()
@@ -608,6 +1058,8 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
     backend_for_frontend_aliases = _collect_import_aliases(module, "backend_for_frontend")
     bff_stream_aliases = _collect_import_aliases(module, "bff_stream")
     bff_http_method_aliases = _collect_import_aliases(module, "bff_http_methods")
+    bff_upload_aliases = _collect_import_aliases(module, "bff_upload")
+    bff_result_aliases = _collect_import_aliases(module, "bff_result")
     module_aliases = _collect_module_aliases(module)
     class_nodes = [node for node in module.body if isinstance(node, ast.ClassDef)]
     replay_enabled = bool(replay_client)
@@ -615,6 +1067,11 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
     replay_key = tuple((replay_client or {}).get("key", b""))
     replay_low_watermark = int(os.getenv("BFF_REPLAY_TOKEN_LOW_WATERMARK", "3"))
     replay_state_url = f"{return_protocol}://{return_url}/_pytincture/state"
+    coalesce_ms = float(os.getenv("BFF_STUB_COALESCE_MS", "0"))
+    coalesce_max_calls = int(os.getenv("BFF_BATCH_MAX_CALLS", "50"))
+    use_websocket = os.getenv("ENABLE_BFF_WEBSOCKET", "false").lower() == "true"
+    use_tracing = os.getenv("ENABLE_BFF_TRACING", "false").lower() == "true"
+    websocket_url = f"{'wss' if return_protocol == 'https' else 'ws'}://{return_url}/classcall/_ws"
 
     decorated_class_nodes = [
         node for node in class_nodes
@@ -639,7 +1096,8 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
     def _extract_stream_config(decorator_call):
         config = {
             "raw": False,
-            "media_type": "text/event-stream"
+            "media_type": "text/event-stream",
+            "sse": False,
         }
         if not isinstance(decorator_call, ast.Call):
             return config
@@ -648,8 +1106,222 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
                 config["raw"] = bool(keyword.value.value)
             if keyword.arg == "media_type" and isinstance(keyword.value, ast.Constant):
                 config["media_type"] = str(keyword.value.value)
+            if keyword.arg == "sse" and isinstance(keyword.value, ast.Constant):
+                config["sse"] = bool(keyword.value.value)
         return config
 
+    batch_url = f"{return_protocol}://{return_url}/classcall/_batch"
+    uses_sse = False
+    uses_arrow = False
+
+    # Batches queue calls from any stub in this module and send them as one
+    # POST to /classcall/_batch when the ``with`` block exits.
+    stub_class_code += "\nclass _PytinctureBatchResult:\n"
+    stub_class_code += "    def __init__(self):\n"
+    stub_class_code += "        self._done = False\n"
+    stub_class_code += "        self._value = None\n"
+    stub_class_code += "        self._status = None\n"
+    stub_class_code += "        self._error = None\n"
+    stub_class_code += "    def result(self):\n"
+    stub_class_code += "        if not self._done:\n"
+    stub_class_code += "            raise RuntimeError('BFF batch has not been sent')\n"
+    stub_class_code += "        if self._status != 200:\n"
+    stub_class_code += "            raise RuntimeError(f'BFF call failed ({self._status}): {self._error}')\n"
+    stub_class_code += "        return self._value\n"
+    stub_class_code += "\nclass _PytinctureBatch:\n"
+    stub_class_code += "    def __init__(self, client):\n"
+    stub_class_code += "        self._client = client\n"
+    stub_class_code += "        self._calls = []\n"
+    stub_class_code += "        self._results = []\n"
+    stub_class_code += "    def call(self, stub, name, *args, **kwargs):\n"
+    stub_class_code += "        self._calls.append({'file': stub._pytincture_file, 'class': stub._pytincture_class, 'function': name, 'args': list(args), 'kwargs': kwargs})\n"
+    stub_class_code += "        pending = _PytinctureBatchResult()\n"
+    stub_class_code += "        self._results.append(pending)\n"
+    stub_class_code += "        return pending\n"
+    stub_class_code += "    def __getattr__(self, name):\n"
+    stub_class_code += "        if name.startswith('_'):\n"
+    stub_class_code += "            raise AttributeError(name)\n"
+    stub_class_code += "        def queue(*args, **kwargs):\n"
+    stub_class_code += "            return self.call(self._client, name, *args, **kwargs)\n"
+    stub_class_code += "        return queue\n"
+    stub_class_code += "    def _take(self):\n"
+    stub_class_code += "        calls, results = self._calls, self._results\n"
+    stub_class_code += "        self._calls, self._results = [], []\n"
+    stub_class_code += "        return calls, results\n"
+    stub_class_code += "    def _resolve(self, results, response):\n"
+    stub_class_code += "        items = json.loads(response).get('results', []) if response else []\n"
+    stub_class_code += "        for index, pending in enumerate(results):\n"
+    stub_class_code += "            item = items[index] if index < len(items) else {'status': 0, 'error': 'No response'}\n"
+    stub_class_code += "            pending._done = True\n"
+    stub_class_code += "            pending._status = item.get('status')\n"
+    stub_class_code += "            pending._value = item.get('result')\n"
+    stub_class_code += "            pending._error = item.get('error')\n"
+    stub_class_code += "    def send(self):\n"
+    stub_class_code += "        calls, results = self._take()\n"
+    stub_class_code += "        if calls:\n"
+    stub_class_code += "            self._resolve(results, self._client.fetch_sync(self._client._pytincture_batch_url, {'calls': calls}, 'POST'))\n"
+    stub_class_code += "    async def send_async(self):\n"
+    stub_class_code += "        calls, results = self._take()\n"
+    stub_class_code += "        if calls:\n"
+    stub_class_code += "            self._resolve(results, await self._client.fetch(self._client._pytincture_batch_url, {'calls': calls}, 'POST'))\n"
+    stub_class_code += "    def __enter__(self):\n"
+    stub_class_code += "        return self\n"
+    stub_class_code += "    def __exit__(self, exc_type, exc, tb):\n"
+    stub_class_code += "        if exc_type is None:\n"
+    stub_class_code += "            self.send()\n"
+    stub_class_code += "        return False\n"
+    stub_class_code += "    async def __aenter__(self):\n"
+    stub_class_code += "        return self\n"
+    stub_class_code += "    async def __aexit__(self, exc_type, exc, tb):\n"
+    stub_class_code += "        if exc_type is None:\n"
+    stub_class_code += "            await self.send_async()\n"
+    stub_class_code += "        return False\n"
+
+    if coalesce_ms > 0:
+        # Opt-in micro-batching: async calls issued within the window share one
+        # /classcall/_batch request and each awaiting caller gets its own result.
+        stub_class_code += f"\n_pytincture_coalesce_window = {coalesce_ms / 1000.0!r}\n"
+        stub_class_code += f"_pytincture_coalesce_max = {coalesce_max_calls!r}\n"
+        stub_class_code += "_pytincture_coalesce_queue = []\n"
+        stub_class_code += "async def _pytincture_coalesce_flush():\n"
+        stub_class_code += "    pending = list(_pytincture_coalesce_queue)\n"
+        stub_class_code += "    _pytincture_coalesce_queue.clear()\n"
+        stub_class_code += "    if not pending:\n"
+        stub_class_code += "        return\n"
+        stub_class_code += "    client = pending[0][0]\n"
+        stub_class_code += "    try:\n"
+        stub_class_code += "        if len(pending) == 1:\n"
+        stub_class_code += "            _, call, url, method, future = pending[0]\n"
+        stub_class_code += "            # Raise on failure as a shared window does, whatever the timing.\n"
+        stub_class_code += "            response = await client.fetch(url, {'args': call['args'], 'kwargs': call['kwargs']}, method, raise_for_status=True)\n"
+        stub_class_code += "            if not future.done():\n"
+        stub_class_code += "                future.set_result(response if isinstance(response, bytes) else json.loads(response))\n"
+        stub_class_code += "            return\n"
+        stub_class_code += "        response = await client.fetch(client._pytincture_batch_url, {'calls': [entry[1] for entry in pending]}, 'POST')\n"
+        stub_class_code += "        items = json.loads(response).get('results', []) if response else []\n"
+        stub_class_code += "    except Exception as exc:\n"
+        stub_class_code += "        for entry in pending:\n"
+        stub_class_code += "            if not entry[4].done():\n"
+        stub_class_code += "                entry[4].set_exception(exc)\n"
+        stub_class_code += "        return\n"
+        stub_class_code += "    for index, entry in enumerate(pending):\n"
+        stub_class_code += "        future = entry[4]\n"
+        stub_class_code += "        if future.done():\n"
+        stub_class_code += "            continue\n"
+        stub_class_code += "        item = items[index] if index < len(items) else {'status': 0, 'error': 'No response'}\n"
+        stub_class_code += "        if item.get('status') == 200:\n"
+        stub_class_code += "            future.set_result(item.get('result'))\n"
+        stub_class_code += "        else:\n"
+        stub_class_code += "            future.set_exception(RuntimeError(f\"BFF call failed ({item.get('status')}): {item.get('error')}\"))\n"
+        stub_class_code += "async def _pytincture_coalesced(stub, name, url, method, args, kwargs):\n"
+        stub_class_code += "    import asyncio\n"
+        stub_class_code += "    loop = asyncio.get_running_loop()\n"
+        stub_class_code += "    future = loop.create_future()\n"
+        stub_class_code += "    call = {'file': stub._pytincture_file, 'class': stub._pytincture_class, 'function': name, 'args': list(args), 'kwargs': kwargs}\n"
+        stub_class_code += "    _pytincture_coalesce_queue.append((stub, call, url, method, future))\n"
+        stub_class_code += "    if len(_pytincture_coalesce_queue) >= _pytincture_coalesce_max:\n"
+        stub_class_code += "        asyncio.ensure_future(_pytincture_coalesce_flush())\n"
+        stub_class_code += "    elif len(_pytincture_coalesce_queue) == 1:\n"
+        stub_class_code += "        loop.call_later(_pytincture_coalesce_window, lambda: asyncio.ensure_future(_pytincture_coalesce_flush()))\n"
+        stub_class_code += "    return await future\n"
+
+    if use_websocket:
+        # One shared socket multiplexes async and streaming calls by message
+        # id. Calls fall back to HTTP while the socket cannot be opened.
+        stub_class_code += "\nclass _PytinctureSocket:\n"
+        stub_class_code += "    def __init__(self, url):\n"
+        stub_class_code += "        self._url = url\n"
+        stub_class_code += "        self._socket = None\n"
+        stub_class_code += "        self._opened = None\n"
+        stub_class_code += "        self._failed = False\n"
+        stub_class_code += "        self._next_id = 0\n"
+        stub_class_code += "        self._pending = {}\n"
+        stub_class_code += "        self._proxies = []\n"
+        stub_class_code += "    async def _connect(self, stub):\n"
+        stub_class_code += "        import asyncio\n"
+        stub_class_code += "        if self._failed:\n"
+        stub_class_code += "            return None\n"
+        stub_class_code += "        if self._socket is None:\n"
+        stub_class_code += "            from js import WebSocket\n"
+        stub_class_code += "            from pyodide.ffi import create_proxy\n"
+        stub_class_code += "            for proxy in self._proxies:\n"
+        stub_class_code += "                proxy.destroy()\n"
+        stub_class_code += "            self._opened = asyncio.get_running_loop().create_future()\n"
+        stub_class_code += "            self._socket = WebSocket.new(self._url + '?csrf=' + stub._csrf_token())\n"
+        stub_class_code += "            self._proxies = [create_proxy(self._on_open), create_proxy(self._on_message), create_proxy(self._on_close)]\n"
+        stub_class_code += "            self._socket.onopen, self._socket.onmessage, self._socket.onclose = self._proxies\n"
+        stub_class_code += "        socket = self._socket\n"
+        stub_class_code += "        return socket if await self._opened else None\n"
+        stub_class_code += "    def _on_open(self, event):\n"
+        stub_class_code += "        if not self._opened.done():\n"
+        stub_class_code += "            self._opened.set_result(True)\n"
+        stub_class_code += "    def _on_message(self, event):\n"
+        stub_class_code += "        message = json.loads(str(event.data))\n"
+        stub_class_code += "        queue = self._pending.get(message.get('id'))\n"
+        stub_class_code += "        if queue is not None:\n"
+        stub_class_code += "            queue.put_nowait(message)\n"
+        stub_class_code += "    def _on_close(self, event):\n"
+        stub_class_code += "        if not self._opened.done():\n"
+        stub_class_code += "            # Rejected at the handshake or unsupported: stay on HTTP.\n"
+        stub_class_code += "            self._failed = True\n"
+        stub_class_code += "            self._opened.set_result(False)\n"
+        stub_class_code += "        self._socket = None\n"
+        stub_class_code += "        pending, self._pending = self._pending, {}\n"
+        stub_class_code += "        for queue in pending.values():\n"
+        stub_class_code += "            queue.put_nowait({'type': 'error', 'status': 0, 'error': 'BFF socket closed'})\n"
+        stub_class_code += "    async def _send_call(self, stub, name, args, kwargs):\n"
+        stub_class_code += "        import asyncio\n"
+        stub_class_code += "        socket = await self._connect(stub)\n"
+        stub_class_code += "        if socket is None:\n"
+        stub_class_code += "            return None, None\n"
+        stub_class_code += "        self._next_id += 1\n"
+        stub_class_code += "        call_id, queue = self._next_id, asyncio.Queue()\n"
+        stub_class_code += "        self._pending[call_id] = queue\n"
+        stub_class_code += "        socket.send(json.dumps({'id': call_id, 'type': 'call', 'file': stub._pytincture_file, 'class': stub._pytincture_class, 'function': name, 'args': list(args), 'kwargs': kwargs}))\n"
+        stub_class_code += "        return call_id, queue\n"
+        stub_class_code += "    def _release(self, call_id, finished):\n"
+        stub_class_code += "        self._pending.pop(call_id, None)\n"
+        stub_class_code += "        if not finished and self._socket is not None:\n"
+        stub_class_code += "            self._socket.send(json.dumps({'id': call_id, 'type': 'cancel'}))\n"
+        stub_class_code += "    def _raise_error(self, message):\n"
+        stub_class_code += "        if message.get('status') == 0:\n"
+        stub_class_code += "            raise ConnectionError(message.get('error'))\n"
+        stub_class_code += "        raise RuntimeError(f\"BFF call failed ({message.get('status')}): {message.get('error')}\")\n"
+        stub_class_code += "    async def call(self, stub, name, args, kwargs, fallback):\n"
+        stub_class_code += "        call_id, queue = await self._send_call(stub, name, args, kwargs)\n"
+        stub_class_code += "        if queue is None:\n"
+        stub_class_code += "            return await fallback()\n"
+        stub_class_code += "        message = None\n"
+        stub_class_code += "        try:\n"
+        stub_class_code += "            message = await queue.get()\n"
+        stub_class_code += "        finally:\n"
+        stub_class_code += "            self._release(call_id, message is not None)\n"
+        stub_class_code += "        if message.get('type') != 'result':\n"
+        stub_class_code += "            self._raise_error(message)\n"
+        stub_class_code += "        if 'binary' in message:\n"
+        stub_class_code += "            return base64.b64decode(message['binary'])\n"
+        stub_class_code += "        return message.get('result')\n"
+        stub_class_code += "    async def stream(self, stub, name, args, kwargs, fallback):\n"
+        stub_class_code += "        call_id, queue = await self._send_call(stub, name, args, kwargs)\n"
+        stub_class_code += "        if queue is None:\n"
+        stub_class_code += "            async for chunk in fallback():\n"
+        stub_class_code += "                yield chunk\n"
+        stub_class_code += "            return\n"
+        stub_class_code += "        finished = False\n"
+        stub_class_code += "        try:\n"
+        stub_class_code += "            while True:\n"
+        stub_class_code += "                message = await queue.get()\n"
+        stub_class_code += "                if message.get('type') == 'chunk':\n"
+        stub_class_code += "                    yield message.get('data', '')\n"
+        stub_class_code += "                    continue\n"
+        stub_class_code += "                finished = True\n"
+        stub_class_code += "                if message.get('type') == 'error':\n"
+        stub_class_code += "                    self._raise_error(message)\n"
+        stub_class_code += "                return\n"
+        stub_class_code += "        finally:\n"
+        stub_class_code += "            self._release(call_id, finished)\n"
+        stub_class_code += f"_pytincture_socket = _PytinctureSocket({websocket_url!r})\n"
+
     for class_node in class_nodes:
         class_name = class_node.name
 
@@ -665,11 +1337,15 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
             _, used_imports = get_imports_used_in_class(file_path, class_name)
             class_imports.update(used_imports)
             stub_class_code += f"\nclass {class_name}:\n"
+            stub_class_code += f"    _pytincture_file = {file_identifier!r}\n"
+            stub_class_code += f"    _pytincture_class = {class_name!r}\n"
+            stub_class_code += f"    _pytincture_batch_url = {batch_url!r}\n"
             stub_class_code += f"    _pytincture_replay_enabled = {replay_enabled!r}\n"
             stub_class_code += f"    _pytincture_replay_capsule = {replay_capsule!r}\n"
             stub_class_code += f"    _pytincture_replay_key = {replay_key!r}\n"
             stub_class_code += f"    _pytincture_replay_low = {replay_low_watermark!r}\n"
             stub_class_code += "    _pytincture_replay_pool = []\n"
+            stub_class_code += "    _pytincture_etags = {}\n"
             stub_class_code += "    def _csrf_token(self):\n"
             stub_class_code += "        for cookie in str(document.cookie).split(';'):\n"
             stub_class_code += "            name, separator, value = cookie.strip().partition('=')\n"
@@ -726,22 +1402,31 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
             stub_class_code += "        if not self._pytincture_replay_pool:\n"
             stub_class_code += "            await self._refill_pytincture_state()\n"
             stub_class_code += "        return self._pytincture_replay_pool.pop()\n"
-            stub_class_code += "    def fetch_sync(self, url, payload=None, method='GET', _replay_retry=True):\n"
+            stub_class_code += "    def fetch_sync(self, url, payload=None, method='GET', _replay_retry=True, binary=False, accept=None):\n"
             stub_class_code += "        replay_token = self._take_pytincture_state_sync()\n"
             stub_class_code += "        req = XMLHttpRequest.new()\n"
             stub_class_code += "        req.open(method, url, False)\n"
             stub_class_code += "        req.setRequestHeader('Content-Type', 'application/json')\n"
+            if use_tracing:
+                stub_class_code += "        req.setRequestHeader('traceparent', _pytincture_traceparent())\n"
             stub_class_code += "        if method != 'GET':\n"
             stub_class_code += "            req.setRequestHeader('X-CSRF-Token', self._csrf_token())\n"
             stub_class_code += "        if replay_token:\n"
             stub_class_code += "            req.setRequestHeader('X-Pytincture-BFF-Token', replay_token)\n"
+            stub_class_code += "        remembered = self._pytincture_etags.get(url) if method == 'GET' else None\n"
+            stub_class_code += "        if remembered:\n"
+            stub_class_code += "            req.setRequestHeader('If-None-Match', remembered[0])\n"
+            stub_class_code += "        if binary:\n"
+            stub_class_code += "            req.overrideMimeType('text/plain; charset=x-user-defined')\n"
+            stub_class_code += "        if accept:\n"
+            stub_class_code += "            req.setRequestHeader('Accept', accept)\n"
             stub_class_code += "        if payload and method != 'GET':\n"
             stub_class_code += "            req.send(JSON.stringify(json.dumps(payload)))\n"
             stub_class_code += "        else:\n"
             stub_class_code += "            req.send()\n"
             stub_class_code += "        if _replay_retry and req.status == 409 and str(req.getResponseHeader('X-Pytincture-Replay')) == 'rejected':\n"
             stub_class_code += "            self._pytincture_replay_pool.clear()\n"
-            stub_class_code += "            return self.fetch_sync(url, payload, method, False)\n"
+            stub_class_code += "            return self.fetch_sync(url, payload, method, False, binary, accept)\n"
             stub_class_code += f"        if req.status == 401:\n"
             stub_class_code += f"            from js import window\n"
             stub_class_code += f"            current_url = window.location.href.rstrip('/')\n"
@@ -750,23 +1435,37 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
             stub_class_code += f"            return ''\n"
             stub_class_code += "        if self._pytincture_replay_enabled and len(self._pytincture_replay_pool) <= self._pytincture_replay_low:\n"
             stub_class_code += "            self._refill_pytincture_state_sync()\n"
-            stub_class_code += f"        return StringIO(req.response).getvalue()\n"
+            stub_class_code += "        if remembered and req.status == 304:\n"
+            stub_class_code += "            return remembered[1]\n"
+            stub_class_code += "        if binary and str(req.getResponseHeader('X-Pytincture-Result')) in ('binary', 'arrow'):\n"
+            stub_class_code += "            # x-user-defined maps bytes 0x80-0xFF to U+F780-U+F7FF.\n"
+            stub_class_code += "            return str(req.responseText).translate({0xF700 + byte: byte for byte in range(0x80, 0x100)}).encode('latin-1')\n"
+            stub_class_code += "        body = StringIO(req.response).getvalue()\n"
+            stub_class_code += "        etag = req.getResponseHeader('ETag') if method == 'GET' and req.status == 200 else None\n"
+            stub_class_code += "        if etag:\n"
+            stub_class_code += "            self._pytincture_etags[url] = (str(etag), body)\n"
+            stub_class_code += "        return body\n"
             stub_class_code += f"\n"
-            stub_class_code += f"    async def fetch(self, url, payload=None, method='GET', _replay_retry=True):\n"
+            stub_class_code += f"    async def fetch(self, url, payload=None, method='GET', _replay_retry=True, raise_for_status=False):\n"
             stub_class_code += f"        from js import fetch, JSON, window\n"
             stub_class_code += f"        from pyodide.ffi import to_js\n"
             stub_class_code += f"        options = {{'method': method, 'headers': {{'Content-Type': 'application/json'}}}}\n"
+            if use_tracing:
+                stub_class_code += "        options['headers']['traceparent'] = _pytincture_traceparent()\n"
             stub_class_code += "        replay_token = await self._take_pytincture_state()\n"
             stub_class_code += f"        if method != 'GET':\n"
             stub_class_code += f"            options['headers']['X-CSRF-Token'] = self._csrf_token()\n"
             stub_class_code += "        if replay_token:\n"
             stub_class_code += "            options['headers']['X-Pytincture-BFF-Token'] = replay_token\n"
+            stub_class_code += "        remembered = self._pytincture_etags.get(url) if method == 'GET' else None\n"
+            stub_class_code += "        if remembered:\n"
+            stub_class_code += "            options['headers']['If-None-Match'] = remembered[0]\n"
             stub_class_code += f"        if payload is not None and method != 'GET':\n"
             stub_class_code += f"            options['body'] = JSON.stringify(json.dumps(payload))\n"
             stub_class_code += f"        response = await fetch(url, to_js(options))\n"
             stub_class_code += "        if _replay_retry and response.status == 409 and response.headers.get('X-Pytincture-Replay') == 'rejected':\n"
             stub_class_code += "            self._pytincture_replay_pool.clear()\n"
-            stub_class_code += "            return await self.fetch(url, payload, method, False)\n"
+            stub_class_code += "            return await self.fetch(url, payload, method, False, raise_for_status)\n"
             stub_class_code += f"        if response.status == 401:\n"
             stub_class_code += f"            current_url = window.location.href.rstrip('/')\n"
             stub_class_code += f"            redirect_url = current_url + '/login'\n"
@@ -774,7 +1473,24 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
             stub_class_code += f"            return ''\n"
             stub_class_code += "        if self._pytincture_replay_enabled and len(self._pytincture_replay_pool) <= self._pytincture_replay_low:\n"
             stub_class_code += "            await self._refill_pytincture_state()\n"
-            stub_class_code += f"        return await response.text()\n"
+            stub_class_code += "        if remembered and response.status == 304:\n"
+            stub_class_code += "            return remembered[1]\n"
+            stub_class_code += "        if raise_for_status and response.status >= 400:\n"
+            stub_class_code += "            detail = await response.text()\n"
+            stub_class_code += "            try:\n"
+            stub_class_code += "                detail = json.loads(detail).get('detail', detail)\n"
+            stub_class_code += "            except (ValueError, AttributeError):\n"
+            stub_class_code += "                pass\n"
+            stub_class_code += "            raise RuntimeError(f'BFF call failed ({response.status}): {detail}')\n"
+            stub_class_code += "        if response.headers.get('X-Pytincture-Result') == 'binary':\n"
+            stub_class_code += "            return (await response.arrayBuffer()).to_bytes()\n"
+            stub_class_code += "        body = await response.text()\n"
+            stub_class_code += "        etag = response.headers.get('ETag') if method == 'GET' and response.status == 200 else None\n"
+            stub_class_code += "        if etag:\n"
+            stub_class_code += "            self._pytincture_etags[url] = (str(etag), body)\n"
+            stub_class_code += "        return body\n"
+            stub_class_code += "    def batch(self):\n"
+            stub_class_code += "        return _PytinctureBatch(self)\n"
 
             streaming_methods = {}
             for node in class_node.body:
@@ -791,20 +1507,24 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
                             break
 
             if streaming_methods:
-                stub_class_code += f"    async def fetch_stream(self, url, payload=None, method='GET', _replay_retry=True):\n"
+                stub_class_code += f"    async def fetch_stream(self, url, payload=None, method='GET', _replay_retry=True, last_event_id=None, raise_for_status=False):\n"
                 stub_class_code += f"        from js import fetch, TextDecoder\n"
                 stub_class_code += f"        from pyodide.ffi import to_js\n"
                 stub_class_code += f"        options = {{'method': method, 'headers': {{'Content-Type': 'application/json'}}}}\n"
+                if use_tracing:
+                    stub_class_code += "        options['headers']['traceparent'] = _pytincture_traceparent()\n"
                 stub_class_code += "        replay_token = await self._take_pytincture_state()\n"
                 stub_class_code += f"        options['headers']['X-CSRF-Token'] = self._csrf_token()\n"
                 stub_class_code += "        if replay_token:\n"
                 stub_class_code += "            options['headers']['X-Pytincture-BFF-Token'] = replay_token\n"
+                stub_class_code += "        if last_event_id:\n"
+                stub_class_code += "            options['headers']['Last-Event-ID'] = last_event_id\n"
                 stub_class_code += f"        body_payload = payload if payload is not None else {{'args': [], 'kwargs': {{}}}}\n"
                 stub_class_code += f"        options['body'] = JSON.stringify(json.dumps(body_payload))\n"
                 stub_class_code += f"        response = await fetch(url, to_js(options))\n"
                 stub_class_code += "        if _replay_retry and response.status == 409 and response.headers.get('X-Pytincture-Replay') == 'rejected':\n"
                 stub_class_code += "            self._pytincture_replay_pool.clear()\n"
-                stub_class_code += "            async for retry_chunk in self.fetch_stream(url, payload, method, False):\n"
+                stub_class_code += "            async for retry_chunk in self.fetch_stream(url, payload, method, False, last_event_id, raise_for_status):\n"
                 stub_class_code += "                yield retry_chunk\n"
                 stub_class_code += "            return\n"
                 stub_class_code += f"        if response.status == 401:\n"
@@ -813,6 +1533,8 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
                 stub_class_code += f"            redirect_url = current_url + '/login'\n"
                 stub_class_code += f"            window.location.href = redirect_url\n"
                 stub_class_code += f"            return\n"
+                stub_class_code += "        if raise_for_status and response.status >= 400:\n"
+                stub_class_code += "            raise RuntimeError(f'BFF stream failed ({response.status})')\n"
                 stub_class_code += "        if self._pytincture_replay_enabled and len(self._pytincture_replay_pool) <= self._pytincture_replay_low:\n"
                 stub_class_code += "            await self._refill_pytincture_state()\n"
                 stub_class_code += f"        reader = response.body.getReader()\n"
@@ -828,6 +1550,85 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
                 stub_class_code += f"        if final_text:\n"
                 stub_class_code += f"            yield final_text\n"
 
+            arrow_methods = {
+                node.name
+                for node in class_node.body
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and _declared_result_format(
+                    node.decorator_list,
+                    import_aliases=bff_result_aliases,
+                    module_aliases=module_aliases,
+                ) == "arrow"
+            }
+            uses_arrow = uses_arrow or bool(arrow_methods)
+            upload_methods = {
+                node.name
+                for node in class_node.body
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+                and _declared_upload(
+                    node.decorator_list,
+                    import_aliases=bff_upload_aliases,
+                    module_aliases=module_aliases,
+                ) is not None
+            }
+            if arrow_methods:
+                stub_class_code += "    async def fetch_columnar(self, url, payload, method='POST', _replay_retry=True):\n"
+                stub_class_code += "        from js import fetch, window\n"
+                stub_class_code += "        from pyodide.ffi import to_js\n"
+                stub_class_code += "        options = {'method': method, 'headers': {'Content-Type': 'application/json'}}\n"
+                if use_tracing:
+                    stub_class_code += "        options['headers']['traceparent'] = _pytincture_traceparent()\n"
+                stub_class_code += "        accept = _pytincture_arrow_accept()\n"
+                stub_class_code += "        if accept:\n"
+                stub_class_code += "            options['headers']['Accept'] = accept\n"
+                stub_class_code += "        if method != 'GET':\n"
+                stub_class_code += "            options['headers']['X-CSRF-Token'] = self._csrf_token()\n"
+                stub_class_code += "            options['body'] = JSON.stringify(json.dumps(payload))\n"
+                stub_class_code += "        replay_token = await self._take_pytincture_state()\n"
+                stub_class_code += "        if replay_token:\n"
+                stub_class_code += "            options['headers']['X-Pytincture-BFF-Token'] = replay_token\n"
+                stub_class_code += "        response = await fetch(url, to_js(options))\n"
+                stub_class_code += "        if _replay_retry and response.status == 409 and response.headers.get('X-Pytincture-Replay') == 'rejected':\n"
+                stub_class_code += "            self._pytincture_replay_pool.clear()\n"
+                stub_class_code += "            return await self.fetch_columnar(url, payload, method, False)\n"
+                stub_class_code += "        if response.status == 401:\n"
+                stub_class_code += "            current_url = window.location.href.rstrip('/')\n"
+                stub_class_code += "            window.location.href = current_url + '/login'\n"
+                stub_class_code += "            return ''\n"
+                stub_class_code += "        if self._pytincture_replay_enabled and len(self._pytincture_replay_pool) <= self._pytincture_replay_low:\n"
+                stub_class_code += "            await self._refill_pytincture_state()\n"
+                stub_class_code += "        if response.headers.get('X-Pytincture-Result') == 'arrow':\n"
+                stub_class_code += "            return (await response.arrayBuffer()).to_bytes()\n"
+                stub_class_code += "        return await response.text()\n"
+            if upload_methods:
+                # Upload bodies are sent as-is (a JS File/Blob, bytes, or str) and
+                # the remaining keyword arguments travel in the query string.
+                stub_class_code += "    async def fetch_upload(self, url, body, params=None, method='POST', _replay_retry=True):\n"
+                stub_class_code += "        from js import fetch, window\n"
+                stub_class_code += "        from pyodide.ffi import to_js\n"
+                stub_class_code += "        from urllib.parse import urlencode\n"
+                stub_class_code += "        target = url + '?' + urlencode(params) if params else url\n"
+                stub_class_code += "        options = {'method': method, 'headers': {'Content-Type': 'application/octet-stream', 'X-CSRF-Token': self._csrf_token()}}\n"
+                if use_tracing:
+                    stub_class_code += "        options['headers']['traceparent'] = _pytincture_traceparent()\n"
+                stub_class_code += "        replay_token = await self._take_pytincture_state()\n"
+                stub_class_code += "        if replay_token:\n"
+                stub_class_code += "            options['headers']['X-Pytincture-BFF-Token'] = replay_token\n"
+                stub_class_code += "        if isinstance(body, str):\n"
+                stub_class_code += "            body = body.encode('utf-8')\n"
+                stub_class_code += "        options['body'] = to_js(bytes(body)) if isinstance(body, (bytes, bytearray)) else body\n"
+                stub_class_code += "        response = await fetch(target, to_js(options))\n"
+                stub_class_code += "        if _replay_retry and response.status == 409 and response.headers.get('X-Pytincture-Replay') == 'rejected':\n"
+                stub_class_code += "            self._pytincture_replay_pool.clear()\n"
+                stub_class_code += "            return await self.fetch_upload(url, body, params, method, False)\n"
+                stub_class_code += "        if response.status == 401:\n"
+                stub_class_code += "            current_url = window.location.href.rstrip('/')\n"
+                stub_class_code += "            window.location.href = current_url + '/login'\n"
+                stub_class_code += "            return ''\n"
+                stub_class_code += "        if self._pytincture_replay_enabled and len(self._pytincture_replay_pool) <= self._pytincture_replay_low:\n"
+                stub_class_code += "            await self._refill_pytincture_state()\n"
+                stub_class_code += "        return await response.text()\n"
+
             for node in class_node.body:
                 if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and not node.name.startswith('_'):
                     is_streaming = node.name in streaming_methods
@@ -839,11 +1640,35 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
                         module_aliases=module_aliases,
                     )
                     request_method = declared_methods[0]
-                    if is_streaming:
+                    if node.name in upload_methods:
+                        # Uploads are always async so a large body never blocks the page.
+                        stub_class_code += f"    async def {node.name}(self, body, **kwargs):\n"
+                        stub_class_code += f"        url = '{return_protocol}://{return_url}/classcall/{file_identifier}/{class_name}/{node.name}'\n"
+                        stub_class_code += f"        response = await self.fetch_upload(url, body, kwargs, '{request_method}')\n"
+                        stub_class_code +=  "        return json.loads(response)\n"
+                    elif node.name in arrow_methods:
+                        stub_class_code += f"    {'async ' if is_async_method else ''}def {node.name}(self, *args, **kwargs):\n"
+                        stub_class_code += f"        url = '{return_protocol}://{return_url}/classcall/{file_identifier}/{class_name}/{node.name}'\n"
+                        stub_class_code +=  "        payload = {'args': args, 'kwargs': kwargs}\n"
+                        if is_async_method:
+                            stub_class_code += f"        response = await self.fetch_columnar(url, payload, '{request_method}')\n"
+                        else:
+                            stub_class_code += "        accept = _pytincture_arrow_accept()\n"
+                            stub_class_code += f"        response = self.fetch_sync(url, payload, '{request_method}', binary=bool(accept), accept=accept)\n"
+                        stub_class_code +=  "        return _pytincture_columnar(response)\n"
+                    elif is_streaming:
                         stub_class_code += f"    async def {node.name}(self, *args, **kwargs):\n"
                         stub_class_code += f"        url = '{return_protocol}://{return_url}/classcall/{file_identifier}/{class_name}/{node.name}'\n"
                         stub_class_code +=  "        payload = {'args': args, 'kwargs': kwargs}\n"
-                        stub_class_code += f"        stream_iter = self.fetch_stream(url, payload, '{request_method}')\n"
+                        if stream_config.get("sse"):
+                            uses_sse = True
+                            stub_class_code += f"        async for event in _pytincture_sse_events(self, url, payload, '{request_method}', {bool(stream_config.get('raw'))!r}):\n"
+                            stub_class_code +=  "            yield event\n"
+                            continue
+                        if use_websocket and request_method == "POST":
+                            stub_class_code += f"        stream_iter = _pytincture_socket.stream(self, '{node.name}', args, kwargs, lambda: self.fetch_stream(url, payload, '{request_method}'))\n"
+                        else:
+                            stub_class_code += f"        stream_iter = self.fetch_stream(url, payload, '{request_method}')\n"
                         if stream_config.get("raw"):
                             stub_class_code +=  "        async for chunk in stream_iter:\n"
                             stub_class_code +=  "            if chunk:\n"
@@ -865,9 +1690,28 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
                     elif is_async_method:
                         stub_class_code += f"    async def {node.name}(self, *args, **kwargs):\n"
                         stub_class_code += f"        url = '{return_protocol}://{return_url}/classcall/{file_identifier}/{class_name}/{node.name}'\n"
+                        indent = "        "
+                        # The socket carries POST semantics, like /_batch.
+                        over_socket = use_websocket and request_method == "POST"
+                        if over_socket:
+                            stub_class_code += "        async def over_http():\n"
+                            indent = "            "
+                        if coalesce_ms > 0 and request_method == "POST" and not _returns_binary(node):
+                            # /_batch is a POST carrying JSON only, so binary results and
+                            # methods that do not accept POST keep their own request.
+                            stub_class_code += f"{indent}return await _pytincture_coalesced(self, '{node.name}', url, '{request_method}', args, kwargs)\n"
+                        else:
+                            stub_class_code += f"{indent}payload = {{'args': args, 'kwargs': kwargs}}\n"
+                            stub_class_code += f"{indent}response = await self.fetch(url, payload, '{request_method}')\n"
+                            stub_class_code += f"{indent}return response if isinstance(response, bytes) else json.loads(response)\n"
+                        if over_socket:
+                            stub_class_code += f"        return await _pytincture_socket.call(self, '{node.name}', args, kwargs, over_http)\n"
+                    elif _returns_binary(node):
+                        stub_class_code += f"    def {node.name}(self, *args, **kwargs):\n"
+                        stub_class_code += f"        url = '{return_protocol}://{return_url}/classcall/{file_identifier}/{class_name}/{node.name}'\n"
                         stub_class_code +=  "        payload = {'args': args, 'kwargs': kwargs}\n"
-                        stub_class_code += f"        response = await self.fetch(url, payload, '{request_method}')\n"
-                        stub_class_code +=  "        return json.loads(response)\n"
+                        stub_class_code += f"        response = self.fetch_sync(url, payload, '{request_method}', binary=True)\n"
+                        stub_class_code +=  "        return response if isinstance(response, bytes) else json.loads(response)\n"
                     else:
                         stub_class_code += f"    def {node.name}(self, *args, **kwargs):\n"
                         stub_class_code += f"        url = '{return_protocol}://{return_url}/classcall/{file_identifier}/{class_name}/{node.name}'\n"
@@ -883,6 +1727,81 @@ def generate_stub_classes(file_path, return_url, return_protocol, replay_client=
                             stub_class_code += f"        url = '{return_protocol}://{return_url}/classcall/{file_identifier}/{class_name}/{property_name}'\n"
                             stub_class_code +=  "        response = self.fetch_sync(url)\n"
                             stub_class_code +=  "        return json.loads(response)\n"
+    if uses_sse:
+        # Reads Server-Sent Events and reconnects with Last-Event-ID until the
+        # server sends the terminal ``end`` event.
+        stub_class_code += "\n_pytincture_sse_max_retries = 5\n"
+        stub_class_code += "async def _pytincture_sse_events(stub, url, payload, method, raw):\n"
+        stub_class_code += "    import asyncio\n"
+        stub_class_code += "    last_event_id = None\n"
+        stub_class_code += "    retry_delay = 1.0\n"
+        stub_class_code += "    failures = 0\n"
+        stub_class_code += "    while True:\n"
+        stub_class_code += "        stream = stub.fetch_stream(url, payload, method, last_event_id=last_event_id, raise_for_status=True)\n"
+        stub_class_code += "        buffer = ''\n"
+        stub_class_code += "        while True:\n"
+        stub_class_code += "            try:\n"
+        stub_class_code += "                chunk = await stream.__anext__()\n"
+        stub_class_code += "            except StopAsyncIteration:\n"
+        stub_class_code += "                break\n"
+        stub_class_code += "            except RuntimeError:\n"
+        stub_class_code += "                raise\n"
+        stub_class_code += "            except Exception:\n"
+        stub_class_code += "                break\n"
+        stub_class_code += "            buffer += chunk.replace('\\r\\n', '\\n')\n"
+        stub_class_code += "            while '\\n\\n' in buffer:\n"
+        stub_class_code += "                block, buffer = buffer.split('\\n\\n', 1)\n"
+        stub_class_code += "                event_type, data_lines = 'message', []\n"
+        stub_class_code += "                for line in block.split('\\n'):\n"
+        stub_class_code += "                    if not line or line.startswith(':'):\n"
+        stub_class_code += "                        continue\n"
+        stub_class_code += "                    field, _, value = line.partition(':')\n"
+        stub_class_code += "                    if value.startswith(' '):\n"
+        stub_class_code += "                        value = value[1:]\n"
+        stub_class_code += "                    if field == 'id':\n"
+        stub_class_code += "                        last_event_id = value\n"
+        stub_class_code += "                    elif field == 'event':\n"
+        stub_class_code += "                        event_type = value\n"
+        stub_class_code += "                    elif field == 'data':\n"
+        stub_class_code += "                        data_lines.append(value)\n"
+        stub_class_code += "                    elif field == 'retry' and value.isdigit():\n"
+        stub_class_code += "                        retry_delay = int(value) / 1000.0\n"
+        stub_class_code += "                if event_type == 'end':\n"
+        stub_class_code += "                    return\n"
+        stub_class_code += "                if event_type == 'error':\n"
+        stub_class_code += "                    raise RuntimeError('BFF stream failed')\n"
+        stub_class_code += "                if event_type == 'gap':\n"
+        stub_class_code += "                    raise RuntimeError('BFF stream lost events while reconnecting')\n"
+        stub_class_code += "                if data_lines:\n"
+        stub_class_code += "                    failures = 0\n"
+        stub_class_code += "                    data = '\\n'.join(data_lines)\n"
+        stub_class_code += "                    yield data if raw else json.loads(data)\n"
+        stub_class_code += "        failures += 1\n"
+        stub_class_code += "        if failures > _pytincture_sse_max_retries:\n"
+        stub_class_code += "            raise RuntimeError('BFF stream disconnected')\n"
+        stub_class_code += "        await asyncio.sleep(retry_delay)\n"
+
+    if uses_arrow:
+        # Arrow results need pyarrow in Pyodide; without it the server sends JSON rows.
+        stub_class_code += "\ndef _pytincture_arrow_accept():\n"
+        stub_class_code += "    try:\n"
+        stub_class_code += "        import pyarrow.ipc\n"
+        stub_class_code += "    except ImportError:\n"
+        stub_class_code += "        return None\n"
+        stub_class_code += "    return 'application/vnd.apache.arrow.stream'\n"
+        stub_class_code += "def _pytincture_columnar(response):\n"
+        stub_class_code += "    if isinstance(response, bytes):\n"
+        stub_class_code += "        import pyarrow\n"
+        stub_class_code += "        import pyarrow.ipc\n"
+        stub_class_code += "        return pyarrow.ipc.open_stream(pyarrow.py_buffer(response)).read_all()\n"
+        stub_class_code += "    return json.loads(response)\n"
+
+    if use_tracing:
+        # Every HTTP call starts its own trace; the server span continues it.
+        stub_class_code += "\ndef _pytincture_traceparent():\n"
+        stub_class_code += "    import secrets\n"
+        stub_class_code += "    return '00-' + secrets.token_hex(16) + '-' + secrets.token_hex(8) + '-01'\n"
+
     all_imports.add("import json")
     all_imports.add("import base64")
     all_imports.add("import hashlib")
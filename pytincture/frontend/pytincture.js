@@ -6,6 +6,7 @@ const DEFAULT_CONFIG = {
     widgetlib: "dhxpyt",
     widgetSource: null,
     mode: "auto", // 'package', 'inline', or 'auto'
+    appcodeMode: "archive", // 'archive' or 'chunked'
     pyodideBaseUrl: "./frontend/pyodide/0.29.3/full/",
     loadMaterialIcons: true,
     materialIconsUrl: "https://cdnjs.cloudflare.com/ajax/libs/MaterialDesign-Webfont/7.4.47/css/materialdesignicons.css",
@@ -396,6 +397,112 @@ async function runPackagedApp(pyodide, config) {
     pyodide.runPython(`from ${config.application} import ${entrypoint} as app\napp()`);
 }
 
+const CHUNK_FINDER_SOURCE = `
+import importlib
+import importlib.abc
+import json
+import os
+import sys
+
+import js
+
+
+class PytinctureChunkFinder(importlib.abc.MetaPathFinder):
+    """Fetch browser modules from the server the first time they are imported."""
+
+    def __init__(self, manifest, base_url, query, headers):
+        self.root = os.getcwd()
+        self.modules = manifest["modules"]
+        self.versions = manifest["versions"]
+        self.base_url = base_url
+        self.query = query
+        self.headers = headers
+        self.directories = set()
+        for path in self.versions:
+            parts = path.split("/")[:-1]
+            for index in range(1, len(parts) + 1):
+                self.directories.add(".".join(parts[:index]))
+
+    def find_spec(self, fullname, path=None, target=None):
+        relative = self.modules.get(fullname)
+        if relative is None:
+            if fullname in self.directories:
+                os.makedirs(os.path.join(self.root, *fullname.split(".")), exist_ok=True)
+                importlib.invalidate_caches()
+            return None
+        destination = os.path.join(self.root, relative)
+        if not os.path.exists(destination):
+            self._fetch(relative, destination)
+        # The regular path finder imports the file just written.
+        return None
+
+    def _fetch(self, relative, destination):
+        url = f"{self.base_url}/{relative}?v={self.versions[relative]}{self.query}"
+        request = js.XMLHttpRequest.new()
+        request.open("GET", url, False)
+        for name, value in self.headers.items():
+            request.setRequestHeader(name, value)
+        request.send(None)
+        if request.status != 200:
+            raise ImportError(f"Failed to fetch {relative} ({request.status})", name=relative)
+        os.makedirs(os.path.dirname(destination) or self.root, exist_ok=True)
+        with open(destination, "w", encoding="utf-8") as handle:
+            handle.write(request.responseText)
+        importlib.invalidate_caches()
+
+
+def install(manifest_json, base_url, query, headers_json):
+    sys.meta_path.insert(
+        0,
+        PytinctureChunkFinder(json.loads(manifest_json), base_url, query, json.loads(headers_json)),
+    )
+`;
+
+async function runChunkedApp(pyodide, config) {
+    if (!config.application) {
+        throw new Error("No application supplied for packaged mode.");
+    }
+    const launchId = encodeURIComponent(makeRequestId());
+    const appcodeUrl = `${config.application}/appcode`;
+    const manifestResponse = await fetch(`${appcodeUrl}/manifest.json?uuid=${launchId}`);
+    if (!manifestResponse.ok) {
+        throw new Error(`Failed to fetch appcode manifest for ${config.application}`);
+    }
+    const manifest = await manifestResponse.json();
+    // Modules carrying a per-session replay key must bypass the service-worker cache.
+    const query = manifest.client ? `&uuid=${launchId}` : "";
+    const headers = manifest.client ? { "X-Pytincture-Client": manifest.client } : {};
+    const moduleUrl = path => `${appcodeUrl}/modules/${path.split("/").map(encodeURIComponent).join("/")}`;
+
+    // Prefetch the entrypoint, its direct imports and the data files in parallel;
+    // everything else is fetched by the import hook on first import.
+    await Promise.all(
+        [...manifest.prefetch, ...manifest.data].map(async path => {
+            const response = await fetch(`${moduleUrl(path)}?v=${manifest.versions[path]}${query}`, { headers });
+            if (!response.ok) {
+                throw new Error(`Failed to fetch ${path} for ${config.application}`);
+            }
+            const contents = new Uint8Array(await response.arrayBuffer());
+            const directory = path.split("/").slice(0, -1).join("/");
+            if (directory) {
+                pyodide.FS.mkdirTree(directory);
+            }
+            pyodide.FS.writeFile(path, contents);
+        }),
+    );
+
+    const namespace = pyodide.toPy({ __name__: "pytincture_chunks" });
+    pyodide.runPython(CHUNK_FINDER_SOURCE, { globals: namespace });
+    namespace.get("install")(
+        JSON.stringify(manifest),
+        moduleUrl("").replace(/\/$/, ""),
+        query,
+        JSON.stringify(headers),
+    );
+    const entrypoint = config.entrypoint || config.application;
+    pyodide.runPython(`from ${config.application} import ${entrypoint} as app\napp()`);
+}
+
 async function runInlineApp(pyodide, config) {
     const scripts = Array.from(document.querySelectorAll(config.inlineSelector));
     if (!scripts.length) {
@@ -588,7 +695,11 @@ async function runTinctureApp(arg1, widgetlib, entrypoint) {
 
         if (config.mode === "package" || config.application) {
             try {
-                await runPackagedApp(pyodide, config);
+                if (config.appcodeMode === "chunked") {
+                    await runChunkedApp(pyodide, config);
+                } else {
+                    await runPackagedApp(pyodide, config);
+                }
                 removeLoadingOverlay(loadingOverlay);
                 return;
             } catch (err) {
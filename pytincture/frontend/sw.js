@@ -5,11 +5,17 @@ const CACHEABLE_EXTENSIONS = [".wasm", ".data", ".js", ".json", ".css", ".whl",
 function isCacheBustedAppcodeRequest(url) {
     return (
         url.origin === self.location.origin &&
-        url.pathname.endsWith("/appcode/appcode.pyt") &&
+        (url.pathname.endsWith("/appcode/appcode.pyt") ||
+            url.pathname.endsWith("/appcode/manifest.json") ||
+            url.pathname.includes("/appcode/modules/")) &&
         url.searchParams.has("uuid")
     );
 }
 
+function isBffCallRequest(url) {
+    return url.pathname.startsWith("/classcall/");
+}
+
 self.addEventListener("install", event => {
     self.skipWaiting();
 });
@@ -30,6 +36,10 @@ function shouldCache(url) {
         if (isCacheBustedAppcodeRequest(url)) {
             return false;
         }
+        // BFF results carry their own ETag/Cache-Control; let the HTTP cache revalidate them.
+        if (isBffCallRequest(url)) {
+            return false;
+        }
         if (url.pathname.includes("/appcode/")) {
             return true;
         }
@@ -1,5 +1,6 @@
 import os
 import base64
+import hashlib
 import io
 import json
 import textwrap
@@ -8,6 +9,8 @@ import tempfile
 import asyncio
 import subprocess
 import sys
+import threading
+import time
 import pytest
 from pathlib import Path
 from fastapi.testclient import TestClient
@@ -17,7 +20,9 @@ from urllib.parse import parse_qs, urlencode, urlsplit
 # Import the app instance and helpers from the module.
 from pytincture.backend.app import (
     app,
+    AppcodeArchiveCache,
     ALLOWED_NOAUTH_CLASSCALLS,
+    BffResultCache,
     _build_streamable_mcp_app,
     _build_dynamic_module_name,
     _sanitize_return_to,
@@ -56,7 +61,7 @@ def _csrf_headers(client):
 
 
 @pytest.fixture(autouse=True)
-def override_env(monkeypatch):
+def override_env(monkeypatch, tmp_path):
     """
     Override environment variables and module-level globals.
     Since app.py reads env vars at import time, update its globals in the module.
@@ -80,6 +85,13 @@ def override_env(monkeypatch):
     monkeypatch.setattr(backend_app, "USER_SESSION_DICT", {})
     monkeypatch.setattr(backend_app, "AUTH_SESSION_REVOCATIONS", {})
     monkeypatch.setattr(backend_app, "BFF_REPLAY_TOKEN_STORE", {})
+    monkeypatch.setattr(backend_app, "BFF_RESULT_CACHE", backend_app.BffResultCache())
+    monkeypatch.setattr(backend_app, "BFF_EXECUTORS", backend_app.BffExecutorRegistry())
+    monkeypatch.setattr(backend_app, "BFF_STREAMS", backend_app.BffStreamRegistry())
+    monkeypatch.setattr(backend_app, "BFF_SSE_STREAMS", backend_app.BffSseRegistry())
+    monkeypatch.setattr(
+        backend_app, "APPCODE_ARCHIVE_CACHE", AppcodeArchiveCache(str(tmp_path / "appcode-cache"))
+    )
     set_user_authenticator(None)
     ALLOWED_NOAUTH_CLASSCALLS.clear()
     yield
@@ -255,6 +267,191 @@ def test_authentication_enabled_requires_strong_startup_secret(tmp_path):
     assert "Authentication requires SAML_SECRET_KEY" in result.stderr
 
 
+def test_disabled_subsystems_are_not_imported_at_startup(tmp_path):
+    environment = os.environ.copy()
+    environment.update({
+        "MODULES_PATH": str(tmp_path),
+        "ENABLE_USER_LOGIN": "false",
+        "ENABLE_GOOGLE_AUTH": "false",
+        "ENABLE_MICROSOFT_AUTH": "false",
+        "ENABLE_SAML_AUTH": "false",
+        "ENABLE_MCP": "false",
+        "USE_REDIS_INSTANCE": "false",
+        "PYTHONPATH": str(Path(__file__).parents[1]),
+    })
+    script = textwrap.dedent("""
+        import json, sys
+        import pytincture.backend.app as backend_app
+        report = backend_app.startup_report()
+        mounted = any(route.path.startswith("/mcp") for route in backend_app.app.router.routes)
+        before = dict(report["loaded_subsystems"])
+        backend_app.OAuthError
+        print(json.dumps({
+            "report": report,
+            "before": before,
+            "mounted": mounted,
+            "authlib_after": "authlib" in sys.modules,
+        }))
+    """)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=tmp_path,
+        env=environment,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    outcome = json.loads(result.stdout.strip().splitlines()[-1])
+    assert not any(outcome["before"].values())
+    assert not outcome["mounted"]
+    assert outcome["authlib_after"] is True
+    assert {"imports", "bff registry", "mcp"} <= set(outcome["report"]["phases"])
+
+
+def test_deployment_bundle_serves_prebuilt_archives_and_pages(fresh_client, monkeypatch, tmp_path):
+    import gzip as gzip_module
+    import pytincture.backend.app as backend_app
+    from pytincture.backend.bundle import DeploymentBundle
+
+    modules = tmp_path / "modules"
+    modules.mkdir()
+    (modules / "shop.py").write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Cart:
+            def items(self):
+                return [1, 2]
+    """))
+    monkeypatch.setattr(backend_app, "ENABLE_GOOGLE_AUTH", False)
+    monkeypatch.setenv("MODULES_PATH", str(modules))
+    monkeypatch.setattr(backend_app.app, "openapi_schema", None)
+    manifest = backend_app.build_deployment_bundle(str(tmp_path / "bundle"), "https://testserver")
+    assert set(manifest["applications"]) == {"shop"}
+
+    bundle = DeploymentBundle(
+        str(tmp_path / "bundle"), backend_app._modules_tree_fingerprint(str(modules))
+    )
+    assert bundle.registry == backend_app.build_bff_registry(str(modules))
+    monkeypatch.setattr(backend_app, "DEPLOYMENT_BUNDLE", bundle)
+    # Later edits to the tree are not seen: responses come from the bundle.
+    (modules / "shop.py").write_text("EDITED = True\n")
+    with pytest.raises(RuntimeError, match="modules tree has changed"):
+        DeploymentBundle(str(tmp_path / "bundle"), backend_app._modules_tree_fingerprint(str(modules)))
+
+    response = fresh_client.get(
+        "/shop/appcode/appcode.pyt", headers={"Accept-Encoding": "identity"}
+    )
+    assert response.status_code == 200
+    assert response.content == Path(bundle.archive_path("shop")).read_bytes()
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert "class Cart" in archive.read("shop.py").decode()
+
+    compressed = fresh_client.get("/shop/appcode/appcode.pyt", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.content == gzip_module.decompress(
+        Path(bundle.gzip_archive_path("shop")).read_bytes()
+    )
+    with zipfile.ZipFile(io.BytesIO(compressed.content)) as archive:
+        assert "class Cart" in archive.read("shop.py").decode()
+
+    page = fresh_client.get("/shop")
+    assert page.status_code == 200
+    assert page.text == bundle.index_html("shop")
+
+    other_host = TestClient(app, base_url="https://other.example")
+    rebuilt = other_host.get("/shop/appcode/appcode.pyt")
+    assert rebuilt.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(rebuilt.content)) as archive:
+        assert "class Cart" not in archive.read("shop.py").decode()
+
+    monkeypatch.setenv("ENABLE_BFF_WEBSOCKET", "true")
+    with pytest.raises(RuntimeError, match="ENABLE_BFF_WEBSOCKET"):
+        DeploymentBundle(str(tmp_path / "bundle"))
+
+    monkeypatch.setattr("pytincture.backend.bundle.PYTINCTURE_VERSION", "0.0.0")
+    with pytest.raises(RuntimeError, match="built by pytincture"):
+        DeploymentBundle(str(tmp_path / "bundle"))
+
+
+def test_session_free_appcode_archives_are_served_from_the_file_cache(
+    fresh_client, monkeypatch, tmp_path
+):
+    import pytincture.backend.app as backend_app
+
+    modules = tmp_path / "modules"
+    modules.mkdir()
+    (modules / "shop.py").write_text("import helpers\nVERSION = 1\n")
+    (modules / "helpers.py").write_text("HELP = True\n")
+    monkeypatch.setattr(backend_app, "ENABLE_GOOGLE_AUTH", False)
+    monkeypatch.setenv("MODULES_PATH", str(modules))
+    cache_dir = tmp_path / "appcode-cache"
+    builds = []
+    original_write = backend_app.write_appcode_pkg
+    monkeypatch.setattr(
+        backend_app,
+        "write_appcode_pkg",
+        lambda *args, **kwargs: builds.append(args[3]) or original_write(*args, **kwargs),
+    )
+
+    first = fresh_client.get("/shop/appcode/appcode.pyt")
+    second = fresh_client.get("/shop/appcode/appcode.pyt")
+    assert first.status_code == second.status_code == 200
+    assert first.headers["content-disposition"] == "attachment; filename=appcode.pyt"
+    assert first.content == second.content
+    assert builds == ["shop"]
+    cached = [path for path in cache_dir.iterdir() if path.name.startswith("shop-")]
+    assert len(cached) == 1 and cached[0].read_bytes() == first.content
+    assert oct(cache_dir.stat().st_mode & 0o777) == oct(0o700)
+
+    # Editing an imported module changes the fingerprint and rebuilds the archive.
+    (modules / "helpers.py").write_text("HELP = 'changed'\n")
+    edited = fresh_client.get("/shop/appcode/appcode.pyt")
+    with zipfile.ZipFile(io.BytesIO(edited.content)) as archive:
+        assert "changed" in archive.read("helpers.py").decode()
+    assert builds == ["shop", "shop"]
+
+    # Archives that carry a per-session replay key never touch the cache.
+    monkeypatch.setattr(backend_app, "ENABLE_BFF_REPLAY_TOKENS", True)
+    monkeypatch.setattr(
+        backend_app,
+        "_register_bff_replay_client",
+        lambda request, user: {"capsule": "capsule", "key": b"k" * 32},
+    )
+    replayed = fresh_client.get("/shop/appcode/appcode.pyt")
+    assert replayed.status_code == 200
+    assert builds == ["shop", "shop", "shop"]
+    assert len([path for path in cache_dir.iterdir() if path.suffix == ".pyt"]) == 2
+
+
+def test_browser_package_graph_is_reused_until_the_tree_changes(monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "shop.py").write_text("import helpers\nimport extras\n")
+    (tmp_path / "helpers.py").write_text("HELP = True\n")
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    parsed = []
+    original_imports = backend_app._local_python_imports
+    monkeypatch.setattr(
+        backend_app,
+        "_local_python_imports",
+        lambda file_path, root: parsed.append(os.path.basename(file_path)) or original_imports(file_path, root),
+    )
+
+    def package():
+        return sorted(os.path.basename(path) for path in backend_app._browser_package_files("shop"))
+
+    assert package() == ["helpers.py", "shop.py"]
+    assert package() == ["helpers.py", "shop.py"]
+    assert sorted(parsed) == ["helpers.py", "shop.py"]
+
+    # A module that an existing import now resolves to joins the package.
+    (tmp_path / "extras.py").write_text("EXTRA = 1\n")
+    assert package() == ["extras.py", "helpers.py", "shop.py"]
+    assert len(parsed) == 5
+
+
 def test_dependency_routes_reject_missing_authenticated_session(
     fresh_client, monkeypatch, tmp_path
 ):
@@ -423,6 +620,146 @@ def test_bff_replay_token_is_opaque_session_bound_and_single_use(
     assert copied_curl_replay.status_code == 409
 
 
+@pytest.mark.parametrize("file_cache", [True, False])
+def test_concurrent_appcode_downloads_share_one_build(monkeypatch, tmp_path, file_cache):
+    import httpx
+    import pytincture.backend.app as backend_app
+
+    modules = tmp_path / "modules"
+    modules.mkdir()
+    (modules / "shop.py").write_text("import helpers\n")
+    (modules / "helpers.py").write_text("HELP = True\n")
+    monkeypatch.setattr(backend_app, "ENABLE_GOOGLE_AUTH", False)
+    monkeypatch.setenv("MODULES_PATH", str(modules))
+    if not file_cache:
+        # Without a usable cache directory the in-memory build is shared instead.
+        monkeypatch.setattr(backend_app, "APPCODE_ARCHIVE_CACHE", None)
+    builds = []
+    original_write = backend_app.write_appcode_pkg
+
+    def slow_write(*args, **kwargs):
+        builds.append(args[3])
+        time.sleep(0.2)
+        return original_write(*args, **kwargs)
+
+    monkeypatch.setattr(backend_app, "write_appcode_pkg", slow_write)
+    monkeypatch.setattr(backend_app, "BFF_METRICS", backend_app.BffMetrics())
+
+    async def download_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="https://testserver") as client:
+            return await asyncio.gather(
+                *(client.get("/shop/appcode/appcode.pyt") for _ in range(8))
+            )
+
+    responses = asyncio.run(download_all())
+    assert [response.status_code for response in responses] == [200] * 8
+    assert len({response.content for response in responses}) == 1
+    assert builds == ["shop"]
+    with zipfile.ZipFile(io.BytesIO(responses[0].content)) as archive:
+        assert archive.namelist() == ["helpers.py", "shop.py"]
+    assert backend_app._APPCODE_BUILDS == {}
+    assert 'pytincture_appcode_build_waiters_total{application="shop"} 7' in (
+        backend_app.BFF_METRICS.render()
+    )
+
+
+def test_chunked_appcode_manifest_lists_modules_and_prefetch_hints(
+    fresh_client, monkeypatch, tmp_path
+):
+    import pytincture.backend.app as backend_app
+
+    modules = tmp_path / "modules"
+    (modules / "pkg").mkdir(parents=True)
+    (modules / "shop.py").write_text("import helpers\n")
+    (modules / "helpers.py").write_text("import pkg.reports\n")
+    (modules / "pkg" / "__init__.py").write_text("")
+    (modules / "pkg" / "reports.py").write_text("REPORTS = True\n")
+    (modules / "unrelated.py").write_text("SECRET = 1\n")
+    (modules / "labels.json").write_text("{}")
+    monkeypatch.setattr(backend_app, "ENABLE_GOOGLE_AUTH", False)
+    monkeypatch.setenv("MODULES_PATH", str(modules))
+    monkeypatch.setenv("PYTINCTURE_BROWSER_FILES", "labels.json")
+
+    manifest = fresh_client.get("/shop/appcode/manifest.json")
+    assert manifest.status_code == 200
+    assert manifest.headers["cache-control"] == "no-store"
+    body = manifest.json()
+    assert body["modules"] == {
+        "helpers": "helpers.py",
+        "pkg": "pkg/__init__.py",
+        "pkg.reports": "pkg/reports.py",
+        "shop": "shop.py",
+    }
+    assert body["data"] == ["labels.json"]
+    assert body["prefetch"] == ["helpers.py", "shop.py"]
+    assert set(body["versions"]) == {*body["modules"].values(), "labels.json"}
+    assert body["client"] is None
+
+    archive = zipfile.ZipFile(io.BytesIO(fresh_client.get("/shop/appcode/appcode.pyt").content))
+    generated = []
+    original_parsed_output = backend_app.get_parsed_output
+    monkeypatch.setattr(
+        backend_app,
+        "get_parsed_output",
+        lambda file_path, *args, **kwargs: generated.append(os.path.basename(file_path))
+        or original_parsed_output(file_path, *args, **kwargs),
+    )
+    reports_url = f"/shop/appcode/modules/pkg/reports.py?v={body['versions']['pkg/reports.py']}"
+    module = fresh_client.get(reports_url)
+    assert module.status_code == 200
+    assert module.text == archive.read("pkg/reports.py").decode()
+    assert module.headers["cache-control"] == "private, max-age=31536000, immutable"
+    assert fresh_client.get(reports_url).text == module.text
+    assert generated == ["reports.py"]
+    unversioned = fresh_client.get("/shop/appcode/modules/pkg/reports.py")
+    assert unversioned.headers["cache-control"] == "no-cache"
+    assert fresh_client.get("/shop/appcode/modules/labels.json").content == b"{}"
+    assert fresh_client.get("/shop/appcode/modules/unrelated.py").status_code == 404
+    assert fresh_client.get("/shop/appcode/modules/../shop.py").status_code == 404
+
+    # Editing a module changes only that module's version.
+    (modules / "pkg" / "reports.py").write_text("REPORTS = 'edited'\n")
+    edited = fresh_client.get("/shop/appcode/manifest.json").json()["versions"]
+    assert edited["pkg/reports.py"] != body["versions"]["pkg/reports.py"]
+    assert edited["shop.py"] == body["versions"]["shop.py"]
+    assert "edited" in fresh_client.get(
+        f"/shop/appcode/modules/pkg/reports.py?v={edited['pkg/reports.py']}"
+    ).text
+
+
+def test_chunked_appcode_modules_reuse_the_manifest_replay_capsule(
+    fresh_client, monkeypatch, dummy_module
+):
+    import ast
+    import re
+    import pytincture.backend.app as backend_app
+
+    monkeypatch.setattr(backend_app, "ENABLE_GOOGLE_AUTH", False)
+    monkeypatch.setattr(backend_app, "ENABLE_USER_LOGIN", True)
+    monkeypatch.setattr(backend_app, "ENABLE_DEV_EMAIL_LOGIN", True)
+    monkeypatch.setattr(backend_app, "ENABLE_BFF_REPLAY_TOKENS", True)
+    monkeypatch.setenv("ALLOWED_EMAILS", "person@example.com")
+    monkeypatch.setenv("MODULES_PATH", str(dummy_module))
+    login = fresh_client.post(
+        "/example/auth/user",
+        data={"email": "person@example.com", "password": "local"},
+        follow_redirects=False,
+    )
+    assert login.status_code == 303
+
+    capsule = fresh_client.get("/example/appcode/manifest.json").json()["client"]
+    assert capsule
+    assert fresh_client.get("/example/appcode/modules/example.py").status_code == 409
+    module = fresh_client.get(
+        "/example/appcode/modules/example.py", headers={"X-Pytincture-Client": capsule}
+    )
+    assert module.status_code == 200
+    assert module.headers["cache-control"] == "no-store"
+    embedded = re.search(r"_pytincture_replay_capsule = (.+)", module.text)
+    assert embedded and ast.literal_eval(embedded.group(1)) == capsule
+
+
 def test_bff_methods_default_to_post(fresh_client, monkeypatch, dummy_module):
     import pytincture.backend.app as backend_app
 
@@ -1024,6 +1361,1393 @@ def test_class_call_streaming(monkeypatch, fresh_client, tmp_path):
     assert '"value": 0' in combined
     assert '"value": 1' in combined
 
+
+def test_class_call_batch_runs_calls_and_reports_errors_in_place(
+    monkeypatch, fresh_client, tmp_path
+):
+    """
+    A batch authenticates once and returns one result per call, in order.
+    """
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "batched.py").write_text(textwrap.dedent("""
+        import asyncio
+        from pytincture.dataclass import backend_for_frontend, bff_http_methods, bff_policy, bff_stream
+
+        @backend_for_frontend
+        class Batched:
+            def add(self, left, right):
+                return left + right
+
+            @bff_http_methods("GET")
+            def status(self):
+                return "ok"
+
+            async def greet(self, name):
+                await asyncio.sleep(0)
+                return {"hello": name}
+
+            @bff_policy(role="admin")
+            def secret(self):
+                return "hidden"
+
+            @bff_stream()
+            def ticker(self):
+                yield 1
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    auth_calls = []
+
+    def fake_require_auth(request):
+        auth_calls.append(request)
+        return {"email": "tester@example.com", "roles": []}
+
+    monkeypatch.setattr(backend_app, "require_auth", fake_require_auth)
+
+    def policy_hook(user, policy, **kwargs):
+        if policy.get("role") and policy["role"] not in user.get("roles", []):
+            raise HTTPException(status_code=403, detail="Forbidden")
+
+    set_bff_policy_hook(policy_hook)
+    try:
+        response = fresh_client.post(
+            "/classcall/_batch",
+            json={"calls": [
+                {"file": "batched.py", "class": "Batched", "function": "add", "args": [2, 3]},
+                {"file": "batched.py", "class": "Batched", "function": "greet", "kwargs": {"name": "Ada"}},
+                {"file": "batched.py", "class": "Batched", "function": "secret"},
+                {"file": "batched.py", "class": "Batched", "function": "ticker"},
+                {"file": "batched.py", "class": "Batched", "function": "missing"},
+                {"file": "batched.py", "class": "Batched", "function": "status"},
+            ]},
+        )
+    finally:
+        set_bff_policy_hook(None)
+
+    assert response.status_code == 200
+    assert len(auth_calls) == 1
+    assert response.json()["results"] == [
+        {"status": 200, "result": 5},
+        {"status": 200, "result": {"hello": "Ada"}},
+        {"status": 403, "error": "Forbidden"},
+        {"status": 400, "error": "Streaming BFF operations cannot be batched"},
+        {"status": 404, "error": "BFF operation not exported"},
+        {"status": 405, "error": "HTTP method not allowed for this BFF operation"},
+    ]
+
+
+def test_class_call_batch_requires_session_and_enforces_size(
+    monkeypatch, fresh_client, dummy_module
+):
+    import pytincture.backend.app as backend_app
+
+    monkeypatch.setenv("MODULES_PATH", str(dummy_module))
+    call = {"file": "example.py", "class": "ExampleClass", "function": "testfunc"}
+
+    unauthenticated = fresh_client.post("/classcall/_batch", json={"calls": [call]})
+    assert unauthenticated.status_code == 401
+
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "tester@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_BATCH_MAX_CALLS", 2)
+    too_many = fresh_client.post("/classcall/_batch", json={"calls": [call] * 3})
+    assert too_many.status_code == 413
+
+    invalid = fresh_client.post("/classcall/_batch", json={"calls": "nope"})
+    assert invalid.status_code == 400
+
+
+def test_bff_cache_serves_hits_before_module_execution(monkeypatch, fresh_client, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    counter = tmp_path / "executions.log"
+    (tmp_path / "lookups.py").write_text(textwrap.dedent(f"""
+        from pytincture.dataclass import backend_for_frontend, bff_cache
+
+        with open({str(counter)!r}, "a") as log:
+            log.write("module\\n")
+
+        @backend_for_frontend
+        class Lookups:
+            @bff_cache(ttl=60)
+            def countries(self, region):
+                return [region, "other"]
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    url = "/classcall/lookups.py/Lookups/countries"
+
+    first = fresh_client.post(url, json={"args": ["eu"]})
+    second = fresh_client.post(url, json={"args": ["eu"]})
+    other_args = fresh_client.post(url, json={"args": ["us"]})
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "b@example.com"})
+    other_user = fresh_client.post(url, json={"args": ["eu"]})
+
+    assert first.json() == second.json() == ["eu", "other"]
+    assert other_args.json() == ["us", "other"]
+    assert other_user.json() == ["eu", "other"]
+    assert counter.read_text().count("module") == 3
+    stats = backend_app.bff_cache_stats()["lookups.py:Lookups.countries"]
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+    assert stats["hit_ratio"] == 0.25
+
+
+def test_get_bff_http_cache_sends_etag_and_answers_not_modified(
+    monkeypatch, fresh_client, tmp_path
+):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "status.py").write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_http_cache, bff_http_methods
+
+        @backend_for_frontend
+        class Status:
+            @bff_http_methods("GET")
+            @bff_http_cache(max_age=15)
+            def read(self):
+                return {"ready": True}
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+
+    first = fresh_client.get("/classcall/status.py/Status/read")
+    assert first.status_code == 200
+    assert first.json() == {"ready": True}
+    assert first.headers["cache-control"] == "private, max-age=15"
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    revalidated = fresh_client.get(
+        "/classcall/status.py/Status/read", headers={"If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+    changed = fresh_client.get(
+        "/classcall/status.py/Status/read", headers={"If-None-Match": 'W/"stale"'}
+    )
+    assert changed.status_code == 200
+
+    service_worker = fresh_client.get("/frontend/sw.js")
+    assert 'url.pathname.startsWith("/classcall/")' in service_worker.text
+
+
+def test_bff_result_cache_single_flight_and_lru():
+    cache = BffResultCache(max_entries=1)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": len(calls)}
+
+    async def run():
+        results = await asyncio.gather(*(cache.get_or_load("op", "k1", 60, loader) for _ in range(5)))
+        await cache.get_or_load("op", "k2", 60, loader)
+        await cache.get_or_load("op", "k1", 60, loader)
+        return results
+
+    results = asyncio.run(run())
+    assert results == [{"value": 1}] * 5
+    assert len(calls) == 3
+    assert cache.stats()["op"]["coalesced"] == 4
+
+
+def test_bff_result_cache_followers_recover_when_leader_is_cancelled():
+    cache = BffResultCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        leader = asyncio.ensure_future(cache.get_or_load("op", "k", 60, loader))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.get_or_load("op", "k", 60, loader))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()) == 2
+    assert len(calls) == 2
+
+
+def test_bff_result_cache_survives_a_failing_shared_store():
+    class FailingStore:
+        def __init__(self):
+            self.threads = []
+
+        def get_fresh(self, key):
+            self.threads.append(threading.current_thread())
+            raise ConnectionError("upstash unreachable")
+
+        def set_with_ttl(self, key, value, ttl_seconds, cache_locally=True):
+            self.threads.append(threading.current_thread())
+            raise ConnectionError("upstash unreachable")
+
+    store = FailingStore()
+    cache = BffResultCache(shared_store=store)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": len(calls)}
+
+    async def run():
+        leader = asyncio.ensure_future(cache.get_or_load("op", "k", 60, loader))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(cache.get_or_load("op", "k", 60, loader))
+        return await asyncio.wait_for(asyncio.gather(leader, follower), timeout=2)
+
+    assert asyncio.run(run()) == [{"value": 1}, {"value": 1}]
+    assert len(calls) == 1
+    assert store.threads and threading.main_thread() not in store.threads
+
+
+def test_sync_bff_methods_run_in_declared_executor_and_shed_load(
+    monkeypatch, fresh_client, tmp_path
+):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "reports.py").write_text(textwrap.dedent("""
+        import threading
+        from pytincture.dataclass import backend_for_frontend, bff_executor
+
+        @backend_for_frontend
+        @bff_executor("reports", max_workers=1, max_queue=0)
+        class Reports:
+            def build(self):
+                return threading.current_thread().name
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+
+    response = fresh_client.post("/classcall/reports.py/Reports/build", json={})
+    assert response.status_code == 200
+    assert response.json().startswith("pytincture-bff-reports")
+
+    gate = threading.Event()
+    pool = backend_app.BFF_EXECUTORS.pool("reports")
+    blocker = threading.Thread(target=lambda: asyncio.run(pool.run(gate.wait)))
+    blocker.start()
+    try:
+        while pool.stats()["active"] == 0:
+            time.sleep(0.01)
+        shed = fresh_client.post("/classcall/reports.py/Reports/build", json={})
+    finally:
+        gate.set()
+        blocker.join()
+
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "1"
+    stats = backend_app.bff_executor_stats()["reports"]
+    assert stats["max_workers"] == 1
+    assert stats["completed"] == 2
+    assert stats["rejected"] == 1
+
+
+def test_process_mode_bff_method_runs_in_worker_and_kills_stuck_workers(
+    monkeypatch, fresh_client, tmp_path
+):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "crunch.py").write_text(textwrap.dedent("""
+        import os
+        import signal
+        import time
+        from pytincture.dataclass import backend_for_frontend, bff_execution
+
+        @backend_for_frontend
+        @bff_execution("process")
+        class Crunch:
+            def __init__(self, _user):
+                self._user = _user
+
+            def whoami(self, factor):
+                return {"pid": os.getpid(), "email": self._user["email"], "value": factor * 2}
+
+            def slow(self):
+                time.sleep(30)
+
+            def stuck(self):
+                signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+                time.sleep(30)
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_PROCESS_POOL", None)
+    monkeypatch.setattr(backend_app, "BFF_PROCESS_POOL_WORKERS", 1)
+    monkeypatch.setattr(backend_app, "BFF_PROCESS_KILL_GRACE_SECONDS", 0.5)
+    try:
+        response = fresh_client.post("/classcall/crunch.py/Crunch/whoami", json={"args": [21]})
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload["email"] == "a@example.com"
+        assert payload["value"] == 42
+        assert payload["pid"] != os.getpid()
+
+        monkeypatch.setattr(backend_app, "BFF_CALL_TIMEOUT_SECONDS", 0.5)
+        # The in-worker alarm interrupts the method and the worker stays warm.
+        timed_out = fresh_client.post("/classcall/crunch.py/Crunch/slow", json={})
+        assert timed_out.status_code == 504
+        stats = backend_app.bff_executor_stats()["process"]
+        assert stats["timeouts"] == 1
+        assert stats["killed"] == 0
+        again = fresh_client.post("/classcall/crunch.py/Crunch/whoami", json={"args": [1]})
+        assert again.json()["pid"] == payload["pid"]
+
+        # A worker that ignores its alarm is killed after the grace period.
+        killed = fresh_client.post("/classcall/crunch.py/Crunch/stuck", json={})
+        assert killed.status_code == 504
+        stats = backend_app.bff_executor_stats()["process"]
+        assert stats["killed"] == 1
+        assert stats["recycled"] == 1
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            try:
+                os.kill(payload["pid"], 0)
+            except ProcessLookupError:
+                break
+            os.waitpid(payload["pid"], os.WNOHANG)
+            time.sleep(0.05)
+        else:
+            pytest.fail("stuck worker process was not terminated")
+    finally:
+        if backend_app.BFF_PROCESS_POOL is not None:
+            backend_app.BFF_PROCESS_POOL.shutdown()
+
+
+def test_stuck_process_worker_does_not_break_concurrent_calls(monkeypatch, tmp_path):
+    import httpx
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "crunch.py").write_text(textwrap.dedent("""
+        import os
+        import signal
+        import time
+        from pytincture.dataclass import backend_for_frontend, bff_execution
+
+        @backend_for_frontend
+        @bff_execution("process")
+        class Crunch:
+            def pid(self):
+                time.sleep(0.3)
+                return os.getpid()
+
+            def work(self):
+                time.sleep(1.2)
+                return "done"
+
+            def stuck(self):
+                signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+                time.sleep(30)
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_PROCESS_POOL", None)
+    monkeypatch.setattr(backend_app, "BFF_PROCESS_POOL_WORKERS", 2)
+    monkeypatch.setattr(backend_app, "BFF_PROCESS_KILL_GRACE_SECONDS", 0.3)
+
+    async def run_calls():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="https://testserver") as client:
+            def call(function):
+                return client.post(f"/classcall/crunch.py/Crunch/{function}", json={})
+
+            # Start both workers before the timeout is tightened.
+            pids = await asyncio.gather(call("pid"), call("pid"))
+            monkeypatch.setattr(backend_app, "BFF_CALL_TIMEOUT_SECONDS", 1.5)
+            stuck = asyncio.ensure_future(call("stuck"))
+            await asyncio.sleep(1.0)
+            # Still running on the healthy worker when the stuck one is given up on.
+            work = await call("work")
+            return pids, await stuck, work
+
+    try:
+        pids, stuck, work = asyncio.run(run_calls())
+        assert len({response.json() for response in pids}) == 2
+        assert stuck.status_code == 504
+        assert work.status_code == 200 and work.json() == "done"
+        pool = backend_app.BFF_PROCESS_POOL
+        stats = pool.stats()
+        assert stats["killed"] == 1 and stats["recycled"] == 1
+        assert stats["in_flight"] == 0
+        assert pool._retired == set() and pool._in_flight == {}
+    finally:
+        if backend_app.BFF_PROCESS_POOL is not None:
+            backend_app.BFF_PROCESS_POOL.shutdown()
+
+
+def test_timed_out_sync_bff_method_is_cancelled_cooperatively(
+    monkeypatch, fresh_client, tmp_path
+):
+    import pytincture.backend.app as backend_app
+
+    marker = tmp_path / "cancelled.txt"
+    (tmp_path / "loops.py").write_text(textwrap.dedent(f"""
+        import time
+        from pytincture.dataclass import BffCancelled, backend_for_frontend, bff_check_cancelled
+
+        @backend_for_frontend
+        class Loops:
+            def spin(self):
+                try:
+                    for _ in range(600):
+                        bff_check_cancelled()
+                        time.sleep(0.05)
+                except BffCancelled:
+                    with open({str(marker)!r}, "w") as handle:
+                        handle.write(str(self._bff_cancel_token.is_set()))
+                    raise
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_CALL_TIMEOUT_SECONDS", 0.3)
+
+    response = fresh_client.post("/classcall/loops.py/Loops/spin", json={})
+    assert response.status_code == 504
+
+    deadline = time.monotonic() + 5
+    while not marker.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert marker.read_text() == "True"
+    pool = backend_app.BFF_EXECUTORS.pool()
+    deadline = time.monotonic() + 5
+    while pool.stats()["zombies"] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    stats = pool.stats()
+    assert stats["abandoned"] == 1
+    assert stats["zombies"] == 0
+
+
+def test_uncooperative_timed_out_calls_are_capped(monkeypatch, fresh_client, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    gate = tmp_path / "release"
+    (tmp_path / "blocker.py").write_text(textwrap.dedent(f"""
+        import os
+        import time
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Blocker:
+            def wait(self):
+                deadline = time.monotonic() + 10
+                while not os.path.exists({str(gate)!r}) and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                return "done"
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_CALL_TIMEOUT_SECONDS", 0.2)
+    monkeypatch.setattr(backend_app, "BFF_EXECUTORS", backend_app.BffExecutorRegistry(max_zombies=1))
+
+    first = fresh_client.post("/classcall/blocker.py/Blocker/wait", json={})
+    assert first.status_code == 504
+    shed = fresh_client.post("/classcall/blocker.py/Blocker/wait", json={})
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == str(backend_app.BFF_EXECUTOR_RETRY_AFTER_SECONDS)
+
+    gate.write_text("")
+    pool = backend_app.BFF_EXECUTORS.pool()
+    deadline = time.monotonic() + 5
+    while pool.stats()["zombies"] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert pool.stats()["rejected"] == 1
+    ok = fresh_client.post("/classcall/blocker.py/Blocker/wait", json={})
+    assert ok.status_code == 200
+    assert ok.json() == "done"
+    backend_app.BFF_EXECUTORS.shutdown()
+
+
+async def _asgi_call(
+    path: str,
+    disconnect_when,
+    method: str = "POST",
+    body: bytes = b"{}",
+    send_hook=None,
+    headers=(),
+):
+    """Drive the ASGI app directly and disconnect the client once ``disconnect_when(messages)``."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "https",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 443),
+    }
+    messages = []
+    disconnected = asyncio.Event()
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if send_hook is not None:
+            await send_hook(message)
+        messages.append(message)
+
+    async def watch():
+        while not disconnect_when(messages):
+            await asyncio.sleep(0.02)
+        disconnected.set()
+
+    watcher = asyncio.ensure_future(watch())
+    try:
+        await asyncio.wait_for(app(scope, receive, send), timeout=10)
+    finally:
+        watcher.cancel()
+    return messages
+
+
+def _run_asgi_until_disconnect(path: str, disconnect_when, **kwargs):
+    return asyncio.run(_asgi_call(path, disconnect_when, **kwargs))
+
+
+def _response_body(messages) -> bytes:
+    return b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+
+
+def test_client_disconnect_cancels_in_flight_bff_calls(monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "dashboard.py").write_text(textwrap.dedent(f"""
+        import asyncio
+        import time
+        from pytincture.dataclass import BffCancelled, backend_for_frontend, bff_check_cancelled
+
+        TMP = {str(tmp_path)!r}
+
+        def mark(name):
+            open(TMP + "/" + name, "w").close()
+
+        @backend_for_frontend
+        class Dashboard:
+            async def load_async(self):
+                mark("async-started")
+                try:
+                    await asyncio.sleep(30)
+                except asyncio.CancelledError:
+                    mark("async-cancelled")
+                    raise
+
+            def load_sync(self):
+                mark("sync-started")
+                try:
+                    for _ in range(600):
+                        bff_check_cancelled()
+                        time.sleep(0.02)
+                except BffCancelled:
+                    mark("sync-cancelled")
+                    raise
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+
+    for kind in ("async", "sync"):
+        started = time.monotonic()
+        messages = _run_asgi_until_disconnect(
+            f"/classcall/dashboard.py/Dashboard/load_{kind}",
+            lambda _: (tmp_path / f"{kind}-started").exists(),
+        )
+        assert time.monotonic() - started < 5
+        assert messages[0]["status"] == 499
+        deadline = time.monotonic() + 5
+        while not (tmp_path / f"{kind}-cancelled").exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert (tmp_path / f"{kind}-cancelled").exists()
+
+
+@pytest.mark.parametrize("function_name", ["ticks_async", "ticks_sync"])
+def test_client_disconnect_closes_streaming_generators(monkeypatch, tmp_path, function_name):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "ticker.py").write_text(textwrap.dedent(f"""
+        import asyncio
+        import time
+        from pytincture.dataclass import backend_for_frontend, bff_stream
+
+        CLOSED = {str(tmp_path / "closed")!r}
+
+        @backend_for_frontend
+        class Ticker:
+            @bff_stream
+            async def ticks_async(self):
+                try:
+                    tick = 0
+                    while True:
+                        yield {{"tick": tick}}
+                        tick += 1
+                        await asyncio.sleep(0.02)
+                finally:
+                    open(CLOSED, "w").close()
+
+            @bff_stream
+            def ticks_sync(self):
+                try:
+                    tick = 0
+                    while True:
+                        yield {{"tick": tick}}
+                        tick += 1
+                        time.sleep(0.02)
+                finally:
+                    open(CLOSED, "w").close()
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+
+    def received_a_tick(messages):
+        return any(m["type"] == "http.response.body" and m.get("body") for m in messages)
+
+    started = time.monotonic()
+    messages = _run_asgi_until_disconnect(
+        f"/classcall/ticker.py/Ticker/{function_name}", received_a_tick
+    )
+    assert time.monotonic() - started < 5
+    assert messages[0]["status"] == 200
+    assert b'{"tick": 0}' in b"".join(m.get("body", b"") for m in messages[1:])
+    assert (tmp_path / "closed").exists()
+
+
+def test_sync_streams_are_coalesced_and_measured(monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "tokens.py").write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_stream
+
+        @backend_for_frontend
+        class Tokens:
+            @bff_stream(raw=True)
+            def generate(self, count):
+                for index in range(count):
+                    yield f"t{index} "
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_STREAM_COALESCE_BYTES", 256)
+
+    messages = _run_asgi_until_disconnect(
+        "/classcall/tokens.py/Tokens/generate",
+        lambda _: False,
+        body=json.dumps({"kwargs": {"count": 500}}).encode(),
+    )
+    writes = [m["body"] for m in messages if m["type"] == "http.response.body" and m.get("body")]
+    assert b"".join(writes).decode() == "".join(f"t{index} " for index in range(500))
+    assert len(writes) < 100
+
+    stats = backend_app.bff_stream_stats()
+    assert stats["active"] == []
+    totals = stats["operations"]["tokens.py:Tokens.generate"]
+    assert totals["streams"] == 1
+    assert totals["abandoned"] == 0
+    assert totals["items"] == 500
+    assert totals["bytes"] == len(b"".join(writes))
+    assert totals["writes"] == len(writes)
+    assert totals["items_per_second"] > 0
+
+
+def test_slow_clients_pause_sync_stream_producers(monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    counter = tmp_path / "produced"
+    (tmp_path / "firehose.py").write_text(textwrap.dedent(f"""
+        from pytincture.dataclass import backend_for_frontend, bff_stream
+
+        @backend_for_frontend
+        class Firehose:
+            @bff_stream
+            def lines(self):
+                produced = 0
+                while True:
+                    produced += 1
+                    with open({str(counter)!r}, "w") as handle:
+                        handle.write(str(produced))
+                    yield {{"line": produced}}
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_STREAM_QUEUE_ITEMS", 4)
+    monkeypatch.setattr(backend_app, "BFF_STREAM_COALESCE_BYTES", 1)
+    observed = {}
+
+    async def slow_client(message):
+        if message["type"] == "http.response.body" and "produced" not in observed:
+            await asyncio.sleep(0.3)
+            observed["produced"] = int(counter.read_text())
+
+    _run_asgi_until_disconnect(
+        "/classcall/firehose.py/Firehose/lines",
+        lambda _: "produced" in observed,
+        send_hook=slow_client,
+    )
+    # The first write, the queue, and one blocked put are all that may run ahead.
+    assert observed["produced"] <= 4 + 3
+    assert backend_app.bff_stream_stats()["operations"]["firehose.py:Firehose.lines"]["abandoned"] == 1
+
+
+def _sse_events(payload: bytes):
+    events = []
+    for block in payload.decode().split("\n\n"):
+        fields = {}
+        for line in block.split("\n"):
+            if line and not line.startswith(":"):
+                name, _, value = line.partition(": ")
+                fields.setdefault(name, []).append(value)
+        if fields:
+            events.append(fields)
+    return events
+
+
+def test_sse_streams_resume_from_last_event_id_without_rerunning(monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    runs = tmp_path / "runs"
+    (tmp_path / "jobs.py").write_text(textwrap.dedent(f"""
+        import asyncio
+        from pytincture.dataclass import backend_for_frontend, bff_stream
+
+        @backend_for_frontend
+        class Jobs:
+            @bff_stream(sse=True)
+            async def progress(self, steps):
+                with open({str(runs)!r}, "a") as handle:
+                    handle.write("run\\n")
+                for step in range(1, steps + 1):
+                    await asyncio.sleep(0.02)
+                    yield {{"step": step}}
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    path = "/classcall/jobs.py/Jobs/progress"
+    request_body = json.dumps({"kwargs": {"steps": 6}}).encode()
+
+    async def scenario():
+        first = await _asgi_call(
+            path, lambda messages: b"data:" in _response_body(messages), body=request_body
+        )
+        first_events = [event for event in _sse_events(_response_body(first)) if "id" in event]
+        await asyncio.sleep(0.3)  # The job keeps running while nobody is connected.
+        second = await _asgi_call(
+            path,
+            lambda _: False,
+            body=request_body,
+            headers=[(b"last-event-id", first_events[-1]["id"][0].encode())],
+        )
+        return first, first_events, second
+
+    first, first_events, second = asyncio.run(scenario())
+    assert first[0]["status"] == 200
+    assert dict(first[0]["headers"])[b"content-type"].startswith(b"text/event-stream")
+    assert _sse_events(_response_body(first))[0] == {"retry": ["1000"]}
+    resumed = _sse_events(_response_body(second))
+    steps = [json.loads(event["data"][0])["step"] for event in first_events + resumed if "id" in event]
+    assert steps == [1, 2, 3, 4, 5, 6]
+    assert resumed[-1] == {"event": ["end"], "data": ["{}"]}
+    assert runs.read_text() == "run\n"
+
+
+def test_sse_streams_wait_for_slow_subscribers_and_report_gaps():
+    from pytincture.backend.streaming import BffSseRegistry
+
+    async def scenario():
+        produced = []
+
+        async def chunks():
+            for index in range(10):
+                produced.append(index)
+                yield str(index).encode()
+
+        stream = BffSseRegistry(buffer_events=3).create("owner", chunks())
+        await asyncio.sleep(0.05)
+        # Three events are buffered and the fourth waits for a subscriber.
+        held = list(produced)
+        frames = [frame async for frame in stream.subscribe(0)]
+        # A resume from before the oldest buffered event cannot be served.
+        late = [frame async for frame in stream.subscribe(2)]
+        return held, frames, late
+
+    held, frames, late = asyncio.run(scenario())
+    assert held == [0, 1, 2, 3]
+    events = _sse_events(b"".join(frames))
+    assert [event["data"][0] for event in events if "id" in event] == [str(index) for index in range(10)]
+    assert events[-1] == {"event": ["end"], "data": ["{}"]}
+    assert _sse_events(b"".join(late))[-1] == {"event": ["gap"], "data": ["{}"]}
+
+
+def test_sse_resume_with_unknown_event_id_is_rejected(monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    runs = tmp_path / "runs"
+    (tmp_path / "jobs.py").write_text(textwrap.dedent(f"""
+        from pytincture.dataclass import backend_for_frontend, bff_stream
+
+        @backend_for_frontend
+        class Jobs:
+            @bff_stream(sse=True)
+            async def progress(self):
+                open({str(runs)!r}, "a").close()
+                yield {{"step": 1}}
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+
+    messages = asyncio.run(_asgi_call(
+        "/classcall/jobs.py/Jobs/progress",
+        lambda _: False,
+        headers=[(b"last-event-id", b"expired-stream.4")],
+    ))
+    assert messages[0]["status"] == 410
+    assert not runs.exists()
+
+
+def test_sse_streams_send_keepalives_and_expire_without_subscribers(monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    closed = tmp_path / "closed"
+    (tmp_path / "tail.py").write_text(textwrap.dedent(f"""
+        import asyncio
+        from pytincture.dataclass import backend_for_frontend, bff_stream
+
+        @backend_for_frontend
+        class Tail:
+            @bff_stream(sse=True, raw=True)
+            async def follow(self):
+                try:
+                    yield "line one\\nline two"
+                    while True:
+                        await asyncio.sleep(0.25)
+                        yield "more"
+                finally:
+                    open({str(closed)!r}, "w").close()
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(
+        backend_app,
+        "BFF_SSE_STREAMS",
+        backend_app.BffSseRegistry(resume_seconds=0.2, keepalive_seconds=0.05),
+    )
+
+    async def scenario():
+        messages = await _asgi_call(
+            "/classcall/tail.py/Tail/follow",
+            lambda messages: b": keepalive" in _response_body(messages),
+        )
+        deadline = time.monotonic() + 5
+        while not closed.exists() and time.monotonic() < deadline:
+            await asyncio.sleep(0.02)
+        return messages
+
+    payload = _response_body(asyncio.run(scenario()))
+    assert b"data: line one\ndata: line two\n\n" in payload
+    assert closed.exists()
+    assert backend_app.bff_stream_stats()["sse"]["streams"] == 0
+
+
+def test_bff_websocket_is_disabled_by_default(fresh_client):
+    from starlette.websockets import WebSocketDisconnect
+
+    with pytest.raises(WebSocketDisconnect) as excinfo:
+        with fresh_client.websocket_connect("/classcall/_ws"):
+            pass
+    assert excinfo.value.code == 4404
+
+
+def test_bff_websocket_multiplexes_calls_and_streams(fresh_client, monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "board.py").write_text(textwrap.dedent("""
+        import asyncio
+        from pytincture.dataclass import backend_for_frontend, bff_http_methods, bff_stream
+
+        @backend_for_frontend
+        class Board:
+            @bff_http_methods("GET")
+            def status(self):
+                return "ok"
+
+            async def slow(self, value):
+                await asyncio.sleep(0.2)
+                return {"slow": value}
+
+            def fast(self, value):
+                return {"fast": value}
+
+            def boom(self):
+                raise ValueError("secret detail")
+
+            @bff_stream
+            def rows(self, count):
+                for index in range(count):
+                    yield {"row": index}
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "ENABLE_BFF_WEBSOCKET", True)
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+
+    def call(call_id, function, *args):
+        return {
+            "id": call_id,
+            "type": "call",
+            "file": "board.py",
+            "class": "Board",
+            "function": function,
+            "args": list(args),
+        }
+
+    with fresh_client.websocket_connect("/classcall/_ws") as websocket:
+        websocket.send_bytes(json.dumps(call(0, "fast", "x")).encode())
+        assert websocket.receive_json() == {
+            "id": None, "type": "error", "status": 400, "error": "Invalid BFF WebSocket message",
+        }
+        websocket.send_json(call(1, "slow", "a"))
+        websocket.send_json(call(2, "fast", "b"))
+        websocket.send_json(call(3, "rows", 3))
+        websocket.send_json(call(4, "boom"))
+        websocket.send_json(call(5, "missing"))
+        websocket.send_json(call(6, "status"))
+        messages = {}
+        while len([m for m in messages.values() if m[-1]["type"] != "chunk"]) < 6:
+            message = websocket.receive_json()
+            messages.setdefault(message["id"], []).append(message)
+
+    assert messages[1] == [{"id": 1, "type": "result", "status": 200, "result": {"slow": "a"}}]
+    assert messages[2] == [{"id": 2, "type": "result", "status": 200, "result": {"fast": "b"}}]
+    streamed = "".join(m["data"] for m in messages[3] if m["type"] == "chunk")
+    assert [json.loads(line) for line in streamed.splitlines()] == [{"row": 0}, {"row": 1}, {"row": 2}]
+    assert messages[3][-1] == {"id": 3, "type": "end"}
+    assert messages[4] == [{"id": 4, "type": "error", "status": 500, "error": "Internal server error"}]
+    assert messages[5][0]["status"] == 404
+    assert messages[6][0]["status"] == 405
+
+
+def test_bff_websocket_checks_csrf_and_origin_at_handshake(
+    fresh_client, monkeypatch, dummy_module
+):
+    from starlette.websockets import WebSocketDisconnect
+    import pytincture.backend.app as backend_app
+
+    monkeypatch.setattr(backend_app, "ENABLE_GOOGLE_AUTH", False)
+    monkeypatch.setattr(backend_app, "ENABLE_USER_LOGIN", True)
+    monkeypatch.setattr(backend_app, "ENABLE_DEV_EMAIL_LOGIN", True)
+    monkeypatch.setattr(backend_app, "ENABLE_BFF_WEBSOCKET", True)
+    monkeypatch.setenv("ALLOWED_EMAILS", "person@example.com")
+    monkeypatch.setenv("MODULES_PATH", str(dummy_module))
+
+    with pytest.raises(WebSocketDisconnect) as excinfo:
+        with fresh_client.websocket_connect("/classcall/_ws"):
+            pass
+    assert excinfo.value.code == 4401
+
+    fresh_client.post(
+        "/demoapp/auth/user",
+        data={"email": "person@example.com", "password": "local"},
+        follow_redirects=False,
+    )
+    token = fresh_client.cookies.get("pytincture_csrf")
+    # The test client connects over ws://, which would drop the secure session cookie.
+    cookie = "; ".join(f"{name}={value}" for name, value in fresh_client.cookies.items())
+    for url, origin in (
+        ("/classcall/_ws", "http://testserver"),
+        (f"/classcall/_ws?csrf={token}", "http://evil.example.com"),
+    ):
+        with pytest.raises(WebSocketDisconnect) as excinfo:
+            with fresh_client.websocket_connect(url, headers={"origin": origin, "cookie": cookie}):
+                pass
+        assert excinfo.value.code == 4403
+
+    with fresh_client.websocket_connect(
+        f"/classcall/_ws?csrf={token}",
+        headers={"origin": "http://testserver", "cookie": cookie},
+    ) as websocket:
+        websocket.send_json({
+            "id": "x",
+            "type": "call",
+            "file": "example.py",
+            "class": "ExampleClass",
+            "function": "testfunc",
+            "kwargs": {"a": 1},
+        })
+        reply = websocket.receive_json()
+    assert reply["id"] == "x"
+    assert reply["result"]["kwargs"] == {"a": 1}
+
+
+def test_bff_upload_streams_large_bodies_past_the_global_limit(fresh_client, monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "imports.py").write_text(textwrap.dedent("""
+        import hashlib
+        from pytincture.dataclass import backend_for_frontend, bff_upload
+
+        @backend_for_frontend
+        class Imports:
+            @bff_upload("csv_file")
+            def load_csv(self, csv_file, table):
+                digest = hashlib.sha256()
+                size = 0
+                while chunk := csv_file.read(65536):
+                    digest.update(chunk)
+                    size += len(chunk)
+                return {"table": table, "size": size, "sha256": digest.hexdigest(),
+                        "on_disk": csv_file._rolled}
+
+            @bff_upload(max_bytes=1000)
+            def small(self, upload):
+                return len(upload.read())
+
+            def plain(self, *args):
+                return len(args)
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_UPLOAD_SPOOL_BYTES", 64 * 1024)
+    body = os.urandom(1024) * (3 * backend_app.MAX_REQUEST_BODY_BYTES // 1024)
+
+    def chunks():
+        for offset in range(0, len(body), 256 * 1024):
+            yield body[offset:offset + 256 * 1024]
+
+    response = fresh_client.post(
+        "/classcall/imports.py/Imports/load_csv?table=orders", content=chunks()
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "table": "orders",
+        "size": len(body),
+        "sha256": hashlib.sha256(body).hexdigest(),
+        "on_disk": True,
+    }
+
+    assert fresh_client.post("/classcall/imports.py/Imports/small", content=b"x" * 1001).status_code == 413
+    assert fresh_client.post("/classcall/imports.py/Imports/small", content=b"x" * 10).json() == 10
+    oversized = json.dumps({"args": ["x" * backend_app.MAX_REQUEST_BODY_BYTES]})
+    assert fresh_client.post("/classcall/imports.py/Imports/plain", content=oversized).status_code == 413
+
+
+def test_binary_bff_results_skip_json_encoding(fresh_client, monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF-" + bytes(range(256)) * 64)
+    (tmp_path / "reports.py").write_text(textwrap.dedent(f"""
+        import io
+        import pathlib
+        import tempfile
+        from pytincture.dataclass import backend_for_frontend
+
+        REPORT = {str(report)!r}
+
+        @backend_for_frontend
+        class Reports:
+            def raw(self):
+                return bytes(range(256))
+
+            async def view(self):
+                return memoryview(bytearray(b"abc"))
+
+            def pdf(self) -> pathlib.Path:
+                return pathlib.Path(REPORT)
+
+            def handle(self):
+                return open(REPORT, "rb")
+
+            def buffer(self):
+                return io.BytesIO(b"in memory")
+
+            def temporary(self):
+                file = tempfile.NamedTemporaryFile()
+                file.write(b"temporary")
+                file.seek(0)
+                return file
+
+            def seeked(self):
+                file = open(REPORT, "rb")
+                file.seek(5)
+                return file
+
+            def text(self):
+                return io.StringIO("text")
+
+            def missing(self):
+                return pathlib.Path(REPORT + ".gone")
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+
+    def call(function, **kwargs):
+        return fresh_client.post(f"/classcall/reports.py/Reports/{function}", json={}, **kwargs)
+
+    raw = call("raw")
+    assert raw.content == bytes(range(256))
+    assert raw.headers["content-type"] == "application/octet-stream"
+    assert raw.headers["x-pytincture-result"] == "binary"
+    assert call("view").content == b"abc"
+    assert call("buffer").content == b"in memory"
+
+    pdf = call("pdf")
+    assert pdf.content == report.read_bytes()
+    assert pdf.headers["content-type"] == "application/pdf"
+    assert pdf.headers["accept-ranges"] == "bytes"
+    partial = call("handle", headers={"Range": "bytes=0-4"})
+    assert partial.status_code == 206
+    assert partial.content == b"%PDF-"
+    assert call("missing").status_code == 404
+
+    assert call("temporary").content == b"temporary"
+    seeked = call("seeked")
+    assert seeked.content == report.read_bytes()[5:]
+    assert "accept-ranges" not in seeked.headers
+    assert call("text").status_code == 500
+
+
+def _write_arrow_grid_module(tmp_path):
+    (tmp_path / "grid.py").write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_result
+
+        @backend_for_frontend
+        class Grid:
+            @bff_result("arrow")
+            def rows(self, count):
+                return [{"id": index, "name": f"row {index}"} for index in range(count)]
+    """))
+
+
+def test_arrow_result_mode_falls_back_to_json_rows(fresh_client, monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    _write_arrow_grid_module(tmp_path)
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "arrow_available", lambda: False)
+
+    response = fresh_client.post(
+        "/classcall/grid.py/Grid/rows",
+        json={"args": [2]},
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+    assert response.status_code == 200
+    assert response.json() == [{"id": 0, "name": "row 0"}, {"id": 1, "name": "row 1"}]
+
+
+def test_arrow_result_mode_sends_ipc_stream(fresh_client, monkeypatch, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+    import pytincture.backend.app as backend_app
+
+    _write_arrow_grid_module(tmp_path)
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+
+    response = fresh_client.post(
+        "/classcall/grid.py/Grid/rows",
+        json={"args": [1000]},
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    assert response.headers["x-pytincture-result"] == "arrow"
+    table = pyarrow.ipc.open_stream(pyarrow.py_buffer(response.content)).read_all()
+    assert table.num_rows == 1000
+    assert table.to_pylist()[999] == {"id": 999, "name": "row 999"}
+
+
+def test_metrics_endpoint_reports_bff_phases_and_failures(fresh_client, monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "report.py").write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Report:
+            def total(self, values):
+                return sum(values)
+
+            def broken(self):
+                raise RuntimeError("boom")
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_METRICS", backend_app.BffMetrics())
+
+    assert fresh_client.get("/metrics").status_code == 404
+    monkeypatch.setattr(backend_app, "ENABLE_BFF_METRICS", True)
+    monkeypatch.setattr(backend_app, "BFF_METRICS_TOKEN", "scrape-secret")
+
+    assert fresh_client.post("/classcall/report.py/Report/total", json={"args": [[1, 2, 3]]}).json() == 6
+    lenient_client = TestClient(app, base_url="https://testserver", raise_server_exceptions=False)
+    assert lenient_client.post("/classcall/report.py/Report/broken", json={}).status_code == 500
+    assert fresh_client.post("/classcall/report.py/Missing/total", json={}).status_code == 404
+    batch = fresh_client.post("/classcall/_batch", json={"calls": [
+        {"file": "report.py", "class": "Report", "function": "total", "args": [[1]]},
+        {"file": "report.py", "class": "Report", "function": "broken"},
+        {"file": "report.py", "class": "Missing", "function": "total"},
+    ]})
+    assert [item["status"] for item in batch.json()["results"]] == [200, 500, 404]
+    monkeypatch.setattr(backend_app, "ENABLE_BFF_WEBSOCKET", True)
+    with fresh_client.websocket_connect("/classcall/_ws") as websocket:
+        websocket.send_json({"id": 1, "file": "report.py", "class": "Report", "function": "total", "args": [[2]]})
+        assert websocket.receive_json()["result"] == 2
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: None)
+    assert fresh_client.post("/classcall/report.py/Report/total", json={}).status_code == 401
+    assert fresh_client.post("/classcall/report.py/Missing/total", json={}).status_code == 401
+
+    assert fresh_client.get("/metrics").status_code == 401
+    response = fresh_client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    total = 'file="report.py",class="Report",function="total"'
+    broken = 'file="report.py",class="Report",function="broken"'
+    # Direct, batched, and WebSocket calls are all counted; so are rejected
+    # calls to registered operations, but never calls to unknown ones.
+    assert f'pytincture_bff_requests_total{{{total},status="200"}} 3' in body
+    assert f'pytincture_bff_requests_total{{{total},status="401"}} 1' in body
+    assert f'pytincture_bff_errors_total{{{broken}}} 2' in body
+    assert f"pytincture_bff_in_flight{{{total}}} 0" in body
+    assert f'pytincture_bff_phase_seconds_count{{{total},phase="auth"}} 2' in body
+    for phase in ("replay", "load", "instantiate", "execute", "serialize"):
+        assert f'pytincture_bff_phase_seconds_count{{{total},phase="{phase}"}} 1' in body
+    assert 'class="Missing"' not in body
+    assert "getMetrics" not in json.dumps(fresh_client.get("/openapi.json").json())
+
+
+def test_tracing_spans_continue_traceparent_and_follow_correlation_id(fresh_client, monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+    from pytincture.backend.tracing import FileSpanExporter, Tracer
+
+    modules = tmp_path / "modules"
+    modules.mkdir()
+    (modules / "report.py").write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Report:
+            def total(self, values):
+                return sum(values)
+    """))
+    trace_file = tmp_path / "spans.jsonl"
+    tracer = Tracer([FileSpanExporter(str(trace_file))])
+    monkeypatch.setenv("MODULES_PATH", str(modules))
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: {"email": "a@example.com"})
+    monkeypatch.setattr(backend_app, "BFF_TRACER", tracer)
+
+    trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+    response = fresh_client.post(
+        "/classcall/report.py/Report/total",
+        json={"args": [[1, 2]]},
+        headers={"traceparent": f"00-{trace_id}-{parent_id}-01"},
+    )
+    assert response.json() == 3
+    assert response.headers["x-request-id"] == trace_id
+
+    correlation_id = "0af7651916cd43dd8448eb211c80319c"
+    response = fresh_client.get("/classcall/report.py/Report/total", headers={"X-Request-ID": correlation_id})
+    assert response.status_code == 405
+
+    expected = {
+        "session.load", "bff.auth", "bff.csrf", "bff.replay", "bff.policy",
+        "bff.load", "bff.instantiate", "bff.execute", "bff.serialize",
+    }
+    spans = []
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        tracer.flush()
+        lines = trace_file.read_text().splitlines() if trace_file.exists() else []
+        spans = [
+            span
+            for line in lines
+            for resource in json.loads(line)["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+        if len({span["name"] for span in spans} & expected) == len(expected) and len(
+            [span for span in spans if span["kind"] == 2]
+        ) == 2:
+            break
+        time.sleep(0.05)
+
+    roots = {span["traceId"]: span for span in spans if span["kind"] == 2}
+    assert roots[trace_id]["parentSpanId"] == parent_id
+    assert "parentSpanId" not in roots[correlation_id]
+    children = [span for span in spans if span["traceId"] == trace_id and span["kind"] == 1]
+    assert {span["name"] for span in children} == expected
+    assert all(span["parentSpanId"] == roots[trace_id]["spanId"] for span in children)
+    attributes = {item["key"]: item["value"] for item in roots[trace_id]["attributes"]}
+    assert attributes["pytincture.bff.operation"] == {"stringValue": "report.py:Report.total"}
+    assert attributes["http.response.status_code"] == {"intValue": "200"}
+
+
+def test_profiler_endpoint_labels_samples_with_bff_operations(fresh_client, monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    (tmp_path / "busy.py").write_text(textwrap.dedent("""
+        import time
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Busy:
+            def spin(self, seconds):
+                deadline = time.monotonic() + seconds
+                while time.monotonic() < deadline:
+                    pass
+                return "done"
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    user = {"email": "Ops@Example.com", "is_authenticated": True}
+    monkeypatch.setattr(backend_app, "require_auth", lambda request: user)
+    monkeypatch.setattr(backend_app, "BFF_PROFILER_ADMINS", {"ops@example.com"})
+    monkeypatch.setattr(backend_app, "_validate_csrf", lambda request, user: None)
+
+    assert fresh_client.get("/_pytincture/profile?seconds=0.1").status_code == 404
+    monkeypatch.setattr(backend_app, "ENABLE_BFF_PROFILER", True)
+    user["email"] = "someone@example.com"
+    assert fresh_client.get("/_pytincture/profile?seconds=0.1").status_code == 403
+    user["email"] = "Ops@Example.com"
+
+    results = {}
+    worker = threading.Thread(
+        target=lambda: results.setdefault(
+            "spin", fresh_client.post("/classcall/busy.py/Busy/spin", json={"args": [1.5]})
+        )
+    )
+    worker.start()
+    time.sleep(0.2)
+    collapsed = fresh_client.get("/_pytincture/profile?seconds=0.5&interval_ms=2")
+    speedscope = fresh_client.get("/_pytincture/profile?seconds=0.2&format=speedscope")
+    worker.join()
+
+    assert results["spin"].json() == "done"
+    assert collapsed.status_code == 200
+    spin_stacks = [line for line in collapsed.text.splitlines() if line.startswith("busy.py:Busy.spin;")]
+    assert spin_stacks and all("spin (busy.py:" in line for line in spin_stacks)
+    document = speedscope.json()
+    assert document["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    profile = next(item for item in document["profiles"] if item["name"] == "busy.py:Busy.spin")
+    names = {document["shared"]["frames"][index]["name"] for index in profile["samples"][0]}
+    assert "spin" in names
+
 # ---------------------------------------------------------------------
 # Additional Tests for Increased Coverage
 # ---------------------------------------------------------------------
@@ -1077,6 +2801,28 @@ def test_service_worker_skips_cache_for_uuid_busted_appcode(fresh_client):
     assert 'url.pathname.endsWith("/appcode/appcode.pyt")' in response.text
     assert 'url.searchParams.has("uuid")' in response.text
 
+
+def test_frontend_runtime_supports_chunked_appcode(fresh_client, monkeypatch, tmp_path):
+    import pytincture.backend.app as backend_app
+
+    runtime = fresh_client.get("/frontend/pytincture.js").text
+    assert 'config.appcodeMode === "chunked"' in runtime
+    assert "sys.meta_path.insert" in runtime
+    assert "manifest.prefetch" in runtime
+    worker = fresh_client.get("/frontend/sw.js").text
+    assert 'url.pathname.includes("/appcode/modules/")' in worker
+
+    modules = tmp_path / "modules"
+    modules.mkdir()
+    (modules / "shop.py").write_text("VALUE = 1\n")
+    monkeypatch.setattr(backend_app, "ENABLE_GOOGLE_AUTH", False)
+    monkeypatch.setenv("MODULES_PATH", str(modules))
+    monkeypatch.setenv("PYTINCTURE_APPCODE_MODE", "chunked")
+    assert 'appcodeMode: "chunked"' in fresh_client.get("/shop").text
+    monkeypatch.setenv("PYTINCTURE_APPCODE_MODE", "zip")
+    with pytest.raises(RuntimeError, match="PYTINCTURE_APPCODE_MODE"):
+        backend_app._render_index_html("shop")
+
 def test_get_widgetset(tmp_path, monkeypatch):
     """
     Test get_widgetset returns the correct widgetset string.
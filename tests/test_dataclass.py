@@ -1,5 +1,10 @@
 import ast
+import asyncio
+import json
 import os
+import re
+import sys
+import types
 import textwrap
 import pytest
 from os import sep
@@ -7,7 +12,11 @@ from pathlib import Path
 
 # Import functions to test from dataclass.py
 from pytincture.dataclass import (
+    BffCancelled,
+    _CURRENT_CANCEL_TOKEN,
     backend_for_frontend,
+    bff_check_cancelled,
+    bff_cache,
     bff_http_methods,
     bff_stream,
     get_bff_manifest,
@@ -58,6 +67,32 @@ def test_backend_for_frontend_passes_user_into_constructor():
     assert instance._real_instance.user == {"email": "tester@example.com"}
 
 
+def test_bff_check_cancelled_follows_the_call_token():
+    """Methods see their call's cancellation token and can bail out cooperatively."""
+    import threading
+
+    @backend_for_frontend
+    class Worker:
+        def step(self):
+            bff_check_cancelled()
+            return "ok"
+
+    token = threading.Event()
+    instance = Worker(_user="tester", _bff_cancel_token=token)
+    assert instance._real_instance._bff_cancel_token is token
+
+    context_token = _CURRENT_CANCEL_TOKEN.set(token)
+    try:
+        assert instance.step() == "ok"
+        token.set()
+        with pytest.raises(BffCancelled):
+            instance.step()
+    finally:
+        _CURRENT_CANCEL_TOKEN.reset(context_token)
+    # Outside a BFF call there is nothing to cancel.
+    assert instance.step() == "ok"
+
+
 def test_backend_for_frontend_stream_registration():
     """Ensure streaming metadata is recorded for documentation."""
     previous_routes = dict(bff_routes)
@@ -106,6 +141,222 @@ def test_bff_http_methods_and_static_manifest(tmp_path):
     assert manifest[("Reports", "refresh")]["http_methods"] == ("POST",)
 
 
+def test_bff_cache_is_declared_in_static_manifest(tmp_path):
+    file_path = tmp_path / "lookups.py"
+    file_path.write_text(textwrap.dedent("""
+        import pytincture.dataclass as bff
+
+        @bff.backend_for_frontend
+        class Lookups:
+            @bff.bff_cache(30, vary_on=("args",))
+            def countries(self, region):
+                return [region]
+
+            @bff.bff_cache(ttl=5)
+            def profile(self):
+                return {}
+    """))
+
+    manifest = get_bff_manifest(str(file_path))
+    assert manifest[("Lookups", "countries")]["cache"] == {"ttl": 30.0, "vary_on": ("args",)}
+    assert manifest[("Lookups", "profile")]["cache"] == {"ttl": 5.0, "vary_on": ("user", "args")}
+
+
+def test_bff_cache_rejects_invalid_configuration(tmp_path):
+    with pytest.raises(ValueError):
+        bff_cache(ttl=0)
+    with pytest.raises(ValueError):
+        bff_cache(vary_on=("session",))
+
+    file_path = tmp_path / "ticker.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_cache, bff_stream
+
+        @backend_for_frontend
+        class Ticker:
+            @bff_cache(ttl=10)
+            @bff_stream
+            def ticks(self):
+                yield 1
+    """))
+    with pytest.raises(ValueError):
+        get_bff_manifest(str(file_path))
+
+    for decorators, annotation in (("", " -> bytes"), ("@bff_result('arrow')\n                ", "")):
+        file_path.write_text(textwrap.dedent(f"""
+            from pytincture.dataclass import backend_for_frontend, bff_cache, bff_result
+
+            @backend_for_frontend
+            class Ticker:
+                @bff_cache(ttl=10)
+                {decorators}def export(self){annotation}:
+                    return b""
+        """))
+        with pytest.raises(ValueError, match="binary or arrow"):
+            get_bff_manifest(str(file_path))
+
+
+def test_bff_http_cache_requires_get_and_reaches_stub(tmp_path, monkeypatch):
+    file_path = tmp_path / "status.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_http_cache, bff_http_methods
+
+        @backend_for_frontend
+        class Status:
+            @bff_http_methods("GET")
+            @bff_http_cache(max_age=30, private=False)
+            def read(self):
+                return True
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+
+    manifest = get_bff_manifest(str(file_path))
+    assert manifest[("Status", "read")]["http_cache"] == {"max_age": 30, "private": False}
+    stub = generate_stub_classes(str(file_path), "example.com", "https")
+    assert "If-None-Match" in stub
+    assert "response.status == 304" in stub
+    compile(stub, str(file_path), "exec")
+
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_http_cache
+
+        @backend_for_frontend
+        class Status:
+            @bff_http_cache(max_age=30)
+            def refresh(self):
+                return True
+    """))
+    with pytest.raises(ValueError):
+        get_bff_manifest(str(file_path))
+
+
+def test_bff_executor_is_declared_per_class_and_per_method(tmp_path):
+    file_path = tmp_path / "reports.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_executor
+
+        @backend_for_frontend
+        @bff_executor("reports", max_workers=2)
+        class Reports:
+            def summary(self):
+                return {}
+
+            @bff_executor("exports", max_queue=0)
+            def export(self):
+                return {}
+    """))
+
+    manifest = get_bff_manifest(str(file_path))
+    assert manifest[("Reports", "summary")]["executor"] == {"pool": "reports", "max_workers": 2}
+    assert manifest[("Reports", "export")]["executor"] == {"pool": "exports", "max_queue": 0}
+
+
+def test_bff_execution_process_mode_is_declared_and_validated(tmp_path):
+    file_path = tmp_path / "crunch.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_execution
+
+        @backend_for_frontend
+        class Crunch:
+            @bff_execution("process")
+            def transform(self, rows):
+                return rows
+
+            def describe(self):
+                return {}
+    """))
+    manifest = get_bff_manifest(str(file_path))
+    assert manifest[("Crunch", "transform")]["execution"] == "process"
+    assert "execution" not in manifest[("Crunch", "describe")]
+
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_execution
+
+        @backend_for_frontend
+        class Crunch:
+            @bff_execution("process")
+            async def transform(self, rows):
+                return rows
+    """))
+    with pytest.raises(ValueError):
+        get_bff_manifest(str(file_path))
+
+
+def test_bff_upload_is_declared_and_reaches_stub(tmp_path, monkeypatch):
+    file_path = tmp_path / "imports.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_upload
+
+        @backend_for_frontend
+        class Imports:
+            @bff_upload("csv_file", max_bytes=1024)
+            def load_csv(self, csv_file, table):
+                return {}
+
+            @bff_upload
+            async def load_blob(self, upload):
+                return {}
+    """))
+    manifest = get_bff_manifest(str(file_path))
+    assert manifest[("Imports", "load_csv")]["upload"] == {"param": "csv_file", "max_bytes": 1024}
+    assert manifest[("Imports", "load_blob")]["upload"] == {"param": "upload"}
+
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    stub = generate_stub_classes(str(file_path), "example.com", "https")
+    assert "async def load_csv(self, body, **kwargs):" in stub
+    assert "await self.fetch_upload(url, body, kwargs, 'POST')" in stub
+
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_http_methods, bff_upload
+
+        @backend_for_frontend
+        class Imports:
+            @bff_http_methods("GET")
+            @bff_upload
+            def load_csv(self, upload):
+                return {}
+    """))
+    with pytest.raises(ValueError):
+        get_bff_manifest(str(file_path))
+
+
+def test_bff_result_arrow_is_declared_and_reaches_stub(tmp_path, monkeypatch):
+    file_path = tmp_path / "grid.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_result
+
+        @backend_for_frontend
+        class Grid:
+            @bff_result("arrow")
+            async def rows(self):
+                return []
+
+            @bff_result("arrow")
+            def sync_rows(self):
+                return []
+    """))
+    manifest = get_bff_manifest(str(file_path))
+    assert manifest[("Grid", "rows")]["result_format"] == "arrow"
+
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    stub = generate_stub_classes(str(file_path), "example.com", "https")
+    assert "response = await self.fetch_columnar(url, payload, 'POST')" in stub
+    assert "binary=bool(accept), accept=accept)" in stub
+    assert "def _pytincture_columnar(response):" in stub
+
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_result
+
+        @backend_for_frontend
+        class Grid:
+            @bff_result("parquet")
+            def rows(self):
+                return []
+    """))
+    with pytest.raises(ValueError):
+        get_bff_manifest(str(file_path))
+
+
 def test_bff_http_methods_rejects_unsupported_method():
     with pytest.raises(ValueError):
         bff_http_methods("TRACE")
@@ -180,7 +431,7 @@ def test_generate_stub_classes_returns_stub(tmp_path, monkeypatch):
     stub = generate_stub_classes(str(file_path), "example.com", "https")
     # Sync backend methods should keep synchronous stubs.
     assert "class MyService:" in stub
-    assert "async def fetch(self, url, payload=None, method='GET', _replay_retry=True):" in stub
+    assert "async def fetch(self, url, payload=None, method='GET', _replay_retry=True, raise_for_status=False):" in stub
     assert "def foo(self, *args, **kwargs):" in stub
     assert "response = self.fetch_sync(url, payload, 'POST')" in stub
     assert "async def foo(self, *args, **kwargs):" not in stub
@@ -237,7 +488,7 @@ def test_generate_stub_classes_supports_decorator_aliases_and_async_methods(tmp_
 
     stub = generate_stub_classes(str(file_path), "example.com", "https")
     assert "class AsyncService:" in stub
-    assert "async def fetch(self, url, payload=None, method='GET', _replay_retry=True):" in stub
+    assert "async def fetch(self, url, payload=None, method='GET', _replay_retry=True, raise_for_status=False):" in stub
     assert "async def ticker(self, *args, **kwargs):" in stub
     assert "async def ping(self, *args, **kwargs):" in stub
     assert "response = await self.fetch(url, payload, 'POST')" in stub
@@ -334,6 +585,337 @@ def test_generated_stub_injects_opaque_replay_state_client(tmp_path, monkeypatch
     assert "_decode_pytincture_state" in stub
     compile(stub, str(file_path), "exec")
 
+
+def test_generated_stub_exposes_batch_context_manager(tmp_path, monkeypatch):
+    file_path = tmp_path / "service.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Service:
+            def read(self):
+                return True
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+
+    stub = generate_stub_classes(str(file_path), "example.com", "https")
+
+    assert "class _PytinctureBatch:" in stub
+    assert "_pytincture_file = 'service.py'" in stub
+    assert "_pytincture_batch_url = 'https://example.com/classcall/_batch'" in stub
+    assert "def batch(self):" in stub
+    assert "async def __aexit__(self, exc_type, exc, tb):" in stub
+    compile(stub, str(file_path), "exec")
+
+
+def _exec_stub(file_path, monkeypatch, **js_attributes):
+    """Generate the stub for ``file_path`` and run it against fake Pyodide modules."""
+    fake_js = types.ModuleType("js")
+    fake_js.XMLHttpRequest = fake_js.window = fake_js.fetch = fake_js.WebSocket = None
+    fake_js.document = types.SimpleNamespace(cookie="pytincture_csrf=token")
+    fake_js.JSON = types.SimpleNamespace(stringify=lambda value: value)
+    for name, value in js_attributes.items():
+        setattr(fake_js, name, value)
+    fake_pyodide = types.ModuleType("pyodide")
+    fake_ffi = types.ModuleType("pyodide.ffi")
+    fake_ffi.to_js = lambda value: value
+    fake_ffi.create_proxy = lambda func: func
+    monkeypatch.setitem(sys.modules, "js", fake_js)
+    monkeypatch.setitem(sys.modules, "pyodide", fake_pyodide)
+    monkeypatch.setitem(sys.modules, "pyodide.ffi", fake_ffi)
+
+    stub = generate_stub_classes(str(file_path), "example.com", "https")
+    namespace = {}
+    exec(compile(stub, str(file_path), "exec"), namespace)
+    return namespace
+
+
+def test_generated_stub_coalesces_async_calls_into_one_batch(tmp_path, monkeypatch):
+    file_path = tmp_path / "service.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Service:
+            async def double(self, value):
+                return value * 2
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setenv("BFF_STUB_COALESCE_MS", "5")
+    namespace = _exec_stub(file_path, monkeypatch)
+    requests = []
+
+    async def fake_fetch(self, url, payload=None, method="GET", _replay_retry=True, raise_for_status=False):
+        requests.append((url, payload, method))
+        return json.dumps({"results": [
+            {"status": 200, "result": call["args"][0] * 2} if call["args"][0] >= 0
+            else {"status": 400, "error": "negative"}
+            for call in payload["calls"]
+        ]})
+
+    namespace["Service"].fetch = fake_fetch
+    service = namespace["Service"]()
+
+    async def run_calls():
+        return await asyncio.gather(
+            service.double(1), service.double(2), service.double(-1),
+            return_exceptions=True,
+        )
+
+    first, second, failed = asyncio.run(run_calls())
+    assert (first, second) == (2, 4)
+    assert isinstance(failed, RuntimeError)
+    assert len(requests) == 1
+    assert requests[0][0] == "https://example.com/classcall/_batch"
+    assert [call["function"] for call in requests[0][1]["calls"]] == ["double"] * 3
+
+
+def test_generated_stub_raises_for_a_failed_call_alone_in_the_window(tmp_path, monkeypatch):
+    file_path = tmp_path / "service.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Service:
+            async def double(self, value):
+                return value * 2
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setenv("BFF_STUB_COALESCE_MS", "5")
+    requests = []
+
+    class FakeResponse:
+        status = 400
+        headers = {}
+
+        async def text(self):
+            return json.dumps({"detail": "negative"})
+
+    async def fake_fetch(url, options):
+        requests.append(url)
+        return FakeResponse()
+
+    namespace = _exec_stub(file_path, monkeypatch, fetch=fake_fetch)
+
+    with pytest.raises(RuntimeError, match=r"BFF call failed \(400\): negative"):
+        asyncio.run(namespace["Service"]().double(-1))
+    assert requests == ["https://example.com/classcall/service.py/Service/double"]
+
+
+def test_generated_stub_keeps_binary_async_calls_out_of_coalescing(tmp_path, monkeypatch):
+    file_path = tmp_path / "files.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Files:
+            async def export(self) -> bytes:
+                return b"PK"
+
+            async def size(self):
+                return 2
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setenv("BFF_STUB_COALESCE_MS", "5")
+    namespace = _exec_stub(file_path, monkeypatch)
+    requests = []
+
+    async def fake_fetch(self, url, payload=None, method="GET", _replay_retry=True, raise_for_status=False):
+        requests.append(url)
+        return b"PK" if url.endswith("/export") else json.dumps(2)
+
+    namespace["Files"].fetch = fake_fetch
+    files = namespace["Files"]()
+    assert asyncio.run(files.export()) == b"PK"
+    assert asyncio.run(files.size()) == 2
+    assert requests == [
+        "https://example.com/classcall/files.py/Files/export",
+        "https://example.com/classcall/files.py/Files/size",
+    ]
+
+
+def test_generated_sse_stub_reconnects_with_last_event_id(tmp_path, monkeypatch):
+    file_path = tmp_path / "jobs.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_stream
+
+        @backend_for_frontend
+        class Jobs:
+            @bff_stream(sse=True)
+            async def progress(self):
+                yield {"step": 1}
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    namespace = _exec_stub(file_path, monkeypatch)
+    connections = []
+
+    async def fake_fetch_stream(self, url, payload=None, method="GET", _replay_retry=True,
+                                last_event_id=None, raise_for_status=False):
+        connections.append(last_event_id)
+        if len(connections) == 1:
+            yield "retry: 10\n\n: keepalive\n\n"
+            yield 'id: abc.1\ndata: {"step": 1}\n\nid: abc.2\nda'
+            raise ConnectionError("network dropped")
+        yield 'id: abc.2\ndata: {"step": 2}\n\nevent: end\ndata: {}\n\n'
+
+    namespace["Jobs"].fetch_stream = fake_fetch_stream
+
+    async def collect():
+        return [event async for event in namespace["Jobs"]().progress()]
+
+    assert asyncio.run(collect()) == [{"step": 1}, {"step": 2}]
+    assert connections == [None, "abc.1"]
+
+    async def gap_fetch_stream(self, url, payload=None, method="GET", _replay_retry=True,
+                               last_event_id=None, raise_for_status=False):
+        yield 'id: abc.1\ndata: {"step": 1}\n\nevent: gap\ndata: {}\n\n'
+
+    namespace["Jobs"].fetch_stream = gap_fetch_stream
+    with pytest.raises(RuntimeError, match="lost events"):
+        asyncio.run(collect())
+
+
+def test_generated_stub_multiplexes_async_calls_over_websocket(tmp_path, monkeypatch):
+    file_path = tmp_path / "service.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend, bff_http_methods, bff_stream
+
+        @backend_for_frontend
+        class Service:
+            async def double(self, value):
+                return value * 2
+
+            @bff_http_methods("GET")
+            async def status(self):
+                return "ok"
+
+            @bff_stream
+            async def rows(self):
+                yield {"row": 0}
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    monkeypatch.setenv("ENABLE_BFF_WEBSOCKET", "true")
+    sockets = []
+
+    class FakeWebSocket:
+        @staticmethod
+        def new(url):
+            socket = FakeWebSocket()
+            socket.url, socket.sent = url, []
+            sockets.append(socket)
+            asyncio.get_running_loop().call_soon(lambda: socket.onopen(None))
+            return socket
+
+        def send(self, data):
+            message = json.loads(data)
+            self.sent.append(message)
+            if message["type"] != "call":
+                return
+            if message["function"] == "double":
+                replies = [{"id": message["id"], "type": "result", "status": 200,
+                            "result": message["args"][0] * 2}]
+            else:
+                replies = [{"id": message["id"], "type": "chunk", "data": '{"row": 0}\n{"ro'},
+                           {"id": message["id"], "type": "chunk", "data": 'w": 1}\n'},
+                           {"id": message["id"], "type": "end"}]
+            loop = asyncio.get_running_loop()
+            for reply in replies:
+                loop.call_soon(self.onmessage, types.SimpleNamespace(data=json.dumps(reply)))
+
+    namespace = _exec_stub(file_path, monkeypatch, WebSocket=FakeWebSocket)
+    namespace["Service"]._csrf_token = lambda self: "token"
+    http_requests = []
+
+    async def fake_fetch(self, url, payload=None, method="GET", _replay_retry=True, raise_for_status=False):
+        http_requests.append((url, method))
+        return json.dumps("ok")
+
+    namespace["Service"].fetch = fake_fetch
+    service = namespace["Service"]()
+
+    async def run_calls():
+        doubled = await asyncio.gather(service.double(1), service.double(2))
+        rows = [row async for row in service.rows()]
+        return doubled, rows, await service.status()
+
+    assert asyncio.run(run_calls()) == ([2, 4], [{"row": 0}, {"row": 1}], "ok")
+    assert http_requests == [("https://example.com/classcall/service.py/Service/status", "GET")]
+    assert len(sockets) == 1
+    assert sockets[0].url == "wss://example.com/classcall/_ws?csrf=token"
+    assert [message["id"] for message in sockets[0].sent] == [1, 2, 3]
+
+
+def test_generated_stub_returns_binary_results_as_bytes(tmp_path, monkeypatch):
+    file_path = tmp_path / "reports.py"
+    file_path.write_text(textwrap.dedent("""
+        import pathlib
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Reports:
+            async def export(self):
+                return b"%PDF"
+
+            def pdf(self) -> pathlib.Path:
+                return pathlib.Path("report.pdf")
+
+            def summary(self):
+                return {}
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+
+    class FakeResponse:
+        status = 200
+        headers = {"X-Pytincture-Result": "binary"}
+
+        async def arrayBuffer(self):
+            return types.SimpleNamespace(to_bytes=lambda: b"%PDF")
+
+    async def fake_fetch(url, options):
+        return FakeResponse()
+
+    stub = generate_stub_classes(str(file_path), "example.com", "https")
+    assert "self.fetch_sync(url, payload, 'POST', binary=True)" in stub
+    assert "self.fetch_sync(url, payload, 'POST')\n        return json.loads(response)" in stub
+    namespace = _exec_stub(file_path, monkeypatch, fetch=fake_fetch)
+    assert asyncio.run(namespace["Reports"]().export()) == b"%PDF"
+
+
+def test_generated_stub_sends_traceparent_when_tracing_is_enabled(tmp_path, monkeypatch):
+    file_path = tmp_path / "orders.py"
+    file_path.write_text(textwrap.dedent("""
+        from pytincture.dataclass import backend_for_frontend
+
+        @backend_for_frontend
+        class Orders:
+            async def count(self):
+                return 3
+    """))
+    monkeypatch.setenv("MODULES_PATH", str(tmp_path))
+    assert "traceparent" not in generate_stub_classes(str(file_path), "example.com", "https")
+
+    monkeypatch.setenv("ENABLE_BFF_TRACING", "true")
+    sent = []
+
+    class FakeResponse:
+        status = 200
+        headers = {}
+
+        async def text(self):
+            return "3"
+
+    async def fake_fetch(url, options):
+        sent.append(options)
+        return FakeResponse()
+
+    namespace = _exec_stub(file_path, monkeypatch, fetch=fake_fetch)
+    orders = namespace["Orders"]()
+    assert asyncio.run(orders.count()) == 3
+    assert asyncio.run(orders.count()) == 3
+    first, second = (options["headers"]["traceparent"] for options in sent)
+    assert re.fullmatch(r"00-[0-9a-f]{32}-[0-9a-f]{16}-01", first)
+    assert first.split("-")[1] != second.split("-")[1]
+
 def test_get_parsed_output_returns_stub(tmp_path):
     """
     When the file contains '@backend_for_frontend', get_parsed_output should return stub code.